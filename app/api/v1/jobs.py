@@ -1,46 +1,190 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from typing import List, Optional
-from app.db.database import get_db
+import importlib.util
+import logging
+import orjson
+from app.core.api_cache import get_api_cache
+from app.db.database import get_async_db, get_async_sessionmaker
 from app.schemas.job import JobResponse, JobStats
-from app.services.job_service import JobService
+from app.services.export_service import EXPORT_MEDIA_TYPES, ExportService
+from app.services.job_service import JobService, decode_cursor, encode_cursor
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+JOB_FIELDS = list(JobResponse.model_fields)
+# Needed for X-Next-Cursor even when the client doesn't ask for them
+CURSOR_FIELDS = ["scraped_at", "id"]
+
+# Set while this process has a stats refresh in flight, so stale reads schedule only one
+_stats_refreshing = False
+
+
+def json_response(body: bytes, headers: Optional[dict] = None) -> Response:
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.get("/", response_model=List[JobResponse])
-def get_jobs(
+async def get_jobs(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    q: Optional[str] = Query(None, description="Full-text search, ranked by relevance"),
     company: Optional[str] = None,
     location: Optional[str] = None,
     job_type: Optional[str] = None,
     source: Optional[str] = None,
-    db: Session = Depends(get_db)
+    technology: Optional[str] = None,
+    dedupe: bool = Query(False, description="Hide near-duplicates of earlier listings, e.g. the same posting on another board"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,company"),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get job listings with optional filters"""
-    jobs = JobService.get_jobs(
-        db=db,
+    """
+    Get job listings with optional filters
+    Full pages carry an X-Next-Cursor header; pass it back as `cursor` for the next page
+    """
+    selected = JOB_FIELDS
+    if fields:
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested - set(JOB_FIELDS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+        selected = [name for name in JOB_FIELDS if name in requested]
+    
+    if cursor and skip:
+        raise HTTPException(status_code=400, detail="Use either skip or cursor, not both")
+    if cursor and q:
+        raise HTTPException(status_code=400, detail="Search results are ranked; page them with skip")
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    filters = dict(
         skip=skip,
         limit=limit,
         company=company,
         location=location,
         job_type=job_type,
-        source=source
+        source=source,
+        technology=technology,
+        q=q,
+        dedupe=dedupe
     )
-    return jobs
+    
+    cache = get_api_cache()
+    cache_key, cached = None, None
+    if cache:
+        cache_key, cached = await cache.lookup("jobs", {**filters, "cursor": cursor, "fields": selected})
+    if cached:
+        return json_response(cached.body, cached.headers)
+    
+    # Rows are trusted DB data: select the columns as tuples and encode them
+    # directly instead of building ORM objects and re-validating each one
+    columns = selected + [name for name in CURSOR_FIELDS if name not in selected]
+    rows = await db.run_sync(JobService.get_job_rows, columns, after=after, **filters)
+    
+    headers = {}
+    if len(rows) == limit and not q:
+        headers["X-Next-Cursor"] = encode_cursor(rows[-1])
+    width = len(selected)
+    body = orjson.dumps([dict(zip(selected, row[:width])) for row in rows])
+    
+    if cache:
+        await cache.store(cache_key, body, headers)
+    return json_response(body, headers)
 
 
 @router.get("/stats", response_model=JobStats)
-def get_stats(db: Session = Depends(get_db)):
-    """Get job statistics"""
-    return JobService.get_stats(db)
+async def get_stats(
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    session_factory: async_sessionmaker = Depends(get_async_sessionmaker)
+):
+    """Get job statistics; a stale summary is served while it is refreshed in the background"""
+    global _stats_refreshing
+    cache = get_api_cache()
+    cache_key, cached = None, None
+    if cache:
+        cache_key, cached = await cache.lookup("stats", {})
+    if cached:
+        return json_response(cached.body)
+    
+    stats = await db.run_sync(JobService.get_stats)
+    stale = False
+    if stats is None:
+        # Nothing to serve before the first refresh
+        stats = await db.run_sync(JobService.refresh_stats)
+    elif JobService.stats_stale(stats):
+        stale = True
+        if not _stats_refreshing:
+            _stats_refreshing = True
+            background_tasks.add_task(refresh_stats, session_factory)
+    body = stats.model_dump_json().encode()
+    
+    # Don't keep serving the stale body from the cache once the refresh lands
+    if cache and not stale:
+        await cache.store(cache_key, body)
+    return json_response(body)
+
+
+async def refresh_stats(session_factory: async_sessionmaker):
+    """Recompute the stats summary after the response has been sent"""
+    global _stats_refreshing
+    try:
+        async with session_factory() as db:
+            await db.run_sync(JobService.refresh_stats)
+    except Exception as e:
+        logger.error(f"Error refreshing stats summary: {e}")
+    finally:
+        _stats_refreshing = False
+
+
+@router.get("/export")
+async def export_jobs(
+    format: str = Query("ndjson", pattern="^(ndjson|csv|parquet)$"),
+    q: Optional[str] = None,
+    company: Optional[str] = None,
+    location: Optional[str] = None,
+    job_type: Optional[str] = None,
+    source: Optional[str] = None,
+    technology: Optional[str] = None,
+    dedupe: bool = False,
+    session_factory: async_sessionmaker = Depends(get_async_sessionmaker)
+):
+    """
+    Stream every matching job as NDJSON, CSV or Parquet
+    Rows come straight from a server-side cursor, so memory stays flat
+    """
+    if format == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+    
+    filters = dict(
+        company=company,
+        location=location,
+        job_type=job_type,
+        source=source,
+        technology=technology,
+        q=q,
+        dedupe=dedupe
+    )
+    # The stream opens its own session: request-scoped ones close before streaming ends
+    batches = ExportService.stream_rows(session_factory, filters)
+    encoder = getattr(ExportService, format)
+    
+    return StreamingResponse(
+        encoder(batches),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="jobs.{format}"'}
+    )
 
 
 @router.get("/{job_id}", response_model=JobResponse)
-def get_job(job_id: int, db: Session = Depends(get_db)):
+async def get_job(job_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get specific job by ID"""
-    job = JobService.get_job_by_id(db, job_id)
+    job = await db.run_sync(JobService.get_job_by_id, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     return job
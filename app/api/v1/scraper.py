@@ -1,38 +1,60 @@
 from fastapi import APIRouter, Depends, BackgroundTasks
-from sqlalchemy.orm import Session
-from app.db.database import get_db
+from sqlalchemy.orm import Session, sessionmaker
+from app.core.config import get_settings
+from app.db.database import get_db, get_session_factory
+from app.schemas.scrape_run import ScrapeRunResponse
+from app.services.scrape_run_service import ScrapeRunService
 from app.services.scraper_service import ScraperService
-import logging
+from app.services.task_queue import enqueue_scrape_tasks
 
+settings = get_settings()
 router = APIRouter()
-logger = logging.getLogger(__name__)
-
-
-def run_scraper_task(db: Session):
-    """Background task to run scraper"""
-    scraper_service = ScraperService()
-    results = scraper_service.run_all_scrapers(db)
-    logger.info(f"Scraper completed: {results}")
 
 
 @router.post("/run")
 def trigger_scraper(
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory)
 ):
-    """Manually trigger scraper"""
-    background_tasks.add_task(run_scraper_task, db)
+    """
+    Manually trigger scraper, joining the in-flight run if there is one
+    With SCRAPE_DISPATCH=queue, one task per source is queued for the workers instead
+    """
+    if settings.scrape_dispatch == "queue":
+        sources = [scraper.source_name for scraper in ScraperService().scrapers]
+        enqueue_scrape_tasks(sources, force=True)
+        return {
+            "message": "Scrape tasks queued for workers",
+            "status": "queued",
+            "run_id": None,
+            "coalesced": False,
+            "sources": sources
+        }
+    
+    run, created = ScrapeRunService.start_or_join(db, trigger="api")
+    if created:
+        # The run opens its own session; the request's one is closed by then
+        background_tasks.add_task(ScrapeRunService.execute, run.id, session_factory)
+    
     return {
-        "message": "Scraper started in background",
-        "status": "running"
+        "message": "Scraper started in background" if created else "Scraper already running",
+        "status": "running",
+        "run_id": run.id,
+        "coalesced": not created
     }
 
 
 @router.get("/status")
-def scraper_status():
-    """Get scraper status"""
+def scraper_status(db: Session = Depends(get_db)):
+    """Get scraper status, current progress and the last run's throughput"""
+    active = ScrapeRunService.get_active_run(db)
+    last = ScrapeRunService.get_last_finished_run(db)
+    
     return {
-        "status": "available",
-        "scrapers_configured": 1,
+        "status": "running" if active else "available",
+        "scrapers_configured": len(ScraperService().scrapers),
+        "current_run": ScrapeRunResponse.model_validate(active) if active else None,
+        "last_run": ScrapeRunResponse.model_validate(last) if last else None,
         "message": "Use POST /api/v1/scraper/run to trigger scraping"
     }
@@ -0,0 +1,186 @@
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
+import hashlib
+import json
+import logging
+import threading
+import time
+import redis
+from starlette.concurrency import run_in_threadpool
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = "api:generation"
+# How long to stay on the in-process fallback before trying redis again
+REDIS_RETRY_SECONDS = 30
+
+
+class CachedBody(NamedTuple):
+    body: bytes
+    headers: Dict[str, str]
+
+
+class ApiCache:
+    """
+    Read-through cache of serialized API responses
+    Entries live in redis, or in a bounded in-process LRU while redis is
+    unavailable. Keys embed a generation number, so bumping it after
+    ingest invalidates every cached response at once.
+    The redis client is blocking: async handlers use lookup() and store(),
+    which run it in the threadpool instead of on the event loop
+    """
+    
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        ttl: Optional[int] = None,
+        max_entries: Optional[int] = None
+    ):
+        self.redis_url = redis_url
+        self.ttl = ttl if ttl is not None else settings.api_cache_ttl_seconds
+        self.max_entries = max_entries if max_entries is not None else settings.api_cache_max_entries
+        self.hits = 0
+        self.misses = 0
+        self._redis = None
+        self._redis_retry_at = 0.0
+        self._local: "OrderedDict[str, tuple]" = OrderedDict()
+        self._local_generation = 0
+        self._lock = threading.Lock()
+    
+    def _client(self) -> Optional[redis.Redis]:
+        """Connected redis client, or None to use the in-process fallback"""
+        if self.redis_url is None:
+            return None
+        if self._redis is None and time.monotonic() >= self._redis_retry_at:
+            try:
+                # Short timeouts: these are blocking calls made from request handlers
+                client = redis.Redis.from_url(self.redis_url, socket_timeout=0.2, socket_connect_timeout=0.2)
+                client.ping()
+                self._redis = client
+            except redis.RedisError as e:
+                logger.warning(f"API cache falling back to in-process LRU, redis unavailable: {e}")
+                self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+        return self._redis
+    
+    def _redis_failed(self, error: Exception):
+        logger.warning(f"API cache redis error, falling back to in-process LRU: {error}")
+        self._redis = None
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+    
+    def generation(self) -> int:
+        client = self._client()
+        if client is not None:
+            try:
+                return int(client.get(GENERATION_KEY) or 0)
+            except redis.RedisError as e:
+                self._redis_failed(e)
+        return self._local_generation
+    
+    def bump_generation(self):
+        """Invalidate all cached responses"""
+        with self._lock:
+            self._local_generation += 1
+            self._local.clear()
+        
+        client = self._client()
+        if client is not None:
+            try:
+                client.incr(GENERATION_KEY)
+            except redis.RedisError as e:
+                self._redis_failed(e)
+    
+    def key(self, route: str, params: dict) -> str:
+        """Cache key from a route and its parsed query parameters"""
+        normalized = json.dumps(
+            {name: value for name, value in params.items() if value is not None},
+            sort_keys=True,
+            default=str
+        )
+        digest = hashlib.sha1(normalized.encode()).hexdigest()
+        return f"api:{self.generation()}:{route}:{digest}"
+    
+    def get(self, key: str) -> Optional[CachedBody]:
+        cached = None
+        client = self._client()
+        if client is not None:
+            try:
+                raw = client.get(key)
+                if raw is not None:
+                    headers, body = raw.split(b"\n", 1)
+                    cached = CachedBody(body, json.loads(headers))
+            except redis.RedisError as e:
+                self._redis_failed(e)
+        else:
+            with self._lock:
+                entry = self._local.get(key)
+                if entry is not None and entry[0] > time.monotonic():
+                    self._local.move_to_end(key)
+                    cached = entry[1]
+        
+        with self._lock:
+            if cached is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return cached
+    
+    def set(self, key: str, body: bytes, headers: Optional[Dict[str, str]] = None):
+        cached = CachedBody(body, headers or {})
+        client = self._client()
+        if client is not None:
+            try:
+                client.setex(key, self.ttl, json.dumps(cached.headers).encode() + b"\n" + body)
+                return
+            except redis.RedisError as e:
+                self._redis_failed(e)
+        
+        with self._lock:
+            self._local[key] = (time.monotonic() + self.ttl, cached)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+    
+    async def lookup(self, route: str, params: dict) -> Tuple[str, Optional[CachedBody]]:
+        """key() and get() for async handlers, in one threadpool hop when redis backs the cache"""
+        if self.redis_url is None:
+            return self._lookup(route, params)
+        return await run_in_threadpool(self._lookup, route, params)
+    
+    def _lookup(self, route: str, params: dict) -> Tuple[str, Optional[CachedBody]]:
+        key = self.key(route, params)
+        return key, self.get(key)
+    
+    async def store(self, key: str, body: bytes, headers: Optional[Dict[str, str]] = None):
+        """set() for async handlers"""
+        if self.redis_url is None:
+            self.set(key, body, headers)
+        else:
+            await run_in_threadpool(self.set, key, body, headers)
+    
+    def clear(self):
+        """Drop local entries and counters (redis entries expire via the generation)"""
+        self.bump_generation()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "redis" if self._redis is not None else "memory",
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None
+            }
+
+
+@lru_cache()
+def get_api_cache() -> Optional[ApiCache]:
+    """Process-wide API response cache, or None when disabled"""
+    if not settings.api_cache_enabled:
+        return None
+    return ApiCache(redis_url=settings.redis_url)
@@ -4,13 +4,50 @@ from functools import lru_cache
 
 class Settings(BaseSettings):
     database_url: str
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
     redis_url: str = "redis://localhost:6379/0"
+    api_cache_enabled: bool = True
+    api_cache_ttl_seconds: int = 60
+    api_cache_max_entries: int = 1024
     scraper_interval_hours: int = 6
+    scraper_workers: int = 1
+    scraper_timeout_seconds: int = 900
+    incremental_scraping: bool = True
+    full_scrape_interval_hours: int = 24  # full scrapes detect listings that were taken down
+    scrape_run_stale_seconds: int = 3600
+    scrape_dispatch: str = "inline"  # inline (in the API process) or queue (worker processes)
+    task_queue_backend: str = "redis"  # redis or memory
     max_retries: int = 3
     request_timeout: int = 10
-    user_agent_rotate: bool = True
+    fetch_max_connections: int = 20
+    fetch_per_host_limit: int = 4
+    parse_workers: int = 1
+    rate_limit_enabled: bool = True
+    rate_limit_per_host: float = 2.0  # requests/second, before any throttling
+    rate_limit_burst: int = 4
+    rate_limit_min_rate: float = 0.1
+    rate_limit_backend: str = "memory"  # memory or redis (shared by all workers)
+    http_cache_enabled: bool = True
+    http_cache_max_entries: int = 1024
+    http_cache_store: str = "memory"  # memory, file or redis
+    http_cache_dir: str = ".cache/http"
+    http_cache_ttl_seconds: int = 604800  # redis store entries expire after a week unused
+    user_agent_rotate: bool = True  # random header profile per host, else the first one
     enable_scheduler: bool = True
     log_level: str = "INFO"
+    metrics_enabled: bool = True
+    profile_sample_rate: float = 0.0  # share of API requests run under cProfile
+    profile_scrapes: bool = False
+    profile_dir: str = "logs/profiles"
+    dedup_enabled: bool = True
+    dedup_threshold: float = 0.8  # shingle Jaccard similarity for a near-duplicate
+    ingest_chunk_size: int = 1000
+    stream_queue_size: int = 4  # scraped batches buffered ahead of the database writer
+    stats_max_age_seconds: int = 3600
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,140 @@
+"""
+Prometheus metrics for the scrape pipeline and the API
+
+Instruments are module-level and cheap to update, so hot paths record one
+observation per request, page or chunk, never per row. Exposed at /metrics.
+"""
+from functools import wraps
+from typing import Callable, Optional, Tuple
+import os
+import time
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from app.core.api_cache import get_api_cache
+from app.utils.response_cache import get_response_cache
+
+FETCH_SECONDS = Histogram(
+    "scraper_fetch_seconds", "HTTP fetch latency per attempt", ["host"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+FETCH_BYTES = Counter("scraper_fetch_bytes", "Response bytes downloaded", ["host"])
+FETCH_RESPONSES = Counter("scraper_fetch_responses", "Fetch attempts by HTTP status or 'error'", ["host", "status"])
+PARSE_SECONDS = Histogram(
+    "scraper_parse_seconds", "Parse time per listing page",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+)
+INGEST_ROWS = Counter("ingest_rows", "Scraped jobs written, by outcome", ["outcome"])
+INGEST_CHUNK_SECONDS = Histogram(
+    "ingest_chunk_seconds", "Time to upsert one chunk of jobs",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_seconds", "JobService call latency", ["method"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 10)
+)
+REQUEST_SECONDS = Histogram(
+    "http_request_seconds", "API request latency by route template", ["method", "route", "status"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 10)
+)
+
+
+def record_fetch(host: str, seconds: float, status: Optional[int], downloaded: int = 0):
+    """One fetch attempt; `status` is None when no response came back"""
+    FETCH_SECONDS.labels(host).observe(seconds)
+    FETCH_RESPONSES.labels(host, str(status) if status is not None else "error").inc()
+    if downloaded:
+        FETCH_BYTES.labels(host).inc(downloaded)
+
+
+def record_ingest(counts: dict):
+    for outcome, count in counts.items():
+        if count:
+            INGEST_ROWS.labels(outcome).inc(count)
+
+
+def timed_query(fn: Callable) -> Callable:
+    """Record a JobService method's latency in db_query_seconds, labelled by its name"""
+    histogram = DB_QUERY_SECONDS.labels(fn.__name__)
+    
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - start)
+    
+    return wrapper
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording http_request_seconds
+    Labelled by route template ("/api/v1/jobs/{job_id}"), not the raw path,
+    so label cardinality stays bounded
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start = time.perf_counter()
+        status = 500
+        
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the shared scope
+            route = scope.get("route")
+            REQUEST_SECONDS.labels(
+                scope["method"], getattr(route, "path", "unmatched"), str(status)
+            ).observe(time.perf_counter() - start)
+
+
+class CacheCollector:
+    """Hit/miss counts and hit ratio of the API and HTTP response caches, read at scrape time"""
+    
+    def collect(self):
+        hits = CounterMetricFamily("cache_hits", "Cache hits since start", labels=["cache"])
+        misses = CounterMetricFamily("cache_misses", "Cache misses since start", labels=["cache"])
+        ratio = GaugeMetricFamily("cache_hit_ratio", "Hits over lookups since start", labels=["cache"])
+        for name, cache in (("api", get_api_cache()), ("http", get_response_cache())):
+            if cache is None:
+                continue
+            stats = cache.stats()
+            hits.add_metric([name], stats["hits"])
+            misses.add_metric([name], stats["misses"])
+            lookups = stats["hits"] + stats["misses"]
+            if lookups:
+                ratio.add_metric([name], stats["hits"] / lookups)
+        yield hits
+        yield misses
+        yield ratio
+
+
+REGISTRY.register(CacheCollector())
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Prometheus text exposition of this process's metrics, or of all processes
+    that share PROMETHEUS_MULTIPROC_DIR (API workers and scrape workers)
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(CacheCollector())
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,88 @@
+"""
+Opt-in cProfile hooks
+
+A sampled share of API requests (PROFILE_SAMPLE_RATE) and, with
+PROFILE_SCRAPES, every scrape run are profiled and written as .prof files to
+PROFILE_DIR; inspect them with `python -m pstats` or snakeviz.
+"""
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List
+import cProfile
+import logging
+import os
+import pstats
+import random
+import re
+import threading
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# cProfile can't nest, so only one profile runs at a time; others are skipped
+_active = threading.Lock()
+
+
+@contextmanager
+def profiled(name: str, enabled: bool = True, threads: bool = False):
+    """
+    Profile the block into one .prof file
+    With `threads`, threads it starts are profiled too (the scrape pipeline's
+    producer and worker threads); they should end with the block.
+    On the event loop, coroutines of concurrent requests are included too
+    """
+    if not enabled or not _active.acquire(blocking=False):
+        yield
+        return
+    
+    profiles: List[cProfile.Profile] = []
+    
+    def profile_thread(*_):
+        # Runs as the first profile event of each new thread, then hands over to cProfile
+        profile = cProfile.Profile()
+        profiles.append(profile)
+        profile.enable()
+    
+    main = cProfile.Profile()
+    if threads:
+        threading.setprofile(profile_thread)
+    main.enable()
+    try:
+        yield
+    finally:
+        main.disable()
+        if threads:
+            threading.setprofile(None)
+        _active.release()
+        _dump(name, main, profiles)
+
+
+def _dump(name: str, main: cProfile.Profile, thread_profiles: List[cProfile.Profile]):
+    try:
+        stats = pstats.Stats(main)
+        for profile in thread_profiles:
+            stats.add(profile)
+        os.makedirs(settings.profile_dir, exist_ok=True)
+        slug = re.sub(r"[^\w.-]+", "_", name).strip("_")
+        path = os.path.join(settings.profile_dir, f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{slug}.prof")
+        stats.dump_stats(path)
+        logger.info(f"Wrote profile {path}")
+    except Exception as e:
+        logger.error(f"Error writing profile {name}: {e}")
+
+
+class ProfilingMiddleware:
+    """Profile a random PROFILE_SAMPLE_RATE share of HTTP requests"""
+    
+    def __init__(self, app, sample_rate: float):
+        self.app = app
+        self.sample_rate = sample_rate
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+        
+        with profiled(f"{scope['method']} {scope['path']}"):
+            await self.app(scope, receive, send)
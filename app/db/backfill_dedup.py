@@ -0,0 +1,28 @@
+"""
+Index existing jobs for near-duplicate detection and link their duplicates
+
+Usage:
+    python -m app.db.backfill_dedup [--batch-size 1000]
+"""
+import argparse
+from app.db.database import SessionLocal, init_db
+from app.services.dedup_service import DedupService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    
+    # Creates job_lsh_bands; the new jobs columns need the ALTER TABLE in the README first
+    init_db()
+    db = SessionLocal()
+    try:
+        duplicates = DedupService.backfill(db, batch_size=args.batch_size)
+        print(f"Linked {duplicates} duplicate jobs")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
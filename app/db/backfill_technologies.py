@@ -0,0 +1,28 @@
+"""
+Populate technologies/job_technologies from existing jobs.technologies strings
+
+Usage:
+    python -m app.db.backfill_technologies [--batch-size 1000]
+"""
+import argparse
+from app.db.database import SessionLocal, init_db
+from app.services.technology_service import TechnologyService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    
+    # Creates the new tables on databases that predate them
+    init_db()
+    db = SessionLocal()
+    try:
+        processed = TechnologyService.backfill(db, batch_size=args.batch_size)
+        print(f"Backfilled technologies for {processed} jobs")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
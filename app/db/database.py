@@ -1,14 +1,50 @@
 from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from functools import lru_cache
+from typing import AsyncIterator
 from app.core.config import get_settings
 
 settings = get_settings()
 
-engine = create_engine(settings.database_url)
+# asyncio drivers used for each sync database URL scheme
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """Swap the driver of a database URL for its asyncio counterpart"""
+    scheme, rest = url.split("://", 1)
+    return f"{ASYNC_DRIVERS.get(scheme.split('+')[0], scheme)}://{rest}"
+
+
+def pool_options(url: str) -> dict:
+    """Connection pool settings (SQLite keeps SQLAlchemy's defaults)"""
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+engine = create_engine(settings.database_url, **pool_options(settings.database_url))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Dialects that support INSERT ... ON CONFLICT
+UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
 
 def get_db():
     """Database session dependency"""
@@ -19,6 +55,25 @@ def get_db():
         db.close()
 
 
+def get_session_factory() -> sessionmaker:
+    """Session factory dependency, for work that outlives the request"""
+    return SessionLocal
+
+
+@lru_cache()
+def get_async_sessionmaker() -> async_sessionmaker:
+    """Async session factory, with its engine created on first use"""
+    async_url = async_database_url(settings.database_url)
+    async_engine = create_async_engine(async_url, **pool_options(async_url))
+    return async_sessionmaker(async_engine, expire_on_commit=False)
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Async database session dependency"""
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
@@ -0,0 +1,58 @@
+"""
+Add the search and pagination indexes to a jobs table created before them
+
+Creates the keyset pagination index, then on Postgres the pg_trgm extension
+with the trigram and full-text GIN indexes, and on SQLite the FTS5 table and
+its triggers, rebuilt from the existing rows. An update trigger from before
+it was limited to the searched columns is replaced. Safe to run more than once.
+
+Usage:
+    python -m app.db.migrate_search
+"""
+import argparse
+from typing import List
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from app.db.database import engine, init_db
+from app.models.job import SEARCH_DDL, Job
+
+# Indexes that create_all only adds along with a new jobs table
+INDEXES = ("ix_jobs_scraped_at_id",)
+# Triggers whose definition changed; dropped so SEARCH_DDL recreates them
+REPLACED_TRIGGERS = ("jobs_fts_au",)
+
+
+def migrate(bind: Engine) -> List[str]:
+    """Apply the indexes missing from `bind`; returns what was run, one line each"""
+    statements = []
+    with bind.begin() as connection:
+        for index in Job.__table__.indexes:
+            if index.name in INDEXES:
+                index.create(connection, checkfirst=True)
+                statements.append(f"CREATE INDEX {index.name}")
+        if bind.dialect.name == "sqlite":
+            for trigger in REPLACED_TRIGGERS:
+                connection.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+                statements.append(f"DROP TRIGGER IF EXISTS {trigger}")
+        for statement in SEARCH_DDL.get(bind.dialect.name, ()):
+            connection.execute(text(statement))
+            statements.append(statement.splitlines()[0])
+        if bind.dialect.name == "sqlite":
+            # Index the rows written before the triggers existed
+            connection.execute(text("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')"))
+            statements.append("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')")
+    return statements
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+    
+    # Creates the new tables on databases that predate them
+    init_db()
+    for statement in migrate(engine):
+        print(statement)
+
+
+if __name__ == "__main__":
+    main()
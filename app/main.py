@@ -1,26 +1,59 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from app.api.v1.router import api_router
 from app.db.database import init_db
 from app.scheduler import start_scheduler
 from app.core.config import get_settings
+from app.core.api_cache import get_api_cache
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.profiling import ProfilingMiddleware
+from app.utils.async_fetch import close_fetch_loop
+from app.utils.parse_pool import get_parse_pool
+import logging
 import os
+import time
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
-# Create logs directory
-os.makedirs('logs', exist_ok=True)
 
-# Initialize database
-init_db()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Per-process startup and shutdown
+    Importing this module has no side effects; the schema check and the
+    scheduler run once per server process, not in tests or CLIs
+    """
+    started = time.perf_counter()
+    
+    # Create logs directory
+    os.makedirs('logs', exist_ok=True)
+    
+    # Initialize database
+    init_db()
+    
+    # Start scheduler
+    scheduler = start_scheduler()
+    logger.info(f"Startup finished in {time.perf_counter() - started:.3f}s")
+    
+    try:
+        yield
+    finally:
+        if scheduler:
+            scheduler.shutdown()
+        get_parse_pool().shutdown()
+        close_fetch_loop()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Job Scraper API",
     description="Web scraper with REST API for tech job listings",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Mount static files
@@ -32,15 +65,11 @@ templates = Jinja2Templates(directory="templates")
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
-# Start scheduler
-scheduler = start_scheduler()
-
-
-@app.on_event("shutdown")
-def shutdown_event():
-    """Shutdown scheduler on app shutdown"""
-    if scheduler:
-        scheduler.shutdown()
+# Instrumentation (the last one added runs outermost)
+if settings.profile_sample_rate > 0:
+    app.add_middleware(ProfilingMiddleware, sample_rate=settings.profile_sample_rate)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -52,8 +81,18 @@ async def home(request: Request):
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
+    api_cache = get_api_cache()
     return {
         "status": "healthy",
         "scheduler_enabled": settings.enable_scheduler,
-        "scraper_interval_hours": settings.scraper_interval_hours
+        "scraper_interval_hours": settings.scraper_interval_hours,
+        "api_cache": api_cache.stats() if api_cache else None
     }
+
+
+if settings.metrics_enabled:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus metrics"""
+        body, content_type = render_metrics()
+        return Response(body, media_type=content_type)
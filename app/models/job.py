@@ -1,11 +1,22 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, Index, DDL, event
 from datetime import datetime
 from app.db.database import Base
 
+SEARCH_FIELDS = ("title", "company", "location", "description", "technologies")
+
+# Postgres: the full-text index and queries must use this exact expression
+SEARCH_DOCUMENT = " || ' ' || ".join(f"coalesce({field}, '')" for field in SEARCH_FIELDS)
+
 
 class Job(Base):
     __tablename__ = "jobs"
-
+    __table_args__ = (
+        # Serves ORDER BY scraped_at DESC, id DESC and keyset pagination
+        Index("ix_jobs_scraped_at_id", "scraped_at", "id"),
+        # Serves deactivation of a source's listings missing from its latest full scrape
+        Index("ix_jobs_source_last_seen_at", "source", "last_seen_at"),
+    )
+    
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False, index=True)
     company = Column(String, nullable=False, index=True)
@@ -13,14 +24,56 @@ class Job(Base):
     description = Column(Text, nullable=True)
     salary_min = Column(Float, nullable=True)
     salary_max = Column(Float, nullable=True)
+    salary_currency = Column(String(3), nullable=True)
+    salary_period = Column(String, nullable=True)  # hour, day, week, month, year
     url = Column(String, unique=True, nullable=False)
     source = Column(String, nullable=False, index=True)  # website scraped from
     job_type = Column(String, nullable=True)  # remote, hybrid, onsite
     experience_level = Column(String, nullable=True)  # junior, mid, senior
     technologies = Column(String, nullable=True)  # comma-separated
     posted_date = Column(DateTime, nullable=True)
-    scraped_at = Column(DateTime, default=datetime.utcnow, index=True)
+    scraped_at = Column(DateTime, default=datetime.utcnow)
     is_active = Column(Boolean, default=True)
+    content_hash = Column(String(32), nullable=True)  # fingerprint of the normalized scraped fields
+    last_seen_at = Column(DateTime, nullable=True)  # last scrape that returned this listing
+    # Set when this listing near-duplicates an earlier one, possibly from another board
+    canonical_job_id = Column(Integer, ForeignKey("jobs.id"), nullable=True, index=True)
     
     def __repr__(self):
         return f"<Job {self.title} at {self.company}>"
+
+
+# Search indexes per dialect, created with the jobs table; app.db.migrate_search
+# applies them to databases that predate them (every statement is idempotent)
+_fts_columns = ", ".join(SEARCH_FIELDS)
+_fts_new = ", ".join(f"new.{field}" for field in SEARCH_FIELDS)
+_fts_old = ", ".join(f"old.{field}" for field in SEARCH_FIELDS)
+SEARCH_DDL = {
+    # Postgres: trigram indexes make company/location ILIKE '%x%' indexable,
+    # and a GIN expression index backs full-text search
+    "postgresql": (
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_jobs_company_trgm ON jobs USING gin (company gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS ix_jobs_location_trgm ON jobs USING gin (location gin_trgm_ops)",
+        f"CREATE INDEX IF NOT EXISTS ix_jobs_search ON jobs USING gin (to_tsvector('english', {SEARCH_DOCUMENT}))",
+    ),
+    # SQLite: external-content FTS5 table kept in sync by triggers
+    "sqlite": (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5({_fts_columns}, content='jobs', content_rowid='id')",
+        f"""CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts(rowid, {_fts_columns}) VALUES (new.id, {_fts_new});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+            INSERT INTO jobs_fts(jobs_fts, rowid, {_fts_columns}) VALUES ('delete', old.id, {_fts_old});
+        END""",
+        # Only searched columns: last_seen_at bumps and dedup links leave the index alone
+        f"""CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF {_fts_columns} ON jobs BEGIN
+            INSERT INTO jobs_fts(jobs_fts, rowid, {_fts_columns}) VALUES ('delete', old.id, {_fts_old});
+            INSERT INTO jobs_fts(rowid, {_fts_columns}) VALUES (new.id, {_fts_new});
+        END""",
+    ),
+}
+for dialect, statements in SEARCH_DDL.items():
+    for statement in statements:
+        event.listen(Job.__table__, "after_create", DDL(statement).execute_if(dialect=dialect))
+event.listen(Job.__table__, "before_drop", DDL("DROP TABLE IF EXISTS jobs_fts").execute_if(dialect="sqlite"))
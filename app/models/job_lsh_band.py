@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, SmallInteger, BigInteger, ForeignKey, Index, Table
+from app.db.database import Base
+
+# LSH buckets of each job's MinHash signature, one row per band
+job_lsh_bands = Table(
+    "job_lsh_bands",
+    Base.metadata,
+    Column("job_id", Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True),
+    Column("band", SmallInteger, primary_key=True),
+    Column("bucket", BigInteger, nullable=False),  # band number is hashed in, so keys don't collide across bands
+    # Serves the candidate lookup for new jobs
+    Index("ix_job_lsh_bands_bucket", "bucket"),
+)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, Float, DateTime, JSON
+from app.db.database import Base
+
+
+class JobStatsSummary(Base):
+    """Precomputed /jobs/stats payload, a single row refreshed at ingest"""
+    __tablename__ = "job_stats_summary"
+
+    id = Column(Integer, primary_key=True)
+    total_jobs = Column(Integer, nullable=False, default=0)
+    unique_jobs = Column(Integer, nullable=False, default=0)
+    active_jobs = Column(Integer, nullable=False, default=0)
+    companies_count = Column(Integer, nullable=False, default=0)
+    locations_count = Column(Integer, nullable=False, default=0)
+    avg_salary = Column(Float, nullable=True)
+    top_technologies = Column(JSON, nullable=False, default=list)
+    jobs_by_source = Column(JSON, nullable=False, default=list)
+    refreshed_at = Column(DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f"<JobStatsSummary {self.total_jobs} jobs @ {self.refreshed_at}>"
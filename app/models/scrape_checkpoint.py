@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, DateTime
+from app.db.database import Base
+
+
+class ScrapeCheckpoint(Base):
+    """High-water mark of what has been scraped from each source"""
+    __tablename__ = "scrape_checkpoints"
+
+    source = Column(String, primary_key=True)
+    last_posted_date = Column(DateTime, nullable=True)  # newest posted_date seen
+    last_url = Column(String, nullable=True)  # URL of that newest listing
+    last_run_at = Column(DateTime, nullable=True)
+    last_full_run_at = Column(DateTime, nullable=True)  # last scrape of every listing page
+    
+    def __repr__(self):
+        return f"<ScrapeCheckpoint {self.source} @ {self.last_posted_date}>"
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, JSON, Index, text
+from datetime import datetime
+from app.db.database import Base
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class ScrapeRun(Base):
+    """One run of the scrapers, from trigger to completion"""
+    __tablename__ = "scrape_runs"
+    __table_args__ = (
+        # At most one queued or running run per scope, even across API processes and workers
+        Index(
+            "ux_scrape_runs_active_scope", "scope", unique=True,
+            sqlite_where=text("status IN ('queued', 'running')"),
+            postgresql_where=text("status IN ('queued', 'running')")
+        ),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String, nullable=False, default="queued", index=True)  # queued, running, succeeded, failed
+    trigger = Column(String, nullable=False)  # api, scheduler, worker
+    scope = Column(String, nullable=False, default="all", server_default="all")  # all, or the source a worker run covers
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    # Bumped as the run progresses; a run without one for scrape_run_stale_seconds is abandoned
+    heartbeat_at = Column(DateTime, default=datetime.utcnow, nullable=True)
+    scrapers_total = Column(Integer, nullable=False, default=0)
+    scrapers_done = Column(Integer, nullable=False, default=0)
+    total_scraped = Column(Integer, nullable=False, default=0)
+    total_created = Column(Integer, nullable=False, default=0)
+    total_updated = Column(Integer, nullable=False, default=0)
+    duration_seconds = Column(Float, nullable=True)
+    jobs_per_second = Column(Float, nullable=True)
+    error = Column(Text, nullable=True)
+    details = Column(JSON, nullable=True)
+    
+    def __repr__(self):
+        return f"<ScrapeRun {self.id} {self.status}>"
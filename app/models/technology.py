@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, Table
+from app.db.database import Base
+
+job_technologies = Table(
+    "job_technologies",
+    Base.metadata,
+    Column("job_id", Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True),
+    Column("technology_id", Integer, ForeignKey("technologies.id", ondelete="CASCADE"), primary_key=True),
+    # The primary key serves lookups by job; this one serves filters and counts by technology
+    Index("ix_job_technologies_technology_id", "technology_id", "job_id"),
+)
+
+
+class Technology(Base):
+    __tablename__ = "technologies"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)  # display name, as first seen
+    slug = Column(String, unique=True, nullable=False)  # lowercased lookup key
+    
+    def __repr__(self):
+        return f"<Technology {self.name}>"
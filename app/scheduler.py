@@ -1,6 +1,7 @@
 from apscheduler.schedulers.background import BackgroundScheduler
-from sqlalchemy.orm import Session
 from app.services.scraper_service import ScraperService
+from app.services.scrape_run_service import ScrapeRunService
+from app.services.task_queue import enqueue_scrape_tasks
 from app.db.database import SessionLocal
 from app.core.config import get_settings
 import logging
@@ -11,14 +12,24 @@ logger = logging.getLogger(__name__)
 
 def scheduled_scrape_job():
     """Job to run on schedule"""
+    if settings.scrape_dispatch == "queue":
+        # Workers do the scraping; every API process may enqueue, the per-source lock dedups
+        sources = [scraper.source_name for scraper in ScraperService().scrapers]
+        enqueue_scrape_tasks(sources)
+        logger.info(f"Enqueued scrape tasks for {sources}")
+        return
+    
     logger.info("Running scheduled scrape job")
     db = SessionLocal()
     try:
-        scraper_service = ScraperService()
-        results = scraper_service.run_all_scrapers(db)
-        logger.info(f"Scheduled scrape completed: {results}")
+        run, created = ScrapeRunService.start_or_join(db, trigger="scheduler")
     finally:
         db.close()
+    
+    if not created:
+        logger.info(f"Scrape run {run.id} already in flight, skipping scheduled run")
+        return
+    ScrapeRunService.execute(run.id, SessionLocal)
 
 
 def start_scheduler():
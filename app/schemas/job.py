@@ -10,6 +10,8 @@ class JobBase(BaseModel):
     description: Optional[str] = None
     salary_min: Optional[float] = None
     salary_max: Optional[float] = None
+    salary_currency: Optional[str] = None  # ISO 4217 code, e.g. EUR
+    salary_period: Optional[str] = None  # hour, day, week, month or year
     url: str
     source: str
     job_type: Optional[str] = None
@@ -33,9 +35,11 @@ class JobResponse(JobBase):
 
 class JobStats(BaseModel):
     total_jobs: int
+    unique_jobs: int = 0  # total_jobs minus near-duplicates of other listings
     active_jobs: int
     companies_count: int
     locations_count: int
     avg_salary: Optional[float]
     top_technologies: list[dict]
     jobs_by_source: list[dict]
+    refreshed_at: Optional[datetime] = None
@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+
+class ScrapeRunResponse(BaseModel):
+    id: int
+    status: str
+    trigger: str
+    scope: str
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    heartbeat_at: Optional[datetime] = None
+    scrapers_total: int
+    scrapers_done: int
+    total_scraped: int
+    total_created: int
+    total_updated: int
+    duration_seconds: Optional[float] = None
+    jobs_per_second: Optional[float] = None
+    error: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
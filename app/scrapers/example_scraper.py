@@ -1,11 +1,22 @@
-from typing import List
+from typing import Iterator, List, Optional, Set, Tuple
 from datetime import datetime
+from functools import partial
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup, SoupStrainer
 import logging
 from app.schemas.job import JobCreate
-from app.utils.scraper_helpers import fetch_page, clean_text
+from app.core.config import get_settings
+from app.utils.async_fetch import fetch_pages
+from app.utils.normalize import normalize_records, validate_job
+from app.utils.parse_pool import get_parse_pool
+from app.utils.scraper_helpers import clean_text
 
+settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Only build the tree for job cards, not the whole page
+JOB_CARD_STRAINER = SoupStrainer('div', class_='job-card')
+
 
 class ExampleJobScraper:
     """
@@ -13,41 +24,133 @@ class ExampleJobScraper:
     In production, replace with actual job board scraper
     """
     
-    def __init__(self):
-        self.base_url = "https://example-job-board.com"
+    # Accepts known_urls/since so ScraperService can run it incrementally
+    supports_incremental = True
+    
+    def __init__(self, base_url: Optional[str] = None, max_pages: int = 3):
+        self.base_url = base_url or "https://example-job-board.com"
         self.source_name = "ExampleJobs"
+        # Pagination depth when ScraperService doesn't pass one
+        self.max_pages = max_pages
+        # The default board doesn't exist, so serve demo data unless pointed at a real one
+        self.demo = base_url is None
+        # Listing pages the last scrape failed to fetch; their jobs weren't seen
+        self.failed_pages: List[int] = []
+        # Parsed records of the last scrape that failed validation
+        self.invalid_records = 0
     
-    def scrape_jobs(self, max_pages: int = 3) -> List[JobCreate]:
-        """Scrape jobs from example site"""
-        jobs = []
-        
-        # This is a DEMO - creates fake data
-        # In production, replace with actual scraping logic
+    def scrape_jobs(
+        self,
+        max_pages: Optional[int] = None,
+        known_urls: Optional[Set[str]] = None,
+        since: Optional[datetime] = None
+    ) -> List[JobCreate]:
+        """Scrape jobs from example site into one list (see iter_jobs)"""
+        return [job for batch in self.iter_jobs(max_pages, known_urls, since) for job in batch]
+    
+    def iter_jobs(
+        self,
+        max_pages: Optional[int] = None,
+        known_urls: Optional[Set[str]] = None,
+        since: Optional[datetime] = None
+    ) -> Iterator[List[JobCreate]]:
+        """
+        Scrape jobs from example site, yielding them as listing pages are parsed
+        With `known_urls` (and optionally the `since` checkpoint) pagination
+        stops at the first page that holds only already-known listings
+        """
         logger.info(f"Starting scrape from {self.source_name}")
+        self.failed_pages = []
+        self.invalid_records = 0
+        if max_pages is None:
+            max_pages = self.max_pages
         
-        # Example of what real scraping would look like:
-        # for page in range(1, max_pages + 1):
-        #     url = f"{self.base_url}/jobs?page={page}"
-        #     soup = fetch_page(url)
-        #     
-        #     if not soup:
-        #         continue
-        #     
-        #     job_cards = soup.find_all('div', class_='job-card')
-        #     
-        #     for card in job_cards:
-        #         try:
-        #             job = self._parse_job_card(card)
-        #             if job:
-        #                 jobs.append(job)
-        #         except Exception as e:
-        #             logger.error(f"Error parsing job: {e}")
+        if self.demo:
+            # For demo, create sample jobs
+            batches = iter([self._create_sample_jobs()])
+        elif known_urls is not None:
+            batches = self._scrape_new_listing_pages(max_pages, known_urls, since)
+        else:
+            batches = self._scrape_listing_pages(max_pages)
         
-        # For demo, create sample jobs
-        sample_jobs = self._create_sample_jobs()
-        jobs.extend(sample_jobs)
+        scraped = 0
+        for batch in batches:
+            scraped += len(batch)
+            yield batch
         
-        logger.info(f"Scraped {len(jobs)} jobs from {self.source_name}")
+        if self.failed_pages:
+            logger.warning(f"{self.source_name}: failed to fetch listing pages {self.failed_pages}")
+        logger.info(f"Scraped {scraped} jobs from {self.source_name}")
+    
+    def listing_url(self, page: int) -> str:
+        """URL of a listing page"""
+        return f"{self.base_url}/jobs?page={page}"
+    
+    def _listing_windows(self, max_pages: int) -> Iterator[List[Tuple[int, bytes]]]:
+        """
+        Fetch listing pages a window at a time over the process-wide fetcher
+        Windows reuse its keep-alive connections, and the per-host limit still
+        caps requests in flight. A window covers fetch_per_host_limit pages, or
+        parse_workers pages if that is more, so every parse worker gets a page.
+        Pages that fail to fetch are left out and noted in failed_pages
+        """
+        window = max(1, settings.fetch_per_host_limit, settings.parse_workers)
+        for first_page in range(1, max_pages + 1, window):
+            pages = range(first_page, min(first_page + window, max_pages + 1))
+            contents = fetch_pages([self.listing_url(page) for page in pages])
+            self.failed_pages.extend(page for page, content in zip(pages, contents) if content is None)
+            yield [
+                (page, content) for page, content in zip(pages, contents)
+                if isinstance(content, bytes) and content
+            ]
+    
+    def _scrape_listing_pages(self, max_pages: int) -> Iterator[List[JobCreate]]:
+        """Fetch listing pages window by window, parsing each window in the parse pool"""
+        for window in self._listing_windows(max_pages):
+            if window:
+                yield self.parse_pages([content for _, content in window])
+    
+    def _scrape_new_listing_pages(
+        self,
+        max_pages: int,
+        known_urls: Set[str],
+        since: Optional[datetime]
+    ) -> Iterator[List[JobCreate]]:
+        """Walk listing pages newest-first, a window at a time, until one holds nothing new"""
+        def is_known(job: JobCreate) -> bool:
+            if job.url in known_urls:
+                return True
+            return since is not None and job.posted_date is not None and job.posted_date <= since
+        
+        for window in self._listing_windows(max_pages):
+            # Parse the whole window in the parse pool, then walk it page by page
+            parsed = self.parse_pages_each([content for _, content in window])
+            for (page, _), page_jobs in zip(window, parsed):
+                yield page_jobs
+                if all(is_known(job) for job in page_jobs):
+                    logger.info(f"{self.source_name}: page {page} has no new listings, stopping")
+                    return
+    
+    def parse_pages(self, pages: List[bytes]) -> List[JobCreate]:
+        """Extract raw records from listing pages, then normalize them as one batch"""
+        parser = partial(parse_listing_page, base_url=self.base_url, source=self.source_name)
+        return [job for job in self._validate(get_parse_pool().parse(parser, pages)) if job is not None]
+    
+    def parse_pages_each(self, pages: List[bytes]) -> List[List[JobCreate]]:
+        """Like parse_pages, but returns each page's jobs separately"""
+        parser = partial(parse_listing_page, base_url=self.base_url, source=self.source_name)
+        page_records = get_parse_pool().parse_each(parser, pages)
+        # One entry per record, invalid ones included, so the pages stay aligned
+        jobs = iter(self._validate([record for records in page_records for record in records]))
+        return [
+            [job for job in (next(jobs) for _ in records) if job is not None]
+            for records in page_records
+        ]
+    
+    def _validate(self, records: List[dict]) -> List[Optional[JobCreate]]:
+        """Normalize records as one batch; those that fail validation are None and counted"""
+        jobs = [validate_job(record) for record in normalize_records(records)]
+        self.invalid_records += jobs.count(None)
         return jobs
     
     def _create_sample_jobs(self) -> List[JobCreate]:
@@ -60,6 +163,8 @@ class ExampleJobScraper:
                 description="We're looking for an experienced backend engineer...",
                 salary_min=60000,
                 salary_max=80000,
+                salary_currency="EUR",
+                salary_period="year",
                 url=f"{self.base_url}/job/backend-engineer-1",
                 source=self.source_name,
                 job_type="remote",
@@ -74,6 +179,8 @@ class ExampleJobScraper:
                 description="Join our data team to build scalable pipelines...",
                 salary_min=50000,
                 salary_max=70000,
+                salary_currency="EUR",
+                salary_period="year",
                 url=f"{self.base_url}/job/data-engineer-1",
                 source=self.source_name,
                 job_type="hybrid",
@@ -88,6 +195,8 @@ class ExampleJobScraper:
                 description="Build amazing products with modern stack...",
                 salary_min=45000,
                 salary_max=65000,
+                salary_currency="EUR",
+                salary_period="year",
                 url=f"{self.base_url}/job/fullstack-dev-1",
                 source=self.source_name,
                 job_type="remote",
@@ -96,12 +205,47 @@ class ExampleJobScraper:
                 posted_date=datetime.utcnow()
             ),
         ]
+
+
+def parse_listing_page(content: bytes, base_url: str, source: str) -> List[dict]:
+    """Parse raw job records out of a listing page (runs in parse pool workers)"""
+    jobs = []
+    soup = BeautifulSoup(content, 'lxml', parse_only=JOB_CARD_STRAINER)
+    
+    for card in soup.find_all('div', class_='job-card'):
+        try:
+            job = parse_job_card(card, base_url, source)
+            if job:
+                jobs.append(job)
+        except Exception as e:
+            logger.error(f"Error parsing job: {e}")
+    
+    return jobs
+
+
+def parse_job_card(card, base_url: str, source: str) -> Optional[dict]:
+    """Parse individual job card into a raw record for normalize_records"""
+    link = card.select_one('.title a')
+    company = card.select_one('.company')
+    if not link or not link.get('href') or not company:
+        return None
+    
+    def text_of(selector: str) -> Optional[str]:
+        element = card.select_one(selector)
+        return clean_text(element.get_text()) if element else None
+    
+    posted = card.select_one('time')
+    tags = [clean_text(tag.get_text()) for tag in card.select('.tags li')]
     
-    def _parse_job_card(self, card) -> JobCreate:
-        """Parse individual job card - example structure"""
-        # This would contain actual parsing logic for real sites
-        # Example:
-        # title = clean_text(card.find('h2', class_='title').text)
-        # company = clean_text(card.find('span', class_='company').text)
-        # etc.
-        pass
+    return dict(
+        title=clean_text(link.get_text()),
+        company=clean_text(company.get_text()),
+        location=text_of('.location'),
+        description=text_of('.description'),
+        salary=text_of('.salary'),
+        url=urljoin(base_url, link['href']),
+        source=source,
+        job_type=text_of('.job-type'),
+        technologies=', '.join(tags) if tags else None,
+        posted_date=datetime.fromisoformat(posted['datetime']) if posted and posted.get('datetime') else None
+    )
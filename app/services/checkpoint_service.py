@@ -0,0 +1,38 @@
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import List, Optional
+from app.models.scrape_checkpoint import ScrapeCheckpoint
+from app.schemas.job import JobCreate
+
+
+class CheckpointService:
+    @staticmethod
+    def get_checkpoint(db: Session, source: str) -> Optional[ScrapeCheckpoint]:
+        """Get the checkpoint of a source"""
+        return db.get(ScrapeCheckpoint, source)
+    
+    @staticmethod
+    def update_checkpoint(
+        db: Session,
+        source: str,
+        jobs: List[JobCreate],
+        complete: bool = False
+    ) -> ScrapeCheckpoint:
+        """Advance a source's checkpoint past the newest job scraped"""
+        checkpoint = db.get(ScrapeCheckpoint, source)
+        if checkpoint is None:
+            checkpoint = ScrapeCheckpoint(source=source)
+            db.add(checkpoint)
+        
+        dated_jobs = [job for job in jobs if job.posted_date is not None]
+        if dated_jobs:
+            newest = max(dated_jobs, key=lambda job: job.posted_date)
+            if checkpoint.last_posted_date is None or newest.posted_date > checkpoint.last_posted_date:
+                checkpoint.last_posted_date = newest.posted_date
+                checkpoint.last_url = newest.url
+        
+        checkpoint.last_run_at = datetime.utcnow()
+        if complete:
+            checkpoint.last_full_run_at = checkpoint.last_run_at
+        db.commit()
+        return checkpoint
@@ -0,0 +1,125 @@
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import delete, insert, select, update
+from collections import defaultdict
+from typing import Dict, List, Set
+import logging
+from app.models.job import Job
+from app.models.job_lsh_band import job_lsh_bands
+from app.utils.minhash import band_keys, jaccard, job_shingles, signature
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class DedupService:
+    @staticmethod
+    def index_jobs(db: Session, job_ids: List[int]) -> int:
+        """
+        Link new or changed jobs to the canonical job they near-duplicate
+        Candidates come from shared LSH buckets and are confirmed by exact
+        shingle Jaccard similarity, so each job costs a few index lookups
+        rather than a scan. Returns how many jobs were marked as duplicates.
+        """
+        if not job_ids:
+            return 0
+        
+        jobs = db.query(
+            Job.id, Job.title, Job.company, Job.location, Job.description
+        ).filter(Job.id.in_(job_ids)).order_by(Job.id).all()
+        
+        tokens: Dict[int, Set[str]] = {
+            job.id: job_shingles(job.title, job.company, job.location, job.description)
+            for job in jobs
+        }
+        keys = {job_id: band_keys(signature(job_tokens)) for job_id, job_tokens in tokens.items()}
+        
+        # Changed jobs are re-indexed from scratch
+        db.execute(delete(job_lsh_bands).where(job_lsh_bands.c.job_id.in_(list(tokens))))
+        
+        buckets: Dict[int, Set[int]] = defaultdict(set)
+        all_keys = {key for job_keys in keys.values() for key in job_keys}
+        for job_id, bucket in db.execute(
+            select(job_lsh_bands.c.job_id, job_lsh_bands.c.bucket).where(job_lsh_bands.c.bucket.in_(all_keys))
+        ):
+            buckets[bucket].add(job_id)
+        
+        # Shingles and canonical ids of the stored candidates, in one query;
+        # taken-down listings aren't linked to
+        roots: Dict[int, int] = {}
+        stored = set().union(*buckets.values())
+        if stored:
+            for row in db.query(
+                Job.id, Job.canonical_job_id, Job.title, Job.company, Job.location, Job.description
+            ).filter(Job.id.in_(stored), Job.is_active.is_(True)):
+                tokens[row.id] = job_shingles(row.title, row.company, row.location, row.description)
+                roots[row.id] = row.canonical_job_id or row.id
+        
+        updates = []
+        band_rows = []
+        for job in jobs:
+            candidates = set().union(*(buckets[key] for key in keys[job.id])) & roots.keys() - {job.id}
+            matches = [
+                roots[candidate] for candidate in candidates
+                if roots[candidate] != job.id
+                and jaccard(tokens[job.id], tokens[candidate]) >= settings.dedup_threshold
+            ]
+            # The oldest canonical job wins, so every copy points at the same one
+            canonical = min(matches) if matches else None
+            roots[job.id] = canonical or job.id
+            updates.append({"id": job.id, "canonical_job_id": canonical})
+            
+            # Later jobs in this batch can match this one
+            for band, key in enumerate(keys[job.id]):
+                buckets[key].add(job.id)
+                band_rows.append({"job_id": job.id, "band": band, "bucket": key})
+        
+        db.execute(update(Job), updates)
+        db.execute(insert(job_lsh_bands), band_rows)
+        return sum(1 for row in updates if row["canonical_job_id"] is not None)
+    
+    @staticmethod
+    def relink_orphans(db: Session) -> int:
+        """
+        Give active duplicates of deactivated canonical jobs a new canonical job
+        The oldest active duplicate takes over, and the rest of the group,
+        including the deactivated job, point at it. Returns how many were relinked.
+        """
+        canonical = aliased(Job)
+        groups: Dict[int, List[int]] = defaultdict(list)
+        for job_id, canonical_id in db.query(Job.id, Job.canonical_job_id).join(
+            canonical, Job.canonical_job_id == canonical.id
+        ).filter(Job.is_active.is_(True), canonical.is_active.is_(False)):
+            groups[canonical_id].append(job_id)
+        if not groups:
+            return 0
+        
+        updates = []
+        for canonical_id, job_ids in groups.items():
+            root = min(job_ids)
+            updates.append({"id": root, "canonical_job_id": None})
+            updates.extend({"id": job_id, "canonical_job_id": root} for job_id in job_ids if job_id != root)
+            updates.append({"id": canonical_id, "canonical_job_id": root})
+        db.execute(update(Job), updates)
+        return sum(len(job_ids) for job_ids in groups.values())
+    
+    @staticmethod
+    def backfill(db: Session, batch_size: int = 1000) -> int:
+        """Index all existing jobs in id order, one committed batch at a time"""
+        last_id = 0
+        duplicates = 0
+        
+        while True:
+            ids = [job_id for (job_id,) in db.query(Job.id).filter(
+                Job.id > last_id
+            ).order_by(Job.id).limit(batch_size)]
+            if not ids:
+                break
+            
+            duplicates += DedupService.index_jobs(db, ids)
+            db.commit()
+            
+            last_id = ids[-1]
+            logger.info(f"Indexed jobs up to id {last_id}, {duplicates} duplicates so far")
+        
+        return duplicates
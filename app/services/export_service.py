@@ -0,0 +1,127 @@
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from datetime import datetime
+from typing import AsyncIterator, List, Sequence
+import csv
+import io
+import orjson
+from app.schemas.job import JobResponse
+from app.services.job_service import JobService
+
+EXPORT_COLUMNS: List[str] = list(JobResponse.model_fields)
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class _ChunkSink:
+    """Write-only file object handing back what was written since the last drain"""
+    
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        # Parquet footers record absolute offsets, so report the total written
+        return self._position
+    
+    def flush(self):
+        pass
+    
+    def close(self):
+        self.closed = True
+    
+    def writable(self) -> bool:
+        return True
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ExportService:
+    @staticmethod
+    async def stream_rows(
+        session_factory: async_sessionmaker,
+        filters: dict
+    ) -> AsyncIterator[Sequence[tuple]]:
+        """Yield batches of plain row tuples from a server-side cursor"""
+        async with session_factory() as db:
+            stmt = JobService.export_statement(db.bind.dialect.name, EXPORT_COLUMNS, **filters)
+            result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            async for batch in result.partitions():
+                yield batch
+    
+    @staticmethod
+    async def ndjson(batches: AsyncIterator[Sequence[tuple]]) -> AsyncIterator[bytes]:
+        async for batch in batches:
+            yield b"".join(
+                orjson.dumps(dict(zip(EXPORT_COLUMNS, row)), option=orjson.OPT_APPEND_NEWLINE)
+                for row in batch
+            )
+    
+    @staticmethod
+    async def csv(batches: AsyncIterator[Sequence[tuple]]) -> AsyncIterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        
+        async for batch in batches:
+            writer.writerows(
+                [value.isoformat() if isinstance(value, datetime) else value for value in row]
+                for row in batch
+            )
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+    
+    @staticmethod
+    async def parquet(batches: AsyncIterator[Sequence[tuple]]) -> AsyncIterator[bytes]:
+        """One Parquet row group per batch (requires pyarrow)"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        schema = ExportService.parquet_schema()
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema)
+        
+        async for batch in batches:
+            columns = list(zip(*batch))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema
+            ))
+            yield sink.drain()
+        
+        writer.close()
+        yield sink.drain()
+    
+    @staticmethod
+    def parquet_schema():
+        import pyarrow as pa
+        
+        types = {
+            int: pa.int64(),
+            float: pa.float64(),
+            bool: pa.bool_(),
+            datetime: pa.timestamp("us"),
+        }
+        fields = []
+        for name, field in JobResponse.model_fields.items():
+            # Optional[X] annotations carry X as their first argument
+            annotation = getattr(field.annotation, "__args__", (field.annotation,))[0]
+            fields.append(pa.field(name, types.get(annotation, pa.string())))
+        return pa.schema(fields)
@@ -1,29 +1,90 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from typing import List, Optional
-from app.models.job import Job
+from sqlalchemy.engine import Row
+from sqlalchemy import func, desc, insert, update, select, tuple_, or_, literal_column, table, column, Select
+from datetime import datetime, timedelta
+from typing import List, Optional, Set, Tuple
+import base64
+import hashlib
+import json
+import time
+from app.models.job import Job, SEARCH_DOCUMENT, SEARCH_FIELDS
+from app.models.job_stats import JobStatsSummary
+from app.models.technology import Technology, job_technologies
+from app.db.database import UPSERT_INSERTS
+from app.services.dedup_service import DedupService
+from app.services.technology_service import TechnologyService, slugify
 from app.schemas.job import JobCreate, JobStats
+from app.core.config import get_settings
+from app.core.api_cache import get_api_cache
+from app.core.metrics import INGEST_CHUNK_SECONDS, record_ingest, timed_query
 import logging
 
+settings = get_settings()
 logger = logging.getLogger(__name__)
 
+JOB_FIELDS = tuple(JobCreate.model_fields)
+# posted_date is left out: boards often render it relative to today
+HASH_FIELDS = tuple(field for field in JOB_FIELDS if field not in ("url", "posted_date"))
+# Columns written when a listing is inserted or has changed
+WRITE_FIELDS = JOB_FIELDS + ("content_hash", "last_seen_at", "is_active")
+
+jobs_fts = table("jobs_fts", column("rowid"), column("rank"))
+
+
+def content_hash(row: dict) -> str:
+    """Fingerprint of a job's normalized fields, stable across whitespace and case changes"""
+    normalized = [
+        " ".join(value.split()).lower() if isinstance(value, str) else value
+        for value in (row[field] for field in HASH_FIELDS)
+    ]
+    return hashlib.blake2b(json.dumps(normalized).encode(), digest_size=16).hexdigest()
+
+
+def encode_cursor(job: Job) -> str:
+    """Opaque keyset cursor pointing just past `job`"""
+    raw = f"{job.scraped_at.isoformat()}|{job.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor from encode_cursor, raising ValueError if malformed"""
+    try:
+        scraped_at, job_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(scraped_at), int(job_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
 
 class JobService:
     @staticmethod
+    @timed_query
     def create_job(db: Session, job: JobCreate) -> Job:
         """Create new job listing"""
-        db_job = Job(**job.model_dump())
+        row = job.model_dump()
+        db_job = Job(**row, content_hash=content_hash(row), last_seen_at=datetime.utcnow())
         db.add(db_job)
+        db.flush()
+        TechnologyService.link_jobs(db, {db_job.id: db_job.technologies})
+        if settings.dedup_enabled:
+            DedupService.index_jobs(db, [db_job.id])
         db.commit()
         db.refresh(db_job)
         return db_job
     
     @staticmethod
+    @timed_query
     def get_job_by_url(db: Session, url: str) -> Optional[Job]:
         """Get job by URL (to avoid duplicates)"""
         return db.query(Job).filter(Job.url == url).first()
     
     @staticmethod
+    @timed_query
+    def get_known_urls(db: Session, source: str) -> Set[str]:
+        """All stored URLs of a source, for in-memory known-listing checks"""
+        return {url for (url,) in db.query(Job.url).filter(Job.source == source)}
+    
+    @staticmethod
+    @timed_query
     def get_jobs(
         db: Session, 
         skip: int = 0, 
@@ -31,10 +92,80 @@ class JobService:
         company: Optional[str] = None,
         location: Optional[str] = None,
         job_type: Optional[str] = None,
-        source: Optional[str] = None
+        source: Optional[str] = None,
+        technology: Optional[str] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+        q: Optional[str] = None,
+        dedupe: bool = False
     ) -> List[Job]:
-        """Get jobs with filters"""
-        query = db.query(Job).filter(Job.is_active == True)
+        """
+        Get jobs with filters, newest first
+        Pass `after` (a decoded cursor) for keyset pagination instead of `skip`,
+        or `q` for full-text search ranked by relevance
+        """
+        query = JobService.apply_filters(
+            db.query(Job),
+            dialect=db.get_bind().dialect.name,
+            company=company,
+            location=location,
+            job_type=job_type,
+            source=source,
+            technology=technology,
+            q=q,
+            dedupe=dedupe
+        )
+        return JobService._paginate(query, skip, limit, after).all()
+    
+    @staticmethod
+    @timed_query
+    def get_job_rows(
+        db: Session,
+        columns: List[str],
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, int]] = None,
+        **filters
+    ) -> List[Row]:
+        """
+        Same listing as get_jobs, but only the named columns as plain rows
+        Skips ORM object construction for read paths that serialize directly
+        """
+        stmt = JobService.apply_filters(
+            select(*[getattr(Job, name) for name in columns]),
+            dialect=db.get_bind().dialect.name,
+            **filters
+        )
+        return db.execute(JobService._paginate(stmt, skip, limit, after)).all()
+    
+    @staticmethod
+    def _paginate(query, skip: int, limit: int, after: Optional[Tuple[datetime, int]]):
+        """Newest-first ordering with offset or keyset pagination"""
+        query = query.order_by(desc(Job.scraped_at), desc(Job.id))
+        if after:
+            # Row-value comparison walks the (scraped_at, id) index from the cursor
+            query = query.filter(tuple_(Job.scraped_at, Job.id) < after)
+        else:
+            query = query.offset(skip)
+        
+        return query.limit(limit)
+    
+    @staticmethod
+    def apply_filters(
+        query,
+        dialect: str,
+        company: Optional[str] = None,
+        location: Optional[str] = None,
+        job_type: Optional[str] = None,
+        source: Optional[str] = None,
+        technology: Optional[str] = None,
+        q: Optional[str] = None,
+        dedupe: bool = False
+    ):
+        """Apply the job list filters to an ORM query or a Core select over jobs"""
+        query = query.filter(Job.is_active == True)
+        
+        if dedupe:
+            query = query.filter(Job.canonical_job_id.is_(None))
         
         if company:
             query = query.filter(Job.company.ilike(f"%{company}%"))
@@ -44,18 +175,111 @@ class JobService:
             query = query.filter(Job.job_type == job_type)
         if source:
             query = query.filter(Job.source == source)
+        if technology:
+            query = query.join(
+                job_technologies, job_technologies.c.job_id == Job.id
+            ).join(
+                Technology, Technology.id == job_technologies.c.technology_id
+            ).filter(Technology.slug == slugify(technology))
         
-        return query.order_by(desc(Job.scraped_at)).offset(skip).limit(limit).all()
+        if q:
+            query = JobService._apply_search(dialect, query, q)
+        
+        return query
+    
+    @staticmethod
+    def export_statement(dialect: str, columns: List[str], **filters) -> Select:
+        """Column-only select of filtered jobs in id order, for streaming exports"""
+        stmt = select(*[getattr(Job, name) for name in columns])
+        return JobService.apply_filters(stmt, dialect, **filters).order_by(Job.id)
+    
+    @staticmethod
+    def _apply_search(dialect: str, query, q: str):
+        """Filter by full-text match on title, company, location, description and technologies"""
+        if dialect == "postgresql":
+            # Inline the config and document so the expression matches ix_jobs_search
+            document = func.to_tsvector(literal_column("'english'"), literal_column(SEARCH_DOCUMENT))
+            tsquery = func.websearch_to_tsquery(literal_column("'english'"), q)
+            return query.filter(document.op("@@")(tsquery)).order_by(
+                desc(func.ts_rank(document, tsquery))
+            )
+        
+        if dialect == "sqlite":
+            # Quote every term so user input can't inject FTS5 query syntax
+            terms = " ".join('"' + term.replace('"', '""') + '"' for term in q.split())
+            return query.join(jobs_fts, jobs_fts.c.rowid == Job.id).filter(
+                literal_column("jobs_fts").match(terms)
+            ).order_by(jobs_fts.c.rank)
+        
+        return query.filter(or_(*[getattr(Job, field).ilike(f"%{q}%") for field in SEARCH_FIELDS]))
     
     @staticmethod
+    @timed_query
     def get_job_by_id(db: Session, job_id: int) -> Optional[Job]:
         """Get job by ID"""
         return db.query(Job).filter(Job.id == job_id).first()
     
     @staticmethod
-    def get_stats(db: Session) -> JobStats:
-        """Get job statistics"""
+    @timed_query
+    def get_stats(db: Session) -> Optional[JobStats]:
+        """
+        Get job statistics from the precomputed summary, or None before its first refresh
+        Never recomputes: ingest refreshes the summary, and callers refresh
+        one older than stats_max_age_seconds (see stats_stale) off the request path
+        """
+        summary = db.get(JobStatsSummary, 1)
+        if summary is None:
+            return None
+        
+        return JobStats(
+            total_jobs=summary.total_jobs,
+            unique_jobs=summary.unique_jobs,
+            active_jobs=summary.active_jobs,
+            companies_count=summary.companies_count,
+            locations_count=summary.locations_count,
+            avg_salary=summary.avg_salary,
+            top_technologies=summary.top_technologies,
+            jobs_by_source=summary.jobs_by_source,
+            refreshed_at=summary.refreshed_at
+        )
+    
+    @staticmethod
+    def stats_stale(stats: JobStats) -> bool:
+        """Whether the summary may miss writes made outside ingest"""
+        max_age = timedelta(seconds=settings.stats_max_age_seconds)
+        return stats.refreshed_at < datetime.utcnow() - max_age
+    
+    @staticmethod
+    @timed_query
+    def refresh_stats(db: Session) -> JobStats:
+        """Recompute the stats summary and store it"""
+        stats = JobService.compute_stats(db)
+        values = stats.model_dump()
+        
+        upsert = UPSERT_INSERTS.get(db.get_bind().dialect.name)
+        if upsert is not None:
+            # Concurrent refreshes (e.g. from several API processes) both write the one row
+            stmt = upsert(JobStatsSummary).values(id=1, **values)
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[JobStatsSummary.id],
+                set_={field: stmt.excluded[field] for field in values}
+            ))
+        else:
+            summary = db.get(JobStatsSummary, 1)
+            if summary is None:
+                summary = JobStatsSummary(id=1)
+                db.add(summary)
+            for field, value in values.items():
+                setattr(summary, field, value)
+        db.commit()
+        
+        return stats
+    
+    @staticmethod
+    def compute_stats(db: Session) -> JobStats:
+        """Run the aggregate queries behind the stats summary"""
         total_jobs = db.query(func.count(Job.id)).scalar()
+        unique_jobs = db.query(func.count(Job.id)).filter(Job.canonical_job_id.is_(None)).scalar()
         active_jobs = db.query(func.count(Job.id)).filter(Job.is_active == True).scalar()
         companies_count = db.query(func.count(func.distinct(Job.company))).scalar()
         locations_count = db.query(func.count(func.distinct(Job.location))).scalar()
@@ -70,13 +294,13 @@ class JobService:
         
         avg_salary = float(avg_salary_result) if avg_salary_result else None
         
-        # Top technologies (simplified - in production use proper parsing)
+        # Top technologies, counted per technology through the association table
         tech_query = db.query(
-            Job.technologies,
-            func.count(Job.id).label('count')
-        ).filter(
-            Job.technologies.isnot(None)
-        ).group_by(Job.technologies).order_by(desc('count')).limit(10).all()
+            Technology.name,
+            func.count(job_technologies.c.job_id).label('count')
+        ).join(
+            job_technologies, job_technologies.c.technology_id == Technology.id
+        ).group_by(Technology.id, Technology.name).order_by(desc('count')).limit(10).all()
         
         top_technologies = [
             {"technology": tech, "count": count} 
@@ -96,31 +320,160 @@ class JobService:
         
         return JobStats(
             total_jobs=total_jobs,
+            unique_jobs=unique_jobs,
             active_jobs=active_jobs,
             companies_count=companies_count,
             locations_count=locations_count,
             avg_salary=avg_salary,
             top_technologies=top_technologies,
-            jobs_by_source=jobs_by_source
+            jobs_by_source=jobs_by_source,
+            refreshed_at=datetime.utcnow()
         )
     
     @staticmethod
-    def bulk_create_jobs(db: Session, jobs: List[JobCreate]) -> int:
-        """Create multiple jobs, skip duplicates"""
-        created_count = 0
+    @timed_query
+    def bulk_create_jobs(
+        db: Session,
+        jobs: List[JobCreate],
+        chunk_size: Optional[int] = None,
+        publish: bool = True
+    ) -> dict:
+        """
+        Insert new jobs and update changed ones, deduplicated on URL
+        Unchanged jobs only get their last_seen_at bumped
+        Callers writing one source in several calls pass publish=False and
+        call publish_changes once at the end
+        """
+        if chunk_size is None:
+            chunk_size = settings.ingest_chunk_size
+        
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0, "failed": 0}
         
-        for job_data in jobs:
-            # Check if job already exists
-            existing_job = JobService.get_job_by_url(db, job_data.url)
+        # Last occurrence wins when a batch repeats a URL
+        unique_jobs = list({job.url: job for job in jobs}.values())
+        
+        for start in range(0, len(unique_jobs), chunk_size):
+            chunk = unique_jobs[start:start + chunk_size]
+            chunk_started = time.perf_counter()
+            try:
+                chunk_counts = JobService._upsert_chunk(db, chunk)
+                db.commit()
+                INGEST_CHUNK_SECONDS.observe(time.perf_counter() - chunk_started)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Error upserting chunk of {len(chunk)} jobs: {e}")
+                counts["failed"] += len(chunk)
+                continue
             
-            if not existing_job:
-                try:
-                    JobService.create_job(db, job_data)
-                    created_count += 1
-                except Exception as e:
-                    logger.error(f"Error creating job {job_data.url}: {e}")
-                    continue
+            for key, value in chunk_counts.items():
+                counts[key] += value
+        
+        record_ingest(counts)
+        if publish and (counts["inserted"] or counts["updated"]):
+            JobService.publish_changes(db)
+        
+        return counts
+    
+    @staticmethod
+    def publish_changes(db: Session):
+        """Refresh the stats summary and invalidate cached API responses after writes"""
+        JobService.refresh_stats(db)
+        api_cache = get_api_cache()
+        if api_cache is not None:
+            api_cache.bump_generation()
+    
+    @staticmethod
+    def _upsert_chunk(db: Session, chunk: List[JobCreate]) -> dict:
+        """Classify a chunk against stored rows and write only new or changed jobs"""
+        now = datetime.utcnow()
+        rows = []
+        for job in chunk:
+            row = job.model_dump()
+            row.update(content_hash=content_hash(row), last_seen_at=now, is_active=True)
+            rows.append(row)
+        
+        # One SELECT per chunk instead of one per job, reading hashes rather than whole rows
+        existing = {
+            row.url: row
+            for row in db.query(Job.id, Job.url, Job.content_hash, Job.is_active)
+            .filter(Job.url.in_([row["url"] for row in rows]))
+        }
+        
+        new_rows = []
+        changed_rows = []
+        seen_ids = []
+        for row in rows:
+            current = existing.get(row["url"])
+            if current is None:
+                new_rows.append(row)
+            elif current.content_hash != row["content_hash"] or not current.is_active:
+                changed_rows.append(row)
             else:
-                logger.debug(f"Job already exists: {job_data.url}")
+                seen_ids.append(current.id)
+        
+        if seen_ids:
+            db.execute(
+                update(Job).where(Job.id.in_(seen_ids)).values(last_seen_at=now)
+                .execution_options(synchronize_session=False)
+            )
+        
+        dialect = db.get_bind().dialect.name
+        upsert = UPSERT_INSERTS.get(dialect)
+        
+        if upsert is not None:
+            if new_rows or changed_rows:
+                # ON CONFLICT also covers rows inserted concurrently since the SELECT
+                stmt = upsert(Job)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[Job.url],
+                    set_={
+                        field: stmt.excluded[field]
+                        for field in WRITE_FIELDS if field != "url"
+                    }
+                )
+                db.execute(stmt, new_rows + changed_rows)
+        else:
+            if new_rows:
+                db.execute(insert(Job), new_rows)
+            if changed_rows:
+                db.execute(update(Job), [
+                    {**row, "id": existing[row["url"]].id} for row in changed_rows
+                ])
+        
+        written = {row["url"]: row["technologies"] for row in new_rows + changed_rows}
+        if written:
+            ids = db.query(Job.id, Job.url).filter(Job.url.in_(written)).all()
+            TechnologyService.link_jobs(db, {job_id: written[url] for job_id, url in ids})
+            if settings.dedup_enabled:
+                DedupService.index_jobs(db, [job_id for job_id, _ in ids])
+        
+        return {
+            "inserted": len(new_rows),
+            "updated": len(changed_rows),
+            "unchanged": len(seen_ids)
+        }
+    
+    @staticmethod
+    @timed_query
+    def deactivate_unseen(db: Session, source: str, seen_before: datetime, publish: bool = True) -> int:
+        """
+        Mark a source's active jobs not seen since `seen_before` as inactive
+        Their active duplicates on other boards get a new canonical job
+        """
+        result = db.execute(
+            update(Job)
+            .where(
+                Job.source == source,
+                Job.is_active.is_(True),
+                or_(Job.last_seen_at < seen_before, Job.last_seen_at.is_(None))
+            )
+            .values(is_active=False)
+            .execution_options(synchronize_session=False)
+        )
+        if settings.dedup_enabled and result.rowcount:
+            DedupService.relink_orphans(db)
+        db.commit()
         
-        return created_count
+        if publish and result.rowcount:
+            JobService.publish_changes(db)
+        return result.rowcount
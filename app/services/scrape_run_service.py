@@ -0,0 +1,149 @@
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import desc, func, update
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+import logging
+import threading
+from app.models.scrape_run import ACTIVE_STATUSES, ScrapeRun
+from app.services.scraper_service import ScraperService
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Last sign of life of a run; rows from before heartbeats fall back to their creation
+_last_heartbeat = func.coalesce(ScrapeRun.heartbeat_at, ScrapeRun.created_at)
+
+# Saves needless insert conflicts within a process; across processes the
+# unique index on active runs per scope is the arbiter
+_start_lock = threading.Lock()
+
+
+class ScrapeRunService:
+    @staticmethod
+    def get_active_run(db: Session, scope: Optional[str] = None) -> Optional[ScrapeRun]:
+        """In-flight run of `scope`, or of any scope, ignoring runs abandoned by a crashed process"""
+        stale_before = datetime.utcnow() - timedelta(seconds=settings.scrape_run_stale_seconds)
+        query = db.query(ScrapeRun).filter(
+            ScrapeRun.status.in_(ACTIVE_STATUSES),
+            _last_heartbeat > stale_before
+        )
+        if scope is not None:
+            query = query.filter(ScrapeRun.scope == scope)
+        return query.order_by(desc(ScrapeRun.id)).first()
+    
+    @staticmethod
+    def get_last_finished_run(db: Session) -> Optional[ScrapeRun]:
+        return db.query(ScrapeRun).filter(
+            ScrapeRun.finished_at.isnot(None)
+        ).order_by(desc(ScrapeRun.id)).first()
+    
+    @staticmethod
+    def start_or_join(
+        db: Session,
+        trigger: str,
+        scope: str = "all",
+        sources: Optional[List[str]] = None
+    ) -> Tuple[ScrapeRun, bool]:
+        """Queue a new run of `scope`, or return its in-flight one; the flag is True if created"""
+        with _start_lock:
+            active = ScrapeRunService.get_active_run(db, scope)
+            if active is not None:
+                return active, False
+            
+            ScrapeRunService._abandon_stale_runs(db, scope)
+            try:
+                return ScrapeRunService.create_run(db, trigger, sources, scope), True
+            except IntegrityError:
+                # Another process created one since the check above
+                db.rollback()
+                active = ScrapeRunService.get_active_run(db, scope)
+                if active is None:
+                    raise
+                return active, False
+    
+    @staticmethod
+    def create_run(
+        db: Session,
+        trigger: str,
+        sources: Optional[List[str]] = None,
+        scope: str = "all"
+    ) -> ScrapeRun:
+        """
+        Record a queued run of all scrapers, or only those named in `sources`
+        Raises IntegrityError if `scope` already has one queued or running
+        """
+        run = ScrapeRun(
+            status="queued",
+            trigger=trigger,
+            scope=scope,
+            scrapers_total=len(sources) if sources is not None else len(ScraperService().scrapers)
+        )
+        db.add(run)
+        db.commit()
+        db.refresh(run)
+        return run
+    
+    @staticmethod
+    def _abandon_stale_runs(db: Session, scope: str):
+        """Mark runs without a heartbeat for scrape_run_stale_seconds as failed, freeing the scope"""
+        stale_before = datetime.utcnow() - timedelta(seconds=settings.scrape_run_stale_seconds)
+        db.execute(
+            update(ScrapeRun).where(
+                ScrapeRun.scope == scope,
+                ScrapeRun.status.in_(ACTIVE_STATUSES),
+                _last_heartbeat <= stale_before
+            ).values(status="failed", error="abandoned", finished_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+    
+    @staticmethod
+    def execute(run_id: int, session_factory: sessionmaker, sources: Optional[List[str]] = None) -> Optional[dict]:
+        """Carry out a queued run in its own session; returns its results, or None if it failed"""
+        db = session_factory()
+        try:
+            run = db.get(ScrapeRun, run_id)
+            run.status = "running"
+            run.started_at = run.heartbeat_at = datetime.utcnow()
+            db.commit()
+            
+            def on_progress(done: int, total: int):
+                run.scrapers_done = done
+                run.scrapers_total = total
+                run.heartbeat_at = datetime.utcnow()
+                db.commit()
+            
+            try:
+                results = ScraperService().run_all_scrapers(db, sources=sources, on_progress=on_progress)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Scrape run {run_id} failed: {e}")
+                outcome = {"status": "failed", "error": str(e)}
+                results = None
+            else:
+                duration = results["duration_seconds"]
+                outcome = {
+                    "status": "succeeded",
+                    "total_scraped": results["total_scraped"],
+                    "total_created": results["total_created"],
+                    "total_updated": results["total_updated"],
+                    "duration_seconds": duration,
+                    "jobs_per_second": round(results["total_scraped"] / duration, 1) if duration else None,
+                    "details": results["details"]
+                }
+                logger.info(f"Scrape run {run_id} completed: {results}")
+            
+            # A run abandoned meanwhile keeps that status: a newer run may already hold its scope
+            finished = db.execute(
+                update(ScrapeRun).where(ScrapeRun.id == run_id, ScrapeRun.status == "running")
+                .values(finished_at=datetime.utcnow(), **outcome)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            if not finished.rowcount:
+                logger.warning(f"Scrape run {run_id} was marked abandoned before it finished")
+            return results
+        finally:
+            db.close()
@@ -1,13 +1,79 @@
 from sqlalchemy.orm import Session
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Iterator, List, Optional
 from app.scrapers.example_scraper import ExampleJobScraper
+from app.schemas.job import JobCreate
 from app.services.job_service import JobService
+from app.services.checkpoint_service import CheckpointService
+from app.core.profiling import profiled
+from app.utils.response_cache import get_response_cache
+from app.utils.stream import prefetch, put_until
+from app.core.config import get_settings
 import logging
+import math
+import queue
+import threading
+import time
 
+settings = get_settings()
 logger = logging.getLogger(__name__)
 
 
+def iter_batches(scraper, scrape_kwargs: dict) -> Iterator[List[JobCreate]]:
+    """A scraper's jobs as batches; scrapers without iter_jobs give one batch"""
+    if hasattr(scraper, "iter_jobs"):
+        return scraper.iter_jobs(**scrape_kwargs)
+    return iter([scraper.scrape_jobs(**scrape_kwargs)])
+
+
+class SourceIngest:
+    """
+    Write one scraper's streamed batches a chunk at a time
+    Only the current chunk and the newest job (for the checkpoint) are kept,
+    so memory doesn't grow with the number of jobs scraped
+    """
+    
+    def __init__(self, db: Session, scraper, complete: bool):
+        self.db = db
+        self.scraper = scraper
+        self.complete = complete
+        self.chunk_size = max(1, settings.ingest_chunk_size)
+        self.started = time.perf_counter()
+        # Rows written by this scrape get a last_seen_at after this
+        self.ingest_started = datetime.utcnow()
+        self.counts = {"inserted": 0, "updated": 0, "unchanged": 0, "failed": 0}
+        self.scraped = 0
+        self.persist_seconds = 0.0
+        self.newest: Optional[JobCreate] = None
+        self._buffer: List[JobCreate] = []
+    
+    def add(self, jobs: List[JobCreate]):
+        self.scraped += len(jobs)
+        for job in jobs:
+            if job.posted_date is not None and (self.newest is None or job.posted_date > self.newest.posted_date):
+                self.newest = job
+        self._buffer.extend(jobs)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+    
+    def flush(self):
+        if not self._buffer:
+            return
+        persist_started = time.perf_counter()
+        counts = JobService.bulk_create_jobs(self.db, self._buffer, chunk_size=self.chunk_size, publish=False)
+        for key, value in counts.items():
+            self.counts[key] += value
+        self._buffer = []
+        self.persist_seconds += time.perf_counter() - persist_started
+    
+    @property
+    def wrote_changes(self) -> bool:
+        return bool(self.counts["inserted"] or self.counts["updated"])
+
+
 class ScraperService:
-    def __init__(self):
+    def __init__(self, workers: Optional[int] = None, timeout: Optional[float] = None):
         self.scrapers = [
             ExampleJobScraper(),
             # Add more scrapers here:
@@ -15,43 +81,242 @@ class ScraperService:
             # IndeedScraper(),
             # etc.
         ]
+        self.workers = workers if workers is not None else settings.scraper_workers
+        self.timeout = timeout if timeout is not None else settings.scraper_timeout_seconds
+    
+    def run_all_scrapers(
+        self,
+        db: Session,
+        sources: Optional[List[str]] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None
+    ) -> dict:
+        """
+        Run all configured scrapers, or only those named in `sources`
+        `on_progress(done, total)` is called in this thread as each scraper finishes
+        """
+        with profiled("scrape-run", enabled=settings.profile_scrapes, threads=True):
+            return self._run_scrapers(db, sources, on_progress)
     
-    def run_all_scrapers(self, db: Session) -> dict:
-        """Run all configured scrapers"""
+    def _run_scrapers(
+        self,
+        db: Session,
+        sources: Optional[List[str]],
+        on_progress: Optional[Callable[[int, int], None]]
+    ) -> dict:
+        scrapers = [
+            scraper for scraper in self.scrapers
+            if sources is None or scraper.source_name in sources
+        ]
         results = {
             "total_scraped": 0,
             "total_created": 0,
+            "total_updated": 0,
             "scrapers_run": 0,
+            "duration_seconds": 0.0,
             "details": []
         }
+        started = time.perf_counter()
+        cache = get_response_cache()
+        cache_before = cache.stats() if cache is not None else None
         
-        for scraper in self.scrapers:
-            try:
-                logger.info(f"Running scraper: {scraper.source_name}")
-                
-                jobs = scraper.scrape_jobs()
-                created_count = JobService.bulk_create_jobs(db, jobs)
-                
-                results["total_scraped"] += len(jobs)
-                results["total_created"] += created_count
-                results["scrapers_run"] += 1
+        def finished():
+            # Every finished scraper adds exactly one details entry
+            if on_progress is not None:
+                on_progress(len(results["details"]), len(scrapers))
+        
+        if self.workers > 1 and len(scrapers) > 1:
+            self._run_parallel(db, scrapers, results, finished)
+        else:
+            for scraper in scrapers:
+                ingest = None
+                try:
+                    logger.info(f"Running scraper: {scraper.source_name}")
+                    scrape_kwargs = self._scrape_kwargs(db, scraper)
+                    ingest = SourceIngest(db, scraper, complete=not scrape_kwargs)
+                    # Fetching and parsing run ahead of the writes, by at most stream_queue_size batches
+                    for batch in prefetch(iter_batches(scraper, scrape_kwargs), settings.stream_queue_size):
+                        ingest.add(batch)
+                    self._finish(ingest, results)
+                except Exception as e:
+                    self._record_error(scraper, e, results, ingest)
+                finished()
+        
+        results["duration_seconds"] = round(time.perf_counter() - started, 3)
+        if cache is not None:
+            cache_after = cache.stats()
+            results["http_cache"] = {
+                "hits": cache_after["hits"] - cache_before["hits"],
+                "misses": cache_after["misses"] - cache_before["misses"]
+            }
+        return results
+    
+    def _run_parallel(self, db: Session, scrapers: list, results: dict, finished: Callable[[], None]):
+        """
+        Scrape concurrently in worker threads while this thread is the only
+        one writing to `db`, persisting each scraper's batches as they arrive
+        """
+        # Bounded, so workers wait for the writer instead of piling up parsed jobs
+        events = queue.Queue(maxsize=max(1, settings.stream_queue_size) * self.workers)
+        stop = threading.Event()
+        # Read incremental state here so worker threads never touch the session
+        scrape_kwargs = {scraper: self._scrape_kwargs(db, scraper) for scraper in scrapers}
+        ingests = {}
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scraper")
+        for scraper in scrapers:
+            executor.submit(self._scrape_in_worker, scraper, scrape_kwargs[scraper], events, stop)
+        
+        pending = set(scrapers)
+        deadlines = {}
+        # Bounds scrapers still queued behind a worker held by a timed-out scraper
+        cycle_deadline = time.monotonic() + self.timeout * math.ceil(len(scrapers) / self.workers)
+        
+        try:
+            while pending:
+                next_deadline = min([deadlines[s] for s in pending if s in deadlines] + [cycle_deadline])
+                try:
+                    event, scraper, payload = events.get(timeout=max(0.0, next_deadline - time.monotonic()))
+                except queue.Empty:
+                    now = time.monotonic()
+                    for scraper in list(pending):
+                        if deadlines.get(scraper, cycle_deadline) <= now:
+                            pending.discard(scraper)
+                            self._record_error(
+                                scraper, TimeoutError(f"timed out after {self.timeout}s"), results,
+                                ingests.get(scraper)
+                            )
+                            finished()
+                    continue
                 
-                results["details"].append({
-                    "scraper": scraper.source_name,
-                    "scraped": len(jobs),
-                    "created": created_count
-                })
+                if scraper not in pending:
+                    continue  # Already reported as timed out
                 
-                logger.info(
-                    f"Scraper {scraper.source_name}: "
-                    f"scraped {len(jobs)}, created {created_count}"
-                )
+                if event == "started":
+                    deadlines[scraper] = payload + self.timeout
+                    ingests[scraper] = SourceIngest(db, scraper, complete=not scrape_kwargs[scraper])
+                    continue
                 
-            except Exception as e:
-                logger.error(f"Error running scraper {scraper.source_name}: {e}")
-                results["details"].append({
-                    "scraper": scraper.source_name,
-                    "error": str(e)
-                })
+                try:
+                    if event == "jobs":
+                        ingests[scraper].add(payload)
+                        continue
+                    pending.discard(scraper)
+                    if event == "done":
+                        self._finish(ingests[scraper], results)
+                    else:
+                        self._record_error(scraper, payload, results, ingests[scraper])
+                except Exception as e:
+                    pending.discard(scraper)
+                    self._record_error(scraper, e, results, ingests[scraper])
+                finished()
+        finally:
+            # Timed-out scrapers can't be interrupted; stop them at their next batch
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    @staticmethod
+    def _scrape_kwargs(db: Session, scraper) -> dict:
+        """
+        Known URLs and checkpoint for scrapers that can stop at already-seen listings
+        Empty when the scraper should fetch every page, which it also does once
+        per full_scrape_interval_hours so taken-down listings are noticed
+        """
+        if not settings.incremental_scraping or not getattr(scraper, "supports_incremental", False):
+            return {}
         
-        return results
+        checkpoint = CheckpointService.get_checkpoint(db, scraper.source_name)
+        full_scrape_due = datetime.utcnow() - timedelta(hours=settings.full_scrape_interval_hours)
+        if checkpoint is None or checkpoint.last_full_run_at is None or checkpoint.last_full_run_at < full_scrape_due:
+            return {}
+        return {
+            "known_urls": JobService.get_known_urls(db, scraper.source_name),
+            "since": checkpoint.last_posted_date
+        }
+    
+    @staticmethod
+    def _scrape_in_worker(scraper, scrape_kwargs: dict, events: queue.Queue, stop: threading.Event):
+        """Fetch and parse in a worker thread, handing batches to the writer"""
+        if stop.is_set():
+            return
+        logger.info(f"Running scraper: {scraper.source_name}")
+        if not put_until(events, ("started", scraper, time.monotonic()), stop):
+            return
+        try:
+            for batch in iter_batches(scraper, scrape_kwargs):
+                if not put_until(events, ("jobs", scraper, batch), stop):
+                    return
+            put_until(events, ("done", scraper, None), stop)
+        except Exception as e:
+            put_until(events, ("error", scraper, e), stop)
+    
+    @staticmethod
+    def _finish(ingest: SourceIngest, results: dict):
+        """
+        Write a scraper's last chunk and record its counts and timings
+        After a complete scrape, the source's jobs it didn't return are deactivated;
+        a listing page that failed to fetch makes the scrape incomplete
+        """
+        db, scraper = ingest.db, ingest.scraper
+        ingest.flush()
+        persist_started = time.perf_counter()
+        counts = ingest.counts
+        failed_pages = list(getattr(scraper, "failed_pages", []))
+        complete = ingest.complete and not failed_pages
+        # Records the scraper dropped as invalid failed just like rows the database rejected
+        failed = counts["failed"] + getattr(scraper, "invalid_records", 0)
+        
+        deactivated = 0
+        # An empty or partly failed scrape is more likely a broken scraper than an empty board
+        if complete and ingest.scraped and not failed:
+            deactivated = JobService.deactivate_unseen(
+                db, scraper.source_name, ingest.ingest_started, publish=False
+            )
+        if ingest.wrote_changes or deactivated:
+            JobService.publish_changes(db)
+        
+        if getattr(scraper, "supports_incremental", False):
+            newest = [ingest.newest] if ingest.newest is not None else []
+            CheckpointService.update_checkpoint(db, scraper.source_name, newest, complete=complete)
+        persist_seconds = ingest.persist_seconds + time.perf_counter() - persist_started
+        
+        # Scraping and writing overlap, so the duration is wall time since the scraper started
+        duration = time.perf_counter() - ingest.started
+        scraped = ingest.scraped
+        
+        results["total_scraped"] += scraped
+        results["total_created"] += counts["inserted"]
+        results["total_updated"] += counts["updated"]
+        results["scrapers_run"] += 1
+        
+        results["details"].append({
+            "scraper": scraper.source_name,
+            "scraped": scraped,
+            "created": counts["inserted"],
+            "updated": counts["updated"],
+            "unchanged": counts["unchanged"],
+            "deactivated": deactivated,
+            "failed": failed,
+            "failed_pages": failed_pages,
+            "duration_seconds": round(duration, 3),
+            "persist_seconds": round(persist_seconds, 3),
+            "jobs_per_second": round(scraped / duration, 1) if duration > 0 else None
+        })
+        
+        logger.info(
+            f"Scraper {scraper.source_name}: "
+            f"scraped {scraped}, created {counts['inserted']}, "
+            f"updated {counts['updated']}, deactivated {deactivated} in {duration:.2f}s"
+        )
+    
+    @staticmethod
+    def _record_error(scraper, error: Exception, results: dict, ingest: Optional[SourceIngest] = None):
+        logger.error(f"Error running scraper {scraper.source_name}: {error}")
+        if ingest is not None and ingest.wrote_changes:
+            # Chunks written before the failure are kept
+            try:
+                JobService.publish_changes(ingest.db)
+            except Exception as e:
+                logger.error(f"Error publishing partial ingest of {scraper.source_name}: {e}")
+        results["details"].append({
+            "scraper": scraper.source_name,
+            "error": str(error)
+        })
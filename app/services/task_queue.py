@@ -0,0 +1,99 @@
+from functools import lru_cache
+from typing import Dict, Optional
+import json
+import queue
+import threading
+import time
+import uuid
+import redis
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Deletes a lock only if this process still owns it
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class RedisTaskQueue:
+    """Scrape task queue and distributed locks shared by all processes through redis"""
+    
+    def __init__(self, redis_url: str, name: str = "scrape:tasks"):
+        self.client = redis.Redis.from_url(redis_url)
+        self.name = name
+        self._tokens: Dict[str, str] = {}
+        self._release_lock = self.client.register_script(RELEASE_LOCK_SCRIPT)
+    
+    def enqueue(self, task: dict):
+        self.client.lpush(self.name, json.dumps(task))
+    
+    def dequeue(self, timeout: float = 5) -> Optional[dict]:
+        """Block up to `timeout` seconds for the next task (0 doesn't block)"""
+        if timeout <= 0:
+            item = self.client.rpop(self.name)
+            return json.loads(item) if item else None
+        
+        item = self.client.brpop(self.name, timeout=max(1, int(timeout)))
+        return json.loads(item[1]) if item else None
+    
+    def acquire_lock(self, name: str, ttl: float) -> bool:
+        token = uuid.uuid4().hex
+        if self.client.set(f"lock:{name}", token, nx=True, px=int(ttl * 1000)):
+            self._tokens[name] = token
+            return True
+        return False
+    
+    def release_lock(self, name: str):
+        token = self._tokens.pop(name, None)
+        if token is not None:
+            self._release_lock(keys=[f"lock:{name}"], args=[token])
+
+
+class InMemoryTaskQueue:
+    """Single-process stand-in for RedisTaskQueue, for tests and local runs"""
+    
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._locks: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def enqueue(self, task: dict):
+        self._queue.put(task)
+    
+    def dequeue(self, timeout: float = 5) -> Optional[dict]:
+        try:
+            return self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+        except queue.Empty:
+            return None
+    
+    def acquire_lock(self, name: str, ttl: float) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if self._locks.get(name, 0) > now:
+                return False
+            self._locks[name] = now + ttl
+            return True
+    
+    def release_lock(self, name: str):
+        with self._lock:
+            self._locks.pop(name, None)
+
+
+@lru_cache()
+def get_task_queue():
+    """Process-wide task queue for the configured backend"""
+    if settings.task_queue_backend == "memory":
+        return InMemoryTaskQueue()
+    return RedisTaskQueue(settings.redis_url)
+
+
+def enqueue_scrape_tasks(sources, task_queue=None, force: bool = False) -> int:
+    """Queue one scrape task per source; forced tasks run even if the source ran this interval"""
+    task_queue = task_queue or get_task_queue()
+    for source in sources:
+        task_queue.enqueue({"type": "scrape", "source": source, "enqueued_at": time.time(), "force": force})
+    return len(sources)
@@ -0,0 +1,101 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, insert
+from typing import Dict, List, Optional
+from app.models.job import Job
+from app.models.technology import Technology, job_technologies
+from app.db.database import UPSERT_INSERTS
+from app.utils.scraper_helpers import clean_text
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def slugify(name: str) -> str:
+    """Lookup key of a technology name"""
+    return ' '.join(name.lower().split())
+
+
+def parse_technologies(raw: Optional[str]) -> List[str]:
+    """Split a comma-separated technologies string into unique names"""
+    names = {}
+    for part in (raw or '').split(','):
+        name = clean_text(part)
+        if name:
+            names.setdefault(slugify(name), name)
+    return list(names.values())
+
+
+class TechnologyService:
+    @staticmethod
+    def get_or_create_ids(db: Session, names: List[str]) -> Dict[str, int]:
+        """Map technology slugs to ids, inserting unknown technologies"""
+        wanted = {}
+        for name in names:
+            wanted.setdefault(slugify(name), name)
+        if not wanted:
+            return {}
+        
+        ids = dict(
+            db.query(Technology.slug, Technology.id).filter(Technology.slug.in_(wanted))
+        )
+        missing = [{"slug": slug, "name": name} for slug, name in wanted.items() if slug not in ids]
+        
+        if missing:
+            upsert = UPSERT_INSERTS.get(db.get_bind().dialect.name)
+            if upsert is not None:
+                # Another ingest may have added the same technology meanwhile
+                db.execute(upsert(Technology).on_conflict_do_nothing(index_elements=[Technology.slug]), missing)
+            else:
+                db.execute(insert(Technology), missing)
+            ids.update(db.query(Technology.slug, Technology.id).filter(
+                Technology.slug.in_([row["slug"] for row in missing])
+            ))
+        
+        return ids
+    
+    @staticmethod
+    def link_jobs(db: Session, job_technologies_by_id: Dict[int, Optional[str]]):
+        """Replace the technology links of jobs from their technologies strings (no commit)"""
+        if not job_technologies_by_id:
+            return
+        
+        parsed = {
+            job_id: parse_technologies(raw)
+            for job_id, raw in job_technologies_by_id.items()
+        }
+        ids = TechnologyService.get_or_create_ids(
+            db, [name for names in parsed.values() for name in names]
+        )
+        
+        db.execute(delete(job_technologies).where(
+            job_technologies.c.job_id.in_(list(parsed))
+        ))
+        links = [
+            {"job_id": job_id, "technology_id": ids[slugify(name)]}
+            for job_id, names in parsed.items()
+            for name in names
+        ]
+        if links:
+            db.execute(insert(job_technologies), links)
+    
+    @staticmethod
+    def backfill(db: Session, batch_size: int = 1000) -> int:
+        """Link technologies for all existing jobs, one committed batch at a time"""
+        last_id = 0
+        processed = 0
+        
+        while True:
+            batch = db.query(Job.id, Job.technologies).filter(
+                Job.id > last_id
+            ).order_by(Job.id).limit(batch_size).all()
+            if not batch:
+                break
+            
+            TechnologyService.link_jobs(db, dict(batch))
+            db.commit()
+            
+            last_id = batch[-1].id
+            processed += len(batch)
+            logger.info(f"Backfilled technologies for {processed} jobs (up to id {last_id})")
+        
+        return processed
@@ -0,0 +1,210 @@
+import asyncio
+import httpx
+from functools import lru_cache
+from typing import Dict, List, Optional, Union
+from urllib.parse import urlsplit
+import logging
+import threading
+import time
+from app.core.config import get_settings
+from app.core.metrics import record_fetch
+from app.utils.headers import DEFAULT_HEADERS, HeaderPool, get_header_pool
+from app.utils.rate_limiter import RateLimiter, THROTTLE_STATUSES, get_rate_limiter
+from app.utils.response_cache import ResponseCache, conditional_headers, get_response_cache
+from app.utils.scraper_helpers import NOT_MODIFIED
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Client errors worth retrying; other 4xx responses fail immediately
+RETRYABLE_CLIENT_ERRORS = {408, 429}
+
+
+class AsyncFetcher:
+    """
+    Concurrent page fetcher over one pooled httpx.AsyncClient
+    Keep-alive connections are reused across requests, at most
+    `max_connections` requests are in flight overall and `per_host_limit`
+    per host, and each host's request rate is paced by the rate limiter.
+    Every request to a host carries that host's header profile.
+    Cache, rate limiter and header pool default to the process-wide ones,
+    looked up on use so a long-lived fetcher follows their reconfiguration
+    """
+    
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        per_host_limit: Optional[int] = None,
+        retries: Optional[int] = None,
+        backoff_base: float = 1.0,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        header_pool: Optional[HeaderPool] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        if max_connections is None:
+            max_connections = settings.fetch_max_connections
+        if per_host_limit is None:
+            per_host_limit = settings.fetch_per_host_limit
+        if retries is None:
+            retries = settings.max_retries
+        
+        self.per_host_limit = per_host_limit
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self._cache = cache
+        self._rate_limiter = rate_limiter
+        self._header_pool = header_pool
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            timeout=settings.request_timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ),
+            follow_redirects=True,
+            transport=transport
+        )
+    
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        return self._cache if self._cache is not None else get_response_cache()
+    
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        return self._rate_limiter if self._rate_limiter is not None else get_rate_limiter()
+    
+    @property
+    def header_pool(self) -> HeaderPool:
+        return self._header_pool if self._header_pool is not None else get_header_pool()
+    
+    async def __aenter__(self) -> "AsyncFetcher":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    async def aclose(self):
+        await self._client.aclose()
+    
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_semaphores[host]
+    
+    async def fetch(self, url: str, skip_unchanged: bool = False) -> Union[bytes, object, None]:
+        """
+        Fetch raw page content with non-blocking retries
+        Cached pages are revalidated; on 304 the cached body is returned,
+        or NOT_MODIFIED when `skip_unchanged` lets the caller skip parsing
+        """
+        host = urlsplit(url).netloc
+        semaphore = self._host_semaphore(host)
+        cache, rate_limiter = self.cache, self.rate_limiter
+        cached = await cache.get_async(url) if cache is not None else None
+        headers = self.header_pool.for_host(host)
+        if cached is not None:
+            headers = {**headers, **conditional_headers(cached)}
+        
+        for attempt in range(self.retries):
+            throttled = False
+            try:
+                if rate_limiter is not None:
+                    delay = await rate_limiter.reserve_async(host)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                
+                # Only hold the host slot while the request is in flight, not during backoff
+                async with semaphore:
+                    sent = time.perf_counter()
+                    try:
+                        response = await self._client.get(url, headers=headers)
+                    except httpx.HTTPError:
+                        record_fetch(host, time.perf_counter() - sent, None)
+                        raise
+                record_fetch(host, time.perf_counter() - sent, response.status_code, response.num_bytes_downloaded)
+                
+                throttled = response.status_code in THROTTLE_STATUSES
+                if rate_limiter is not None:
+                    await rate_limiter.record_async(host, response.status_code, response.headers.get('Retry-After'))
+                
+                if response.status_code == 304 and cached is not None:
+                    cache.record_hit()
+                    return NOT_MODIFIED if skip_unchanged else cached.body
+                
+                response.raise_for_status()
+                if cache is not None:
+                    cache.record_miss()
+                    await cache.put_async(url, response.headers, response.content)
+                return response.content
+            
+            except httpx.HTTPError as e:
+                logger.warning(f"Attempt {attempt + 1}/{self.retries} failed for {url}: {e}")
+                
+                if (
+                    isinstance(e, httpx.HTTPStatusError)
+                    and e.response.status_code < 500
+                    and e.response.status_code not in RETRYABLE_CLIENT_ERRORS
+                ):
+                    return None
+                
+                if attempt < self.retries - 1:
+                    # The rate limiter already holds back a throttled host
+                    if not (throttled and rate_limiter is not None):
+                        await asyncio.sleep(self.backoff_base * 2 ** attempt)  # Exponential backoff
+                else:
+                    logger.error(f"Failed to fetch {url} after {self.retries} attempts")
+        
+        return None
+    
+    async def fetch_many(self, urls: List[str], skip_unchanged: bool = False) -> List[Union[bytes, object, None]]:
+        """Fetch all URLs concurrently, results in input order"""
+        return await asyncio.gather(*(self.fetch(url, skip_unchanged) for url in urls))
+
+
+class FetchLoop:
+    """
+    One AsyncFetcher on an event loop in a daemon thread
+    Synchronous callers on any thread share its keep-alive connections and
+    its max_connections and per-host limits, for the life of the process
+    """
+    
+    def __init__(self, **fetcher_options):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="fetch-loop", daemon=True)
+        self._thread.start()
+        self.fetcher = self.run(self._open(fetcher_options))
+    
+    @staticmethod
+    async def _open(fetcher_options: dict) -> AsyncFetcher:
+        return AsyncFetcher(**fetcher_options)
+    
+    def run(self, coroutine):
+        """Run a coroutine on the loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+    
+    def close(self):
+        self.run(self.fetcher.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+@lru_cache()
+def get_fetch_loop() -> FetchLoop:
+    """Process-wide fetch loop, started on the first fetch"""
+    return FetchLoop()
+
+
+def close_fetch_loop():
+    """Close the process-wide fetcher's connections, if it was started"""
+    if get_fetch_loop.cache_info().currsize:
+        get_fetch_loop().close()
+        get_fetch_loop.cache_clear()
+
+
+def fetch_pages(urls: List[str], skip_unchanged: bool = False) -> List[Union[bytes, object, None]]:
+    """Fetch many pages concurrently from synchronous code, over the shared fetcher"""
+    fetch_loop = get_fetch_loop()
+    return fetch_loop.run(fetch_loop.fetcher.fetch_many(urls, skip_unchanged))
@@ -0,0 +1,107 @@
+"""
+Request header profiles from a bundled user-agent list
+
+Each profile is a complete, browser-consistent header set built once per
+process, with no downloads at runtime. A host keeps the profile it was first
+given for the life of the process, so keep-alive connections and
+per-session fingerprints stay valid.
+"""
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+import random
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Current desktop browsers; the first is used when USER_AGENT_ROTATE is off
+USER_AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36 Edg/124.0.0.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36 Edg/123.0.0.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:125.0) Gecko/20100101 Firefox/125.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:124.0) Gecko/20100101 Firefox/124.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:125.0) Gecko/20100101 Firefox/125.0",
+    "Mozilla/5.0 (X11; Linux x86_64; rv:125.0) Gecko/20100101 Firefox/125.0",
+    "Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:124.0) Gecko/20100101 Firefox/124.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.4.1 Safari/605.1.15",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.3.1 Safari/605.1.15",
+)
+
+# Shared by every profile; Accept-Encoding stays within what requests and httpx decode
+DEFAULT_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+}
+
+# What each browser family sends alongside its user agent
+_FAMILY_HEADERS = {
+    "chrome": {
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,'
+                  'image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+        'Accept-Language': 'en-US,en;q=0.9',
+    },
+    "firefox": {
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5',
+    },
+    "safari": {
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.9',
+    },
+}
+
+Profile = Mapping[str, str]
+
+
+def _family(user_agent: str) -> str:
+    if "Firefox/" in user_agent:
+        return "firefox"
+    if "Chrome/" in user_agent:
+        return "chrome"
+    return "safari"
+
+
+@lru_cache()
+def header_profiles() -> Tuple[Profile, ...]:
+    """One read-only header set per bundled user agent"""
+    return tuple(
+        MappingProxyType({**DEFAULT_HEADERS, **_FAMILY_HEADERS[_family(ua)], 'User-Agent': ua})
+        for ua in USER_AGENTS
+    )
+
+
+class HeaderPool:
+    """Sticky header profile per host, drawn from the precomputed profiles"""
+    
+    def __init__(self, rotate: Optional[bool] = None):
+        self.profiles = header_profiles()
+        self.rotate = settings.user_agent_rotate if rotate is None else rotate
+        self._hosts: Dict[str, Profile] = {}
+    
+    def for_host(self, host: str) -> Profile:
+        """The host's profile, assigned on first use; a dict lookup afterwards"""
+        profile = self._hosts.get(host)
+        if profile is None:
+            choice = random.choice(self.profiles) if self.rotate else self.profiles[0]
+            # setdefault keeps whichever thread assigned first
+            profile = self._hosts.setdefault(host, choice)
+        return profile
+    
+    def reset(self, host: Optional[str] = None):
+        """Start a new session for one host, or all of them, with a fresh profile"""
+        if host is None:
+            self._hosts.clear()
+        else:
+            self._hosts.pop(host, None)
+
+
+@lru_cache()
+def get_header_pool() -> HeaderPool:
+    """Process-wide pool shared by the sync and async fetchers"""
+    return HeaderPool()
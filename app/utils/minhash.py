@@ -0,0 +1,76 @@
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Optional, Set, Tuple
+import hashlib
+import re
+
+if TYPE_CHECKING:
+    import numpy as np
+
+NUM_PERM = 64
+# 8 bands of 8 rows: pairs above ~0.77 Jaccard similarity usually share a band
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """Word n-grams of lowercased, punctuation-free text"""
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def job_shingles(title: str, company: str, location: Optional[str], description: Optional[str]) -> Set[str]:
+    """Shingles over the fields that identify a posting across boards"""
+    return shingles(" ".join(field for field in (title, company, location, description) if field))
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+@lru_cache()
+def _permutations() -> Tuple["np.ndarray", "np.ndarray"]:
+    """Hash permutation coefficients; numpy is only imported once signatures are needed"""
+    import numpy as np
+    # Fixed seed: signatures and bucket keys are stored, so they must not change between processes
+    rng = np.random.RandomState(1)
+    return (
+        rng.randint(1, 1 << 32, size=NUM_PERM, dtype=np.uint64),
+        rng.randint(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+    )
+
+
+def signature(tokens: Set[str]) -> "np.ndarray":
+    """MinHash signature: the minimum of each permuted hash over all shingles"""
+    import numpy as np
+    if not tokens:
+        return np.full(NUM_PERM, _MAX_HASH, dtype=np.uint64)
+    perm_a, perm_b = _permutations()
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(token.encode(), digest_size=4).digest(), "little") for token in tokens),
+        dtype=np.uint64,
+        count=len(tokens)
+    )
+    permuted = np.bitwise_and((np.outer(hashes, perm_a) + perm_b) % np.uint64(_MERSENNE_PRIME), np.uint64(_MAX_HASH))
+    return permuted.min(axis=0)
+
+
+def band_keys(sig: "np.ndarray") -> List[int]:
+    """One signed 64-bit bucket key per band, so keys fit a BIGINT column"""
+    return [
+        int.from_bytes(
+            hashlib.blake2b(bytes([band]) + sig[band * ROWS:(band + 1) * ROWS].tobytes(), digest_size=8).digest(),
+            "little",
+            signed=True
+        )
+        for band in range(BANDS)
+    ]
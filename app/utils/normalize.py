@@ -0,0 +1,237 @@
+"""
+Batch normalization of raw scraped records
+
+Scrapers hand over records with free-text fields (`salary`, `job_type`,
+`experience_level`); this stage extracts structured values for a whole
+batch at once with precompiled patterns and vectorized pandas string ops.
+pandas is imported on the first batch, so importing parse_salary stays cheap.
+"""
+from typing import TYPE_CHECKING, List, Optional, Tuple
+import logging
+import re
+from pydantic import ValidationError
+from app.schemas.job import JobCreate
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+JOB_FIELDS = set(JobCreate.model_fields)
+
+_CURRENCY_CODES = r"USD|EUR|GBP|CHF|CAD|AUD"
+_PERIOD_UNITS = r"(?:\bper\s+|/\s*|\ban?\s+)(?P<unit>hour|hr|day|week|wk|month|mo|year|yr|annum)\b"
+_PERIOD_ADVERBS = r"\b(?P<adverb>hourly|daily|weekly|monthly|yearly|annually|annual)\b"
+
+# "$80,000 - $100,000", "60.000–80.000 €", "80-100k", "€45k to 55k", "30/hour"
+# A lone number is only a salary next to a currency or period, so "30 days holiday" isn't one
+SALARY_RE = re.compile(
+    r"(?:(?P<currency>[$€£]|\b(?:" + _CURRENCY_CODES + r"))\s*)?"
+    r"(?P<min>\d[\d.,]*)\s*(?P<kmin>k\b)?"
+    r"(?:\s*(?:-|–|—|to)\s*[$€£]?\s*(?P<max>\d[\d.,]*)\s*(?P<kmax>k\b)?)?"
+    r"(?(currency)|(?(kmin)|(?(max)|(?=\s*(?:[$€£]|(?:" + _CURRENCY_CODES + r")\b|"
+    + _PERIOD_UNITS.replace("?P<unit>", "?:") + "|" + _PERIOD_ADVERBS.replace("?P<adverb>", "?:") + r")))))",
+    re.IGNORECASE
+)
+# Thousands separators in either style, but not decimals ("45.50")
+THOUSANDS_RE = re.compile(r"[.,](?=\d{3}(?:\D|$))")
+CURRENCY_CODE_RE = re.compile(r"\b(" + _CURRENCY_CODES + r")\b", re.IGNORECASE)
+CURRENCY_SYMBOL_RE = re.compile(r"([$€£])")
+CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP"}
+PERIOD_RE = re.compile(_PERIOD_UNITS + "|" + _PERIOD_ADVERBS, re.IGNORECASE)
+PERIODS = {
+    "hour": "hour", "hr": "hour", "hourly": "hour",
+    "day": "day", "daily": "day",
+    "week": "week", "wk": "week", "weekly": "week",
+    "month": "month", "mo": "month", "monthly": "month",
+    "year": "year", "yr": "year", "annum": "year", "yearly": "year", "annually": "year", "annual": "year",
+}
+
+# Group names are the normalized values; the first group to match wins
+JOB_TYPE_RE = re.compile(
+    r"\b(?P<hybrid>hybrid)\b"
+    r"|\b(?P<remote>remote|work from home|wfh)\b"
+    r"|\b(?P<onsite>on[- ]?site|in[- ]office|office[- ]based)\b",
+    re.IGNORECASE
+)
+EXPERIENCE_RE = re.compile(
+    r"\b(?P<junior>junior|jr\b\.?|entry[- ]level|graduate|intern(?:ship)?|trainee)\b"
+    r"|\b(?P<senior>senior|sr\b\.?|lead|principal|staff)\b"
+    r"|\b(?P<mid>mid[- ]?level|mid(?![- ](?:sized?|market|term))|intermediate)\b",
+    re.IGNORECASE
+)
+YEARS_RE = re.compile(r"\b(\d{1,2})\+?\s*(?:-\s*\d{1,2}\s*)?years?\b", re.IGNORECASE)
+
+TECHNOLOGIES = [
+    "Python", "Java", "JavaScript", "TypeScript", "Golang", "Rust", "Ruby", "PHP", "C#", "C++",
+    "Kotlin", "Swift", "Scala", "SQL", "PostgreSQL", "MySQL", "MongoDB", "Redis", "Elasticsearch",
+    "Kafka", "Spark", "Airflow", "Django", "Flask", "FastAPI", "React", "Angular", "Vue",
+    "Node.js", "Docker", "Kubernetes", "Terraform", "AWS", "GCP", "Azure", "Linux", "Pandas",
+]
+TECHNOLOGY_NAMES = {name.lower(): name for name in TECHNOLOGIES}
+TECHNOLOGY_NAMES["nodejs"] = "Node.js"
+# Longest first so "JavaScript" isn't read as "Java"; lookarounds instead of \b for C++/C#
+TECHNOLOGY_RE = re.compile(
+    r"(?<![\w+#.])("
+    + "|".join(re.escape(name) for name in sorted(TECHNOLOGY_NAMES, key=len, reverse=True))
+    + r")(?![\w+#])",
+    re.IGNORECASE
+)
+
+
+def _amount(number: Optional[str], thousands: bool) -> Optional[float]:
+    if not number:
+        return None
+    try:
+        value = float(THOUSANDS_RE.sub("", number.rstrip(".,")).replace(",", "."))
+    except ValueError:
+        return None
+    return value * 1000 if thousands else value
+
+
+def parse_salary(text: Optional[str]) -> Tuple[Optional[float], Optional[float], Optional[str], Optional[str]]:
+    """(min, max, currency, period) from one salary text; normalize_records does this for batches"""
+    match = SALARY_RE.search(text or "")
+    if not match:
+        return None, None, None, None
+    
+    low, high = _amount(match["min"], False), _amount(match["max"], bool(match["kmax"]))
+    # The k of "80-100k" also applies to a lower bound written without one
+    if match["kmin"] or (match["kmax"] and low is not None and low < 1000):
+        low = _amount(match["min"], True)
+    
+    code = CURRENCY_CODE_RE.search(text)
+    symbol = CURRENCY_SYMBOL_RE.search(text)
+    currency = code[1].upper() if code else CURRENCY_SYMBOLS[symbol[1]] if symbol else None
+    period = PERIOD_RE.search(text)
+    period = PERIODS[(period["unit"] or period["adverb"]).lower()] if period else None
+    
+    return low, high if high is not None else low, currency, period
+
+
+def _first_group(text: "pd.Series", pattern: re.Pattern) -> "pd.Series":
+    """Name of the first named group matching each row, or NaN"""
+    groups = text.str.extract(pattern)
+    matched = groups.notna()
+    return matched.idxmax(axis=1).where(matched.any(axis=1))
+
+
+def _classify(pattern: re.Pattern, *texts: "pd.Series") -> "pd.Series":
+    """_first_group over each text in turn, only searching rows still unclassified"""
+    import pandas as pd
+    result = pd.Series(None, index=texts[0].index, dtype=object)
+    for text in texts:
+        missing = result.isna()
+        if not missing.any():
+            break
+        result[missing] = _first_group(text[missing], pattern)
+    return result
+
+
+def _amounts(numbers: "pd.Series", thousands: "pd.Series") -> "pd.Series":
+    import pandas as pd
+    cleaned = numbers.str.rstrip(".,").str.replace(THOUSANDS_RE, "", regex=True).str.replace(",", ".", regex=False)
+    values = pd.to_numeric(cleaned, errors="coerce")
+    return values.where(~thousands, values * 1000)
+
+
+def _coalesce(first: "pd.Series", *rest: "pd.Series") -> "pd.Series":
+    """First non-null value of each row across the series"""
+    result = first.astype(object)
+    for series in rest:
+        result = result.where(result.notna(), series)
+    return result
+
+
+def _text(frame: "pd.DataFrame", *columns: str) -> "pd.Series":
+    text = frame[columns[0]].fillna("").astype(str)
+    for column in columns[1:]:
+        text = text + " " + frame[column].fillna("").astype(str)
+    return text
+
+
+def normalize_records(records: List[dict]) -> List[dict]:
+    """
+    Extract structured fields for a batch of raw records
+    Returns dicts of JobCreate fields; values a scraper already set are kept
+    """
+    if not records:
+        return []
+    
+    import numpy as np
+    import pandas as pd
+    
+    raw = pd.DataFrame.from_records(records).reindex(columns=[
+        "title", "location", "description", "salary", "salary_min", "salary_max",
+        "salary_currency", "salary_period", "job_type", "experience_level", "technologies"
+    ])
+    out = pd.DataFrame(index=raw.index)
+    
+    # Salary range, currency and period
+    salary = raw["salary"].fillna("").astype(str)
+    parts = salary.str.extract(SALARY_RE)
+    k_max = parts["kmax"].notna()
+    high = _amounts(parts["max"], k_max)
+    low = _amounts(parts["min"], parts["kmin"].notna())
+    # The k of "80-100k" also applies to a lower bound written without one
+    low = low.where(~(parts["kmin"].isna() & k_max & (low < 1000)), low * 1000)
+    out["salary_min"] = _coalesce(pd.to_numeric(raw["salary_min"], errors="coerce"), low)
+    out["salary_max"] = _coalesce(pd.to_numeric(raw["salary_max"], errors="coerce"), high, low)
+    
+    has_salary = parts["min"].notna()
+    currency = _coalesce(
+        salary.str.extract(CURRENCY_CODE_RE)[0].str.upper(),
+        salary.str.extract(CURRENCY_SYMBOL_RE)[0].map(CURRENCY_SYMBOLS)
+    )
+    out["salary_currency"] = _coalesce(raw["salary_currency"], currency.where(has_salary))
+    period = salary.str.extract(PERIOD_RE)
+    period = _coalesce(period["unit"], period["adverb"]).str.lower().map(PERIODS)
+    out["salary_period"] = _coalesce(raw["salary_period"], period.where(has_salary))
+    
+    # Job type: the board's own label, then title and location, then the description
+    description = raw["description"].fillna("").astype(str)
+    out["job_type"] = _classify(
+        JOB_TYPE_RE,
+        raw["job_type"].fillna("").astype(str),
+        _text(raw, "title", "location"),
+        description
+    )
+    
+    # Experience: label or title keywords, then description keywords, then "N+ years"
+    experience = _classify(EXPERIENCE_RE, _text(raw, "experience_level", "title"), description)
+    missing = experience.isna()
+    if missing.any():
+        years = pd.to_numeric(description[missing].str.extract(YEARS_RE)[0], errors="coerce")
+        experience[missing] = np.select(
+            [years >= 5, years >= 2, years >= 0], ["senior", "mid", "junior"], default=None
+        )
+    out["experience_level"] = experience
+    
+    # Technologies: the board's tags, otherwise known names mentioned in title or description
+    technologies = raw["technologies"].astype(object)
+    missing = technologies.isna()
+    if missing.any():
+        technologies[missing] = _text(raw[missing], "title", "description").str.findall(TECHNOLOGY_RE).map(
+            lambda names: ", ".join(dict.fromkeys(TECHNOLOGY_NAMES[name.lower()] for name in names)) or None
+        )
+    out["technologies"] = technologies
+    
+    out = out.astype(object).where(out.notna(), None)
+    return [
+        {**{key: value for key, value in record.items() if key in JOB_FIELDS}, **row}
+        for record, row in zip(records, out.to_dict("records"))
+    ]
+
+
+def validate_job(record: dict) -> Optional[JobCreate]:
+    """One normalized record as a JobCreate, or None (logged) if it doesn't validate"""
+    try:
+        return JobCreate(**record)
+    except ValidationError as e:
+        logger.warning(f"Skipping invalid job record {record.get('url')}: {e.error_count()} errors")
+        return None
+
+
+def normalize_jobs(records: List[dict]) -> List[JobCreate]:
+    """Normalize a batch of raw records into JobCreate objects, skipping invalid ones"""
+    return [job for job in map(validate_job, normalize_records(records)) if job is not None]
@@ -0,0 +1,79 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import Callable, List, Optional, Tuple
+import multiprocessing
+import threading
+import time
+from app.core.config import get_settings
+from app.core.metrics import PARSE_SECONDS
+
+settings = get_settings()
+
+# Page bytes to raw job records, which the caller normalizes (see normalize_jobs)
+PageParser = Callable[[bytes], List[dict]]
+
+# Workers aren't forked from the running app, whose fetch loop thread and
+# database connections they must not inherit
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def _timed_parse(parser: PageParser, page: bytes) -> Tuple[float, List[dict]]:
+    """Parse one page and time it where it ran, so pool workers can report parse time"""
+    start = time.perf_counter()
+    jobs = parser(page)
+    return time.perf_counter() - start, jobs
+
+
+class ParsePool:
+    """
+    Parse raw page bytes in worker processes
+    BeautifulSoup work holds the GIL, so only processes scale it past one core.
+    Workers receive raw bytes and send back only the raw record dicts, which
+    are cheaper to pickle than models; the caller normalizes them in one batch
+    """
+    
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers if workers is not None else settings.parse_workers
+        self._executor = None
+        # Scraper threads share the pool; only one of them may start the workers
+        self._executor_lock = threading.Lock()
+    
+    def parse(self, parser: PageParser, pages: List[bytes]) -> List[dict]:
+        """Raw records from running `parser` (a picklable top-level function or partial) over every page"""
+        return [record for page_records in self.parse_each(parser, pages) for record in page_records]
+    
+    def parse_each(self, parser: PageParser, pages: List[bytes]) -> List[List[dict]]:
+        """Like parse, but keeps each page's records apart, in page order"""
+        timed_parser = partial(_timed_parse, parser)
+        if self.workers <= 1 or len(pages) <= 1:
+            parsed = map(timed_parser, pages)
+        else:
+            chunksize = max(1, len(pages) // (self.workers * 4))
+            parsed = self._get_executor().map(timed_parser, pages, chunksize=chunksize)
+        
+        records = []
+        for seconds, page_records in parsed:
+            PARSE_SECONDS.observe(seconds)
+            records.append(page_records)
+        return records
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(START_METHOD)
+                )
+            return self._executor
+    
+    def shutdown(self):
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+
+@lru_cache()
+def get_parse_pool() -> ParsePool:
+    """Process-wide parse pool, so worker processes are started once"""
+    return ParsePool()
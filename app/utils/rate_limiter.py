@@ -0,0 +1,254 @@
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+import asyncio
+import logging
+import threading
+import time
+import redis
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Responses telling us to slow down
+THROTTLE_STATUSES = {429, 503}
+# How long idle host state is kept in redis
+STATE_TTL_SECONDS = 3600
+# How long to stay on in-process buckets before trying redis again
+REDIS_RETRY_SECONDS = 30
+
+# Takes a token from the host's bucket, going into debt if it's empty,
+# and returns how long the caller must wait before sending
+RESERVE_SCRIPT = """
+local t = redis.call("TIME")
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call("HMGET", KEYS[1], "tokens", "updated", "rate", "blocked_until")
+local burst = tonumber(ARGV[2])
+local rate = tonumber(state[3]) or tonumber(ARGV[1])
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+local blocked_until = tonumber(state[4]) or 0
+tokens = math.min(burst, tokens + (now - updated) * rate) - 1
+local wait = math.max(blocked_until - now, 0)
+if tokens < 0 then
+    wait = math.max(wait, -tokens / rate)
+end
+redis.call("HSET", KEYS[1], "tokens", tokens, "updated", now, "rate", rate, "blocked_until", blocked_until)
+redis.call("EXPIRE", KEYS[1], ARGV[3])
+return tostring(wait)
+"""
+
+# Halves the host's rate on throttling (honouring Retry-After), otherwise raises it additively
+FEEDBACK_SCRIPT = """
+local t = redis.call("TIME")
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call("HMGET", KEYS[1], "tokens", "rate", "blocked_until")
+local max_rate = tonumber(ARGV[4])
+local rate = tonumber(state[2]) or max_rate
+if ARGV[1] == "1" then
+    rate = math.max(tonumber(ARGV[3]), rate / 2)
+    redis.call("HSET", KEYS[1], "tokens", math.min(tonumber(state[1]) or 0, 0))
+    local retry_after = tonumber(ARGV[2])
+    if retry_after >= 0 then
+        redis.call("HSET", KEYS[1], "blocked_until", math.max(tonumber(state[3]) or 0, now + retry_after))
+    end
+else
+    rate = math.min(max_rate, rate + tonumber(ARGV[5]))
+end
+redis.call("HSET", KEYS[1], "rate", rate)
+redis.call("EXPIRE", KEYS[1], ARGV[6])
+return tostring(rate)
+"""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated", "rate", "blocked_until")
+    
+    def __init__(self, tokens: float, updated: float, rate: float):
+        self.tokens = tokens
+        self.updated = updated
+        self.rate = rate
+        self.blocked_until = 0.0
+
+
+class RateLimiter:
+    """
+    Adaptive token bucket per host
+    Each host starts at `rate` requests/second with `burst` requests of
+    headroom. A 429/503 halves the host's rate and a Retry-After blocks it
+    until then; every other response raises the rate back towards `rate`.
+    """
+    
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        min_rate: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_rate = rate if rate is not None else settings.rate_limit_per_host
+        self.burst = burst if burst is not None else settings.rate_limit_burst
+        self.min_rate = min_rate if min_rate is not None else settings.rate_limit_min_rate
+        self.increase = self.max_rate / 10
+        self.clock = clock
+        self._buckets: Dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+    
+    def _bucket(self, host: str, now: float) -> _Bucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _Bucket(self.burst, now, self.max_rate)
+        return bucket
+    
+    def reserve(self, host: str) -> float:
+        """Claim the next request slot for `host`; returns seconds to wait before sending"""
+        with self._lock:
+            now = self.clock()
+            bucket = self._bucket(host, now)
+            bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * bucket.rate) - 1
+            bucket.updated = now
+            
+            wait = max(bucket.blocked_until - now, 0.0)
+            if bucket.tokens < 0:
+                wait = max(wait, -bucket.tokens / bucket.rate)
+            return wait
+    
+    def record(self, host: str, status_code: int, retry_after: Optional[str] = None):
+        """Adapt the host's rate to a response"""
+        with self._lock:
+            now = self.clock()
+            bucket = self._bucket(host, now)
+            if status_code in THROTTLE_STATUSES:
+                bucket.rate = max(self.min_rate, bucket.rate / 2)
+                bucket.tokens = min(bucket.tokens, 0)
+                delay = parse_retry_after(retry_after)
+                if delay is not None:
+                    bucket.blocked_until = max(bucket.blocked_until, now + delay)
+            else:
+                bucket.rate = min(self.max_rate, bucket.rate + self.increase)
+    
+    async def reserve_async(self, host: str) -> float:
+        """reserve() for the async fetcher; in-process buckets never block"""
+        return self.reserve(host)
+    
+    async def record_async(self, host: str, status_code: int, retry_after: Optional[str] = None):
+        """record() for the async fetcher"""
+        self.record(host, status_code, retry_after)
+    
+    def rate(self, host: str) -> float:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            return bucket.rate if bucket is not None else self.max_rate
+    
+    def wait(self, host: str):
+        """Blocking reserve, for synchronous fetches"""
+        delay = self.reserve(host)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    RateLimiter whose buckets live in redis, so all worker processes
+    share each host's budget; falls back to in-process buckets on errors,
+    for REDIS_RETRY_SECONDS before trying redis again.
+    The redis client is blocking: the async fetcher uses reserve_async()
+    and record_async(), which run it in the loop's executor
+    """
+    
+    def __init__(self, redis_url: str, prefix: str = "ratelimit", **kwargs):
+        super().__init__(**kwargs)
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(redis_url, socket_timeout=0.2, socket_connect_timeout=0.2)
+        self._reserve = self.client.register_script(RESERVE_SCRIPT)
+        self._feedback = self.client.register_script(FEEDBACK_SCRIPT)
+        self._redis_retry_at = 0.0
+    
+    def _key(self, host: str) -> str:
+        return f"{self.prefix}:{host}"
+    
+    @property
+    def redis_available(self) -> bool:
+        return time.monotonic() >= self._redis_retry_at
+    
+    def _redis_failed(self, error: Exception):
+        logger.warning(f"Rate limiter redis error, using in-process buckets: {error}")
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+    
+    def reserve(self, host: str) -> float:
+        if not self.redis_available:
+            return super().reserve(host)
+        try:
+            return float(self._reserve(
+                keys=[self._key(host)],
+                args=[self.max_rate, self.burst, STATE_TTL_SECONDS]
+            ))
+        except redis.RedisError as e:
+            self._redis_failed(e)
+            return super().reserve(host)
+    
+    def record(self, host: str, status_code: int, retry_after: Optional[str] = None):
+        if not self.redis_available:
+            super().record(host, status_code, retry_after)
+            return
+        throttled = status_code in THROTTLE_STATUSES
+        delay = parse_retry_after(retry_after) if throttled else None
+        try:
+            self._feedback(
+                keys=[self._key(host)],
+                args=[
+                    1 if throttled else 0, delay if delay is not None else -1,
+                    self.min_rate, self.max_rate, self.increase, STATE_TTL_SECONDS
+                ]
+            )
+        except redis.RedisError as e:
+            self._redis_failed(e)
+            super().record(host, status_code, retry_after)
+    
+    async def reserve_async(self, host: str) -> float:
+        if not self.redis_available:
+            return super().reserve(host)
+        return await asyncio.get_running_loop().run_in_executor(None, self.reserve, host)
+    
+    async def record_async(self, host: str, status_code: int, retry_after: Optional[str] = None):
+        if not self.redis_available:
+            super().record(host, status_code, retry_after)
+            return
+        await asyncio.get_running_loop().run_in_executor(None, self.record, host, status_code, retry_after)
+    
+    def rate(self, host: str) -> float:
+        if not self.redis_available:
+            return super().rate(host)
+        try:
+            rate = self.client.hget(self._key(host), "rate")
+        except redis.RedisError:
+            return super().rate(host)
+        return float(rate) if rate is not None else self.max_rate
+
+
+@lru_cache()
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """Process-wide rate limiter, or None when disabled"""
+    if not settings.rate_limit_enabled:
+        return None
+    if settings.rate_limit_backend == "redis":
+        return RedisRateLimiter(settings.redis_url)
+    return RateLimiter()
@@ -0,0 +1,200 @@
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Mapping, NamedTuple, Optional
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse(NamedTuple):
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body: bytes
+
+
+def _cache_key(url: str) -> str:
+    return hashlib.sha256(url.encode()).hexdigest()
+
+
+class FileStore:
+    """Persist cached responses as files, one per URL"""
+    
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+    
+    def get(self, url: str) -> Optional[CachedResponse]:
+        path = self.directory / _cache_key(url)
+        try:
+            header, body = path.read_bytes().split(b"\n", 1)
+        except (FileNotFoundError, ValueError):
+            return None
+        validators = json.loads(header)
+        return CachedResponse(validators["etag"], validators["last_modified"], body)
+    
+    def put(self, url: str, response: CachedResponse):
+        header = json.dumps({"etag": response.etag, "last_modified": response.last_modified})
+        path = self.directory / _cache_key(url)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(header.encode() + b"\n" + response.body)
+        tmp_path.replace(path)
+
+
+class RedisStore:
+    """Persist cached responses in redis, shared by every scraper process"""
+    
+    def __init__(self, redis_url: str, prefix: str = "httpcache:", ttl: Optional[int] = None):
+        import redis
+        
+        # A hung redis must not hold up scraping for longer than a cache miss would
+        self.client = redis.Redis.from_url(redis_url, socket_timeout=0.2, socket_connect_timeout=0.2)
+        self.prefix = prefix
+        self.ttl = ttl if ttl is not None else settings.http_cache_ttl_seconds
+    
+    def get(self, url: str) -> Optional[CachedResponse]:
+        entry = self.client.hgetall(self.prefix + _cache_key(url))
+        if not entry:
+            return None
+        return CachedResponse(
+            (entry.get(b"etag") or b"").decode() or None,
+            (entry.get(b"last_modified") or b"").decode() or None,
+            entry[b"body"]
+        )
+    
+    def put(self, url: str, response: CachedResponse):
+        key = self.prefix + _cache_key(url)
+        with self.client.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping={
+                "etag": response.etag or "",
+                "last_modified": response.last_modified or "",
+                "body": response.body
+            })
+            pipe.expire(key, self.ttl)
+            pipe.execute()
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of page bodies and their ETag/Last-Modified validators
+    An optional store keeps entries across runs; memory stays the first lookup.
+    Store reads and writes block, so the async fetcher uses get_async() and
+    put_async(), which run them in the loop's executor
+    """
+    
+    def __init__(self, max_entries: Optional[int] = None, store=None):
+        self.max_entries = max_entries if max_entries is not None else settings.http_cache_max_entries
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, url: str) -> Optional[CachedResponse]:
+        cached = self._recall(url)
+        if cached is None and self.store is not None:
+            cached = self._load(url)
+        return cached
+    
+    async def get_async(self, url: str) -> Optional[CachedResponse]:
+        cached = self._recall(url)
+        if cached is None and self.store is not None:
+            cached = await asyncio.get_running_loop().run_in_executor(None, self._load, url)
+        return cached
+    
+    def put(self, url: str, headers: Mapping[str, str], body: bytes):
+        """Cache a 200 response if it carries validators"""
+        cached = self._cacheable(headers, body)
+        if cached is not None:
+            self._remember(url, cached)
+            if self.store is not None:
+                self._save(url, cached)
+    
+    async def put_async(self, url: str, headers: Mapping[str, str], body: bytes):
+        cached = self._cacheable(headers, body)
+        if cached is not None:
+            self._remember(url, cached)
+            if self.store is not None:
+                await asyncio.get_running_loop().run_in_executor(None, self._save, url, cached)
+    
+    @staticmethod
+    def _cacheable(headers: Mapping[str, str], body: bytes) -> Optional[CachedResponse]:
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return None
+        return CachedResponse(etag, last_modified, body)
+    
+    def _recall(self, url: str) -> Optional[CachedResponse]:
+        with self._lock:
+            cached = self._entries.get(url)
+            if cached is not None:
+                self._entries.move_to_end(url)
+            return cached
+    
+    def _load(self, url: str) -> Optional[CachedResponse]:
+        try:
+            cached = self.store.get(url)
+        except Exception as e:
+            logger.warning(f"Response cache store read failed for {url}: {e}")
+            return None
+        if cached is not None:
+            self._remember(url, cached)
+        return cached
+    
+    def _save(self, url: str, cached: CachedResponse):
+        try:
+            self.store.put(url, cached)
+        except Exception as e:
+            logger.warning(f"Response cache store write failed for {url}: {e}")
+    
+    def _remember(self, url: str, cached: CachedResponse):
+        with self._lock:
+            self._entries[url] = cached
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def record_hit(self):
+        with self._lock:
+            self.hits += 1
+    
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+    
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+def conditional_headers(cached: Optional[CachedResponse]) -> dict:
+    """Request headers that let the server answer 304 Not Modified"""
+    headers = {}
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+    return headers
+
+
+@lru_cache()
+def get_response_cache() -> Optional[ResponseCache]:
+    """Process-wide response cache, or None when disabled"""
+    if not settings.http_cache_enabled:
+        return None
+    
+    store = None
+    if settings.http_cache_store == "file":
+        store = FileStore(settings.http_cache_dir)
+    elif settings.http_cache_store == "redis":
+        store = RedisStore(settings.redis_url)
+    
+    return ResponseCache(store=store)
@@ -1,21 +1,29 @@
 import requests
 from bs4 import BeautifulSoup
-from fake_useragent import UserAgent
 from typing import Optional
+from urllib.parse import urlsplit
+import random
 import time
 import logging
 from app.core.config import get_settings
+from app.core.metrics import record_fetch
+from app.utils.headers import USER_AGENTS, get_header_pool
+from app.utils.normalize import parse_salary
+from app.utils.rate_limiter import THROTTLE_STATUSES, get_rate_limiter
+from app.utils.response_cache import conditional_headers, get_response_cache
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
-ua = UserAgent()
+
+# Returned instead of a page when the server answered 304 and the caller skips unchanged pages
+NOT_MODIFIED = object()
 
 
 def get_random_user_agent() -> str:
-    """Get random user agent"""
+    """Get random user agent from the bundled list"""
     if settings.user_agent_rotate:
-        return ua.random
-    return ua.chrome
+        return random.choice(USER_AGENTS)
+    return USER_AGENTS[0]
 
 
 def fetch_page(url: str, retries: int = None) -> Optional[BeautifulSoup]:
@@ -23,30 +31,54 @@ def fetch_page(url: str, retries: int = None) -> Optional[BeautifulSoup]:
     if retries is None:
         retries = settings.max_retries
     
+    host = urlsplit(url).netloc
+    rate_limiter = get_rate_limiter()
+    cache = get_response_cache()
+    cached = cache.get(url) if cache is not None else None
+    
     headers = {
-        'User-Agent': get_random_user_agent(),
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Accept-Encoding': 'gzip, deflate',
+        **get_header_pool().for_host(host),
         'Connection': 'keep-alive',
+        **conditional_headers(cached),
     }
     
     for attempt in range(retries):
+        throttled = False
         try:
-            response = requests.get(
-                url, 
-                headers=headers, 
-                timeout=settings.request_timeout
-            )
+            if rate_limiter is not None:
+                rate_limiter.wait(host)
+            sent = time.perf_counter()
+            try:
+                response = requests.get(
+                    url, 
+                    headers=headers, 
+                    timeout=settings.request_timeout
+                )
+            except requests.RequestException:
+                record_fetch(host, time.perf_counter() - sent, None)
+                raise
+            record_fetch(host, time.perf_counter() - sent, response.status_code, len(response.content))
+            throttled = response.status_code in THROTTLE_STATUSES
+            if rate_limiter is not None:
+                rate_limiter.record(host, response.status_code, response.headers.get('Retry-After'))
+            if response.status_code == 304 and cached is not None:
+                cache.record_hit()
+                return BeautifulSoup(cached.body, 'lxml')
+            
             response.raise_for_status()
+            if cache is not None:
+                cache.record_miss()
+                cache.put(url, response.headers, response.content)
             
             soup = BeautifulSoup(response.content, 'lxml')
             return soup
-            
+        
         except requests.RequestException as e:
             logger.warning(f"Attempt {attempt + 1}/{retries} failed for {url}: {e}")
             if attempt < retries - 1:
-                time.sleep(2 ** attempt)  # Exponential backoff
+                # The rate limiter already holds back a throttled host
+                if not (throttled and rate_limiter is not None):
+                    time.sleep(2 ** attempt)  # Exponential backoff
             else:
                 logger.error(f"Failed to fetch {url} after {retries} attempts")
                 return None
@@ -62,25 +94,6 @@ def clean_text(text: Optional[str]) -> Optional[str]:
 
 
 def extract_salary(text: str) -> tuple[Optional[float], Optional[float]]:
-    """Extract salary range from text"""
-    import re
-    
-    # Simple salary extraction (can be improved)
-    salary_pattern = r'\$?([\d,]+)k?\s*-\s*\$?([\d,]+)k?'
-    match = re.search(salary_pattern, text, re.IGNORECASE)
-    
-    if match:
-        try:
-            min_sal = float(match.group(1).replace(',', ''))
-            max_sal = float(match.group(2).replace(',', ''))
-            
-            # If values are in thousands (e.g., 80k)
-            if 'k' in text.lower():
-                min_sal *= 1000
-                max_sal *= 1000
-            
-            return min_sal, max_sal
-        except ValueError:
-            return None, None
-    
-    return None, None
+    """Extract salary range from text; see app.utils.normalize for whole batches"""
+    salary_min, salary_max, _, _ = parse_salary(text)
+    return salary_min, salary_max
@@ -0,0 +1,52 @@
+from typing import Iterable, Iterator, TypeVar
+import queue
+import threading
+
+T = TypeVar("T")
+
+_DONE = object()
+# How often a blocked producer checks whether the consumer went away
+PUT_POLL_SECONDS = 0.5
+
+
+def put_until(events: queue.Queue, item, stop: threading.Event) -> bool:
+    """Put into a bounded queue, giving up once `stop` is set; False if it gave up"""
+    while not stop.is_set():
+        try:
+            events.put(item, timeout=PUT_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def prefetch(items: Iterable[T], maxsize: int) -> Iterator[T]:
+    """
+    Iterate `items` in a background thread, at most `maxsize` ahead of the consumer
+    Producer exceptions are re-raised in the consumer; closing the generator
+    early stops the producer at its next item
+    """
+    buffer = queue.Queue(maxsize=max(1, maxsize))
+    stop = threading.Event()
+    
+    def produce():
+        try:
+            for item in items:
+                if not put_until(buffer, (item, None), stop):
+                    return
+            put_until(buffer, (_DONE, None), stop)
+        except BaseException as e:
+            put_until(buffer, (_DONE, e), stop)
+    
+    thread = threading.Thread(target=produce, name="prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
@@ -0,0 +1,111 @@
+"""
+Scrape worker: consumes per-source scrape tasks from the task queue
+
+Run as many as needed, on any host that reaches redis and the database:
+    python -m app.worker
+    python -m app.worker --burst   # exit once the queue is empty
+"""
+import argparse
+import logging
+import sys
+import time
+from typing import Optional
+from app.core.config import get_settings
+from app.db.database import SessionLocal
+from app.services.scrape_run_service import ScrapeRunService
+from app.services.task_queue import get_task_queue
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Lock a little short of the interval so the next scheduled run isn't blocked by timing jitter
+LOCK_INTERVAL_FRACTION = 0.9
+
+
+def process_task(task_queue, task: dict, session_factory=SessionLocal) -> Optional[dict]:
+    """Run one scrape task unless its source already ran this interval or is running now"""
+    source = task["source"]
+    lock_name = f"scrape:{source}"
+    lock_ttl = settings.scraper_interval_hours * 3600 * LOCK_INTERVAL_FRACTION
+    # Manual triggers skip the interval lock; the scrape_runs guard below
+    # still keeps each source to one run at a time
+    forced = task.get("force", False)
+    
+    # A task that waited out a whole interval is superseded by the next scheduled one
+    enqueued_at = task.get("enqueued_at")
+    if enqueued_at is not None and time.time() - enqueued_at > settings.scraper_interval_hours * 3600:
+        logger.info(f"Dropping {source} task enqueued {time.time() - enqueued_at:.0f}s ago")
+        return None
+    
+    # The lock is kept after a successful run: duplicates enqueued by other
+    # API processes for the same interval are dropped until it expires
+    if not forced and not task_queue.acquire_lock(lock_name, lock_ttl):
+        logger.info(f"Skipping {source}: already scraped this interval")
+        return None
+    
+    def release_lock():
+        if not forced:
+            task_queue.release_lock(lock_name)
+    
+    try:
+        # Recorded like inline runs, so /scraper/status shows worker runs too
+        db = session_factory()
+        try:
+            run, created = ScrapeRunService.start_or_join(db, trigger="worker", scope=source, sources=[source])
+        finally:
+            db.close()
+        if not created:
+            logger.info(f"Skipping {source}: run {run.id} is already in flight")
+            release_lock()
+            return None
+        results = ScrapeRunService.execute(run.id, session_factory, sources=[source])
+    except Exception:
+        release_lock()
+        raise
+    
+    # The scraper service reports a failed or timed-out scraper in its details
+    # rather than raising; either way, let a later task retry the source
+    if results is None or any("error" in detail for detail in results["details"]):
+        logger.warning(f"Scrape task for {source} failed, releasing its lock")
+        release_lock()
+    else:
+        logger.info(f"Scrape task for {source} completed: {results}")
+    return results
+
+
+def run_worker(task_queue=None, burst: bool = False, session_factory=SessionLocal):
+    """Process tasks until interrupted, or until the queue is empty in burst mode"""
+    task_queue = task_queue or get_task_queue()
+    logger.info("Scrape worker started")
+    
+    while True:
+        task = task_queue.dequeue(timeout=0 if burst else 5)
+        if task is None:
+            if burst:
+                return
+            continue
+        
+        try:
+            process_task(task_queue, task, session_factory)
+        except Exception as e:
+            logger.error(f"Scrape task {task} failed: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--burst", action="store_true", help="exit when the queue is empty")
+    args = parser.parse_args()
+    
+    logging.basicConfig(
+        level=getattr(logging, settings.log_level),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
+    try:
+        run_worker(burst=args.burst)
+    except KeyboardInterrupt:
+        logger.info("Scrape worker stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Load test the read API: requests/sec and latency under concurrent clients
+
+Starts uvicorn in a subprocess against a populated database and drives it
+with concurrent httpx clients. Run it on two commits to compare them.
+
+Usage:
+    python -m benchmarks.bench_api_load --rows 20000 --concurrency 50 --duration 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ENDPOINTS = [
+    "/api/v1/jobs/?limit=50",
+    "/api/v1/jobs/?limit=50&company=Company%2042",
+    "/api/v1/jobs/stats",
+]
+
+
+def populate(database_url: str, rows: int):
+    os.environ["DATABASE_URL"] = database_url
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.db.database import Base
+    from app.services.job_service import JobService
+    from benchmarks.datagen import generate_jobs
+    
+    engine = create_engine(database_url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    JobService.bulk_create_jobs(db, generate_jobs(rows))
+    db.close()
+
+
+async def client_loop(client: httpx.AsyncClient, path: str, deadline: float, latencies: list, errors: list):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+        except httpx.HTTPError as e:
+            errors.append(e)
+
+
+async def drive(base_url: str, path: str, concurrency: int, duration: float):
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(
+            client_loop(client, path, deadline, latencies, errors) for _ in range(concurrency)
+        ))
+    return latencies, errors
+
+
+def wait_until_ready(base_url: str, timeout: float = 30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health").status_code == 200:
+                return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError("API did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--database-url", default=None,
+                        help="defaults to a temporary SQLite file")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite:///{tmp}/bench.db"
+        populate(database_url, args.rows)
+        
+        env = {**os.environ, "DATABASE_URL": database_url, "ENABLE_SCHEDULER": "false", "LOG_LEVEL": "WARNING"}
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port),
+             "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"],
+            env=env
+        )
+        base_url = f"http://127.0.0.1:{args.port}"
+        try:
+            wait_until_ready(base_url)
+            for path in ENDPOINTS:
+                latencies, errors = asyncio.run(drive(base_url, path, args.concurrency, args.duration))
+                latencies.sort()
+                p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else float("nan")
+                print(
+                    f"{path:<45} {len(latencies) / args.duration:9.1f} req/s"
+                    f"  p50 {statistics.median(latencies) * 1000:7.1f} ms"
+                    f"  p99 {p99 * 1000:7.1f} ms  errors {len(errors)}"
+                )
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
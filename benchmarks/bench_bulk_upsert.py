@@ -0,0 +1,69 @@
+"""
+Compare ingest throughput of the per-row loop with the set-based upsert
+
+Usage:
+    python -m benchmarks.bench_bulk_upsert --rows 20000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.database import Base
+from app.services.job_service import JobService
+from benchmarks.datagen import generate_jobs
+
+
+def legacy_bulk_create(db, jobs) -> int:
+    """Per-row implementation that bulk_create_jobs used to have"""
+    created_count = 0
+    for job_data in jobs:
+        if not JobService.get_job_by_url(db, job_data.url):
+            JobService.create_job(db, job_data)
+            created_count += 1
+    return created_count
+
+
+def make_session(database_url: str):
+    engine = create_engine(database_url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def timed(label: str, fn, rows: int):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.3f}s {rows / elapsed:12.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--database-url", default=None,
+                        help="defaults to a temporary SQLite file")
+    args = parser.parse_args()
+    
+    jobs = generate_jobs(args.rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite:///{tmp}/bench.db"
+        
+        db = make_session(database_url)
+        timed("legacy insert", lambda: legacy_bulk_create(db, jobs), args.rows)
+        timed("legacy re-run (all dupes)", lambda: legacy_bulk_create(db, jobs), args.rows)
+        db.close()
+        
+        db = make_session(database_url)
+        timed("upsert insert", lambda: JobService.bulk_create_jobs(db, jobs, args.chunk_size), args.rows)
+        timed("upsert re-run (unchanged)", lambda: JobService.bulk_create_jobs(db, jobs, args.chunk_size), args.rows)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
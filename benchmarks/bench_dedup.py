@@ -0,0 +1,110 @@
+"""
+Index synthetic listings with DedupService.index_jobs on a real database,
+batch by batch as ingest does, with a share of them re-posted on a second
+board with small edits
+
+Reports indexing throughput, how the per-batch cost moves as the table
+grows, and recall/false positives on the injected duplicates.
+
+Usage:
+    python -m benchmarks.bench_dedup --rows 100000 --dup-rate 0.05
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+from app.core.config import get_settings
+from app.db.database import Base
+from app.models.job import Job
+from app.models.job_lsh_band import job_lsh_bands
+from app.services.dedup_service import DedupService
+from app.services.job_service import JobService
+from benchmarks.datagen import generate_jobs
+
+settings = get_settings()
+
+
+def repost(job, i: int):
+    """The same posting as another board would show it"""
+    return job.model_copy(update={
+        "title": job.title.lower(),
+        "location": job.location.replace(",", ""),
+        "description": job.description + " Apply now!",
+        "url": f"https://other.example.com/job/{i}",
+        "source": "OtherBoard",
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--dup-rate", type=float, default=0.05)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--database-url", default=None,
+                        help="defaults to a temporary SQLite file")
+    args = parser.parse_args()
+    
+    rng = random.Random(7)
+    # Rows are written without indexing so only index_jobs is timed
+    settings.dedup_enabled = False
+    duplicate_of = {}
+    batch_seconds = []
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(args.database_url or f"sqlite:///{tmp}/bench.db")
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        
+        count = 0
+        while count < args.rows:
+            batch = []
+            for job in generate_jobs(min(args.batch_size, args.rows - count), start=count):
+                # Reposts copy an earlier job of the same batch, so only one batch is held in memory
+                if batch and rng.random() < args.dup_rate:
+                    original = rng.choice(batch)
+                    job = repost(original, count)
+                    duplicate_of[job.url] = original.url
+                batch.append(job)
+                count += 1
+            JobService.bulk_create_jobs(db, batch, chunk_size=args.batch_size, publish=False)
+            db.commit()
+            ids = [job_id for (job_id,) in db.query(Job.id).filter(Job.url.in_([job.url for job in batch]))]
+            
+            start = time.perf_counter()
+            DedupService.index_jobs(db, ids)
+            db.commit()
+            batch_seconds.append(time.perf_counter() - start)
+        
+        ids = dict(db.query(Job.url, Job.id))
+        canonical = dict(db.query(Job.url, Job.canonical_job_id))
+        # A repost of a repost links to the first posting
+        found = sum(
+            1 for url, original in duplicate_of.items()
+            if canonical[url] == (canonical[original] or ids[original])
+        )
+        false_positives = sum(
+            1 for url, canonical_id in canonical.items()
+            if canonical_id is not None and url not in duplicate_of
+        )
+        band_rows = db.query(func.count()).select_from(job_lsh_bands).scalar()
+        db.close()
+    
+    elapsed = sum(batch_seconds)
+    tail = batch_seconds[-max(1, len(batch_seconds) // 10):]
+    print(f"jobs: {args.rows}, injected duplicates: {len(duplicate_of)}, lsh band rows: {band_rows}")
+    print(f"index_jobs      {elapsed:8.1f}s {args.rows / elapsed:9.0f} jobs/s")
+    print(f"first batch     {batch_seconds[0] * 1000:8.1f} ms / {args.batch_size} jobs")
+    print(f"last 10%        {sum(tail) / len(tail) * 1000:8.1f} ms / {args.batch_size} jobs")
+    print(f"recall          {found / max(1, len(duplicate_of)):8.3f}")
+    print(f"false positives {false_positives:8d}")
+
+
+if __name__ == "__main__":
+    main()
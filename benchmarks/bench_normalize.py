@@ -0,0 +1,80 @@
+"""
+Field extraction throughput over raw scraped records
+
+Compares the old per-record salary regex (compiled on every call) and the
+precompiled per-record parser with the vectorized batch stage, which also
+extracts job type, experience level and technologies.
+
+Usage:
+    python -m benchmarks.bench_normalize --rows 100000
+"""
+import argparse
+import os
+import random
+import re
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.utils.normalize import normalize_records, parse_salary
+from benchmarks.datagen import generate_jobs
+
+SALARY_FORMATS = [
+    "${low}k - ${high}k", "{low},000 - {high},000 EUR per year", "£{low}k to {high}k",
+    "{low}.000 – {high}.000 € a year", "{low}-{high}k", "Competitive",
+]
+
+
+def legacy_extract_salary(text: str):
+    """extract_salary before batch normalization, kept as the baseline"""
+    salary_pattern = r'\$?([\d,]+)k?\s*-\s*\$?([\d,]+)k?'
+    match = re.search(salary_pattern, text, re.IGNORECASE)
+    if match:
+        min_sal = float(match.group(1).replace(',', ''))
+        max_sal = float(match.group(2).replace(',', ''))
+        if 'k' in text.lower():
+            min_sal *= 1000
+            max_sal *= 1000
+        return min_sal, max_sal
+    return None, None
+
+
+def raw_records(n: int):
+    rng = random.Random(3)
+    records = []
+    for job in generate_jobs(n):
+        record = job.model_dump(exclude={"salary_min", "salary_max", "experience_level", "technologies"})
+        record["salary"] = rng.choice(SALARY_FORMATS).format(
+            low=int(job.salary_min // 1000), high=int(job.salary_max // 1000)
+        )
+        record["title"] = f"{job.title} ({job.job_type})"
+        record["job_type"] = None
+        records.append(record)
+    return records
+
+
+def timed(label: str, rows: int, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed:8.3f}s {rows / elapsed:12.0f} records/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+    
+    records = raw_records(args.rows)
+    salaries = [record["salary"] for record in records]
+    
+    timed("legacy extract_salary (salary)", args.rows, lambda: [legacy_extract_salary(s) for s in salaries])
+    timed("parse_salary loop (salary)", args.rows, lambda: [parse_salary(s) for s in salaries])
+    timed("normalize_records (all fields)", args.rows, lambda: normalize_records(records))
+    # Boards that tag technologies skip the description scan
+    tagged = [{**record, "technologies": "Python"} for record in records]
+    timed("normalize_records (tags given)", args.rows, lambda: normalize_records(tagged))
+
+
+if __name__ == "__main__":
+    main()
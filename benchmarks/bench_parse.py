@@ -0,0 +1,65 @@
+"""
+Parse a corpus of saved listing pages with 1 and N parse workers
+
+Usage:
+    python -m benchmarks.bench_parse --pages 200 --workers 4
+    python -m benchmarks.bench_parse --corpus-dir path/to/saved/pages
+"""
+import argparse
+import os
+import tempfile
+import time
+from functools import partial
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.scrapers.example_scraper import parse_listing_page
+from app.utils.parse_pool import ParsePool
+from benchmarks.datagen import generate_jobs
+from benchmarks.html_fixtures import render_listing_page
+
+
+def write_corpus(directory: Path, pages: int, per_page: int):
+    jobs = generate_jobs(pages * per_page)
+    for page in range(pages):
+        html = render_listing_page(jobs[page * per_page:(page + 1) * per_page], page + 1)
+        (directory / f"page_{page + 1:05d}.html").write_text(html)
+
+
+def run(pool: ParsePool, corpus):
+    parser = partial(parse_listing_page, base_url="https://bench.example.com", source="BenchSource")
+    # Warm-up starts the worker processes outside the timed section
+    pool.parse(parser, corpus[:pool.workers * 2])
+    start = time.perf_counter()
+    jobs = pool.parse(parser, corpus)
+    elapsed = time.perf_counter() - start
+    pool.shutdown()
+    return len(jobs), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--per-page", type=int, default=25)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--corpus-dir", type=Path, default=None,
+                        help="directory of saved .html pages; generated if omitted")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = args.corpus_dir
+        if corpus_dir is None:
+            corpus_dir = Path(tmp)
+            write_corpus(corpus_dir, args.pages, args.per_page)
+        corpus = [path.read_bytes() for path in sorted(corpus_dir.glob("*.html"))]
+    
+    size_mb = sum(map(len, corpus)) / 1e6
+    print(f"corpus: {len(corpus)} pages, {size_mb:.1f} MB")
+    for workers in sorted({1, args.workers}):
+        jobs, elapsed = run(ParsePool(workers=workers), corpus)
+        print(f"workers={workers:<3} {elapsed:8.3f}s {len(corpus) / elapsed:9.1f} pages/s {jobs / elapsed:10.0f} jobs/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Serialization cost of one 500-row /api/v1/jobs page
+
+Compares validating ORM objects through List[JobResponse] (the old
+response_model path) with encoding selected column tuples via orjson.
+
+Usage:
+    python -m benchmarks.bench_serialization --rows 500 --repeat 200
+"""
+import argparse
+import os
+import time
+from datetime import datetime
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import orjson
+from pydantic import TypeAdapter
+from typing import List
+from app.models.job import Job
+from app.schemas.job import JobResponse
+from benchmarks.datagen import generate_jobs
+
+FIELDS = list(JobResponse.model_fields)
+
+
+def measure(fn, repeat: int) -> float:
+    """Mean milliseconds per call"""
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    
+    now = datetime.utcnow()
+    jobs = [
+        Job(**job.model_dump(), id=i, scraped_at=now, is_active=True)
+        for i, job in enumerate(generate_jobs(args.rows))
+    ]
+    rows = [tuple(getattr(job, name) for name in FIELDS) for job in jobs]
+    projected = [name for name in FIELDS if name != "description"]
+    projected_rows = [tuple(getattr(job, name) for name in projected) for job in jobs]
+    
+    adapter = TypeAdapter(List[JobResponse])
+    scenarios = [
+        ("pydantic List[JobResponse]", lambda: adapter.dump_json(adapter.validate_python(jobs))),
+        ("orjson tuples", lambda: orjson.dumps([dict(zip(FIELDS, row)) for row in rows])),
+        ("orjson tuples, no description", lambda: orjson.dumps([dict(zip(projected, row)) for row in projected_rows])),
+    ]
+    for label, fn in scenarios:
+        print(f"{label:<32} {measure(fn, args.repeat):8.3f} ms / {args.rows} rows  ({len(fn())} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Cold-start cost of the API: `import app.main`, then startup until ready to serve
+
+Each sample is a fresh interpreter. Also breaks import time down by
+top-level package from `python -X importtime`, to show what startup pays for.
+Point --repo at another checkout (e.g. a `git worktree` of an older commit)
+to compare before and after.
+
+Usage:
+    python -m benchmarks.bench_startup --runs 10
+    git worktree add /tmp/before HEAD~1 && python -m benchmarks.bench_startup --repo /tmp/before
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+
+PROBE = """
+import json, time
+from fastapi.testclient import TestClient
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+with TestClient(app.main.app):
+    ready = time.perf_counter()
+print(json.dumps({"import": imported - start, "ready": ready - start}))
+"""
+
+
+def run_probe(repo: Path, env: dict, importtime: bool = False) -> subprocess.CompletedProcess:
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", PROBE]
+    return subprocess.run(command, cwd=repo, env=env, capture_output=True, text=True, check=True)
+
+
+def import_breakdown(stderr: str, top: int):
+    """Self import time summed per top-level package, largest first"""
+    by_package = defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, _, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if self_us.isdigit():
+            package = name.split(".")[0] if not name.startswith("app.") else ".".join(name.split(".")[:3])
+            by_package[package] += int(self_us)
+    return sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repo", default=str(Path(__file__).resolve().parent.parent))
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=12)
+    args = parser.parse_args()
+    
+    repo = Path(args.repo)
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp}/startup.db", "PYTHONPATH": str(repo)}
+        env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+        
+        samples = [json.loads(run_probe(repo, env).stdout.strip().splitlines()[-1]) for _ in range(args.runs)]
+        profile = run_probe(repo, env, importtime=True)
+    
+    print(f"{repo} ({args.runs} fresh interpreters)")
+    for phase in ("import", "ready"):
+        values = [sample[phase] * 1000 for sample in samples]
+        print(f"  {phase:<7} median {statistics.median(values):8.1f} ms   min {min(values):8.1f} ms")
+    print("  self import time by package:")
+    for package, micros in import_breakdown(profile.stderr, args.top):
+        print(f"    {package:<40} {micros / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
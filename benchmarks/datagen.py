@@ -0,0 +1,61 @@
+"""Synthetic job data for benchmarks"""
+import random
+from datetime import datetime, timedelta
+from typing import Iterator, List
+from app.schemas.job import JobCreate
+
+TITLES = ["Backend Engineer", "Data Engineer", "Frontend Developer", "DevOps Engineer",
+          "Full Stack Developer", "ML Engineer", "Site Reliability Engineer", "QA Engineer"]
+SENIORITY = ["Junior", "Mid", "Senior", "Lead"]
+COMPANIES = [f"Company {i}" for i in range(500)]
+LOCATIONS = ["Madrid, Spain", "Barcelona, Spain", "Remote", "Berlin, Germany",
+             "London, UK", "Lisbon, Portugal", "Paris, France", "Amsterdam, Netherlands"]
+JOB_TYPES = ["remote", "hybrid", "onsite"]
+TECHNOLOGIES = ["Python", "FastAPI", "Django", "PostgreSQL", "Docker", "Kubernetes",
+                "AWS", "React", "TypeScript", "Go", "Spark", "Airflow", "Redis"]
+
+
+def generate_jobs(n: int, seed: int = 42, source: str = "BenchSource", start: int = 0) -> List[JobCreate]:
+    """Generate n reproducible JobCreate records, numbered from `start`"""
+    rng = random.Random(seed + start)
+    base_date = datetime(2024, 1, 1)
+    jobs = []
+    
+    for i in range(start, start + n):
+        salary_min = rng.randrange(30, 90) * 1000
+        jobs.append(JobCreate(
+            title=f"{rng.choice(SENIORITY)} {rng.choice(TITLES)}",
+            company=rng.choice(COMPANIES),
+            location=rng.choice(LOCATIONS),
+            # Rare vocabulary words give search benchmarks selective terms
+            description=" ".join(rng.choices(TECHNOLOGIES, k=30) + [f"term{rng.randrange(5000)}" for _ in range(10)]),
+            salary_min=salary_min,
+            salary_max=salary_min + rng.randrange(5, 30) * 1000,
+            url=f"https://bench.example.com/{source.lower()}/job/{i}",
+            source=source,
+            job_type=rng.choice(JOB_TYPES),
+            experience_level=rng.choice(["junior", "mid", "senior"]),
+            technologies=", ".join(rng.sample(TECHNOLOGIES, 4)),
+            posted_date=base_date + timedelta(minutes=i)
+        ))
+    
+    return jobs
+
+
+def iter_job_batches(
+    n: int,
+    batch_size: int = 10000,
+    seed: int = 42,
+    source: str = "BenchSource"
+) -> Iterator[List[JobCreate]]:
+    """
+    generate_jobs for n records in batches, so millions never sit in memory at once
+    Each batch is seeded by its start, so the data depends on seed and batch_size only
+    """
+    for start in range(0, n, batch_size):
+        yield generate_jobs(min(batch_size, n - start), seed=seed, source=source, start=start)
+
+
+def listing_page_jobs(page: int, per_page: int, seed: int = 42, source: str = "BenchSource") -> List[JobCreate]:
+    """The jobs on 1-based listing page `page` of a board with `per_page` jobs per page"""
+    return generate_jobs(per_page, seed=seed, source=source, start=(page - 1) * per_page)
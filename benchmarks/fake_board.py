@@ -0,0 +1,141 @@
+"""
+Local fake job board serving paginated listing pages over HTTP
+
+Pages come from datagen and html_fixtures, so they are the markup
+ExampleJobScraper parses and identical across runs for the same seed.
+Responses carry an ETag and answer If-None-Match with 304, like a board
+behind a CDN, and each request can be delayed to simulate network latency.
+
+Usage:
+    python -m benchmarks.fake_board --pages 100 --per-page 25 --latency 0.05 --port 8001
+    # then scrape http://127.0.0.1:8001/jobs?page=1 ...
+"""
+import argparse
+import hashlib
+import os
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+from urllib.parse import parse_qs, urlsplit
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from benchmarks.datagen import listing_page_jobs
+from benchmarks.html_fixtures import render_listing_page
+
+
+class FakeJobBoard:
+    """Threaded HTTP server for /jobs?page=N; use as a context manager"""
+    
+    def __init__(
+        self,
+        pages: int = 20,
+        per_page: int = 25,
+        latency: float = 0.0,
+        seed: int = 42,
+        source: str = "BenchBoard",
+        host: str = "127.0.0.1",
+        port: int = 0
+    ):
+        self.pages = pages
+        self.per_page = per_page
+        self.latency = latency
+        self.requests = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        
+        @lru_cache(maxsize=4096)
+        def render(page: int) -> Tuple[bytes, str]:
+            jobs = listing_page_jobs(page, per_page, seed=seed, source=source) if page <= pages else []
+            body = render_listing_page(jobs, page).encode()
+            return body, f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        
+        board = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlsplit(self.path)
+                if url.path != "/jobs":
+                    self.send_error(404)
+                    return
+                try:
+                    page = int(parse_qs(url.query).get("page", ["1"])[0])
+                except ValueError:
+                    self.send_error(400)
+                    return
+                
+                if board.latency:
+                    time.sleep(board.latency)
+                body, etag = render(max(1, page))
+                not_modified = self.headers.get("If-None-Match") == etag
+                with board._lock:
+                    board.requests += 1
+                    board.not_modified += not_modified
+                
+                if not_modified:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, *args):
+                pass
+        
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = None
+    
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> "FakeJobBoard":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-board", daemon=True)
+        self._thread.start()
+        return self
+    
+    def serve_forever(self):
+        """Serve in this thread until interrupted"""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+    
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def __enter__(self) -> "FakeJobBoard":
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--per-page", type=int, default=25)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args()
+    
+    board = FakeJobBoard(args.pages, args.per_page, args.latency, args.seed, port=args.port)
+    print(f"Serving {args.pages} pages of {args.per_page} jobs at {board.base_url}/jobs?page=1")
+    board.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
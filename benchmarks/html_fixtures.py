@@ -0,0 +1,53 @@
+"""Render synthetic job-board listing pages in the markup ExampleJobScraper parses"""
+from html import escape
+from typing import List
+from app.schemas.job import JobCreate
+
+CARD_TEMPLATE = """\
+    <div class="job-card">
+      <h2 class="title"><a href="{href}">{title}</a></h2>
+      <span class="company">{company}</span>
+      <span class="location">{location}</span>
+      <span class="salary">${salary_min}k - ${salary_max}k</span>
+      <span class="job-type">{job_type}</span>
+      <ul class="tags">{tags}</ul>
+      <p class="description">{description}</p>
+      <time datetime="{posted}">{posted}</time>
+    </div>
+"""
+
+PAGE_TEMPLATE = """\
+<!DOCTYPE html>
+<html>
+<head><title>Jobs - page {page}</title></head>
+<body>
+  <header><nav><a href="/">Home</a> <a href="/jobs">Jobs</a></nav></header>
+  <main class="listing">
+{cards}  </main>
+  <footer><a href="/jobs?page={next_page}">Next</a></footer>
+</body>
+</html>
+"""
+
+
+def render_job_card(job: JobCreate) -> str:
+    return CARD_TEMPLATE.format(
+        href=escape(job.url),
+        title=escape(job.title),
+        company=escape(job.company),
+        location=escape(job.location or ""),
+        salary_min=int((job.salary_min or 0) // 1000),
+        salary_max=int((job.salary_max or 0) // 1000),
+        job_type=escape(job.job_type or ""),
+        tags="".join(f"<li>{escape(tech)}</li>" for tech in (job.technologies or "").split(", ") if tech),
+        description=escape(job.description or ""),
+        posted=job.posted_date.isoformat() if job.posted_date else ""
+    )
+
+
+def render_listing_page(jobs: List[JobCreate], page: int = 1) -> str:
+    return PAGE_TEMPLATE.format(
+        page=page,
+        next_page=page + 1,
+        cards="".join(render_job_card(job) for job in jobs)
+    )
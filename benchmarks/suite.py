@@ -0,0 +1,277 @@
+"""
+Benchmark suite: ingest, queries, stats and a full scrape cycle, saved as JSON
+
+All scenarios share one database (a temporary SQLite file unless
+--database-url is given) filled from the seeded generator, so runs with the
+same arguments do the same work. `compare` diffs two result files and flags
+regressions beyond a threshold.
+
+Only medians, durations and throughput are compared (see COMPARED); p95
+latencies and counts are recorded for context, being too noisy to gate on.
+
+Usage:
+    python -m benchmarks.suite run --rows 100000 --output benchmarks/results/main.json
+    python -m benchmarks.suite run --scenarios queries,stats --database-url postgresql://...
+    python -m benchmarks.suite compare benchmarks/results/main.json benchmarks/results/branch.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+from app.core.config import get_settings
+from app.db.database import Base
+from app.models.job import Job
+from app.scrapers.example_scraper import ExampleJobScraper
+from app.services.job_service import JobService
+from app.services.scraper_service import ScraperService
+from app.utils.rate_limiter import get_rate_limiter
+from app.utils.response_cache import get_response_cache
+from benchmarks.datagen import iter_job_batches
+from benchmarks.fake_board import FakeJobBoard
+
+settings = get_settings()
+
+RESULTS_DIR = Path(__file__).parent / "results"
+QUERY_LIMIT = 50
+# Compared metrics: -1 when lower is better, 1 when higher is better
+COMPARED = {"median_ms": -1, "seconds": -1, "rows_per_second": 1, "jobs_per_second": 1}
+
+Results = Dict[str, Dict[str, float]]
+
+
+def timed(fn: Callable) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def latency(fn: Callable, repeat: int) -> Dict[str, float]:
+    """Median and p95 of `repeat` calls after one warm-up call"""
+    fn()
+    samples = sorted(timed(fn) * 1000 for _ in range(repeat))
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+    }
+
+
+def load(db, args):
+    for batch in iter_job_batches(args.rows, seed=args.seed):
+        JobService.bulk_create_jobs(db, batch)
+
+
+def scenario_ingest(db, args) -> Results:
+    insert = timed(lambda: load(db, args))
+    rerun = timed(lambda: load(db, args))
+    return {
+        "ingest.insert": {"seconds": round(insert, 3), "rows_per_second": round(args.rows / insert, 1)},
+        "ingest.unchanged_rerun": {"seconds": round(rerun, 3), "rows_per_second": round(args.rows / rerun, 1)},
+    }
+
+
+def scenario_queries(db, args) -> Results:
+    middle = JobService.get_jobs(db, skip=args.rows // 2, limit=1)[0]
+    cursor = (middle.scraped_at, middle.id)
+    cases = {
+        "queries.latest": lambda: JobService.get_jobs(db, limit=QUERY_LIMIT),
+        "queries.company": lambda: JobService.get_jobs(db, company="Company 42", limit=QUERY_LIMIT),
+        "queries.location": lambda: JobService.get_jobs(db, location="Lisbon", limit=QUERY_LIMIT),
+        "queries.job_type_technology": lambda: JobService.get_jobs(
+            db, job_type="remote", technology="Python", limit=QUERY_LIMIT
+        ),
+        "queries.full_text": lambda: JobService.get_jobs(db, q="term1234", limit=QUERY_LIMIT),
+        "queries.dedupe": lambda: JobService.get_jobs(db, dedupe=True, limit=QUERY_LIMIT),
+        # The same page halfway down, reached by offset and by keyset cursor
+        "queries.deep_offset": lambda: JobService.get_jobs(db, skip=args.rows // 2, limit=QUERY_LIMIT),
+        "queries.deep_cursor": lambda: JobService.get_jobs(db, after=cursor, limit=QUERY_LIMIT),
+    }
+    return {name: latency(fn, args.repeat) for name, fn in cases.items()}
+
+
+def scenario_stats(db, args) -> Results:
+    JobService.refresh_stats(db)
+    return {
+        "stats.summary": latency(lambda: JobService.get_stats(db), args.repeat),
+        "stats.compute": latency(lambda: JobService.compute_stats(db), args.repeat),
+    }
+
+
+def scenario_scrape(db, args) -> Results:
+    """Scrape the fake board twice: a full first run, then an incremental one"""
+    # Pacing would make this measure the rate limit, not the pipeline
+    settings.rate_limit_enabled = args.host_rate > 0
+    settings.rate_limit_per_host = args.host_rate or settings.rate_limit_per_host
+    get_rate_limiter.cache_clear()
+    get_response_cache.cache_clear()
+    
+    results = {}
+    with FakeJobBoard(args.pages, args.per_page, args.latency, seed=args.seed) as board:
+        service = ScraperService(workers=1)
+        service.scrapers = [ExampleJobScraper(base_url=board.base_url, max_pages=args.pages)]
+        for name in ("scrape.full_cycle", "scrape.incremental_rerun"):
+            requests_before = board.requests
+            start = time.perf_counter()
+            run = service.run_all_scrapers(db)
+            seconds = time.perf_counter() - start
+            errors = [detail["error"] for detail in run["details"] if "error" in detail]
+            if errors:
+                raise RuntimeError(f"{name} failed: {errors}")
+            results[name] = {
+                "seconds": round(seconds, 3),
+                "jobs_per_second": round(run["total_scraped"] / seconds, 1),
+                "scraped": run["total_scraped"],
+                "created": run["total_created"],
+                "requests": board.requests - requests_before,
+            }
+    return results
+
+
+# In run order; the query and stats scenarios load --rows jobs first when ingest is skipped
+SCENARIOS = {
+    "ingest": scenario_ingest,
+    "queries": scenario_queries,
+    "stats": scenario_stats,
+    "scrape": scenario_scrape,
+}
+
+
+def metadata(args, dialect: str) -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "database": dialect,
+        "settings": {
+            "ingest_chunk_size": settings.ingest_chunk_size,
+            "dedup_enabled": settings.dedup_enabled,
+            "parse_workers": settings.parse_workers,
+            "http_cache_enabled": settings.http_cache_enabled,
+        },
+        # Not the database URL, which may hold credentials
+        "args": {key: value for key, value in vars(args).items() if key not in ("func", "database_url", "output")},
+    }
+
+
+def run(args) -> int:
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        print(f"Unknown scenarios: {', '.join(sorted(unknown))} (choose from {', '.join(SCENARIOS)})")
+        return 2
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(args.database_url or f"sqlite:///{tmp}/bench.db")
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        
+        results: Results = {}
+        try:
+            if "ingest" in scenarios:
+                results.update(scenario_ingest(db, args))
+            elif {"queries", "stats"} & set(scenarios):
+                load(db, args)
+            for name in scenarios:
+                if name != "ingest":
+                    results.update(SCENARIOS[name](db, args))
+            rows = db.query(func.count(Job.id)).scalar()
+        finally:
+            db.close()
+            Base.metadata.drop_all(bind=engine)
+    
+    report = {"meta": {**metadata(args, engine.dialect.name), "rows_in_table": rows}, "results": results}
+    for name, metrics in results.items():
+        print(f"{name:<30} " + "  ".join(f"{metric}={value}" for metric, value in metrics.items()))
+    
+    output = Path(args.output) if args.output else RESULTS_DIR / (
+        f"{datetime.utcnow():%Y%m%dT%H%M%S}-{report['meta']['git_commit'] or 'nogit'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {output}")
+    return 0
+
+
+def compare(args) -> int:
+    old, new = (json.loads(Path(path).read_text()) for path in (args.baseline, args.candidate))
+    print(f"baseline  {old['meta'].get('git_commit')} {old['meta']['timestamp']}")
+    print(f"candidate {new['meta'].get('git_commit')} {new['meta']['timestamp']}")
+    if old["meta"]["args"] != new["meta"]["args"]:
+        print("warning: runs used different arguments, results may not be comparable")
+    
+    regressions = 0
+    for name in sorted(set(old["results"]) & set(new["results"])):
+        for metric, before in old["results"][name].items():
+            after = new["results"][name].get(metric)
+            direction = COMPARED.get(metric)
+            if direction is None or after is None or not before:
+                continue
+            change = (after - before) / before
+            if change * direction < -args.threshold:
+                verdict = "REGRESSION"
+                regressions += 1
+            elif change * direction > args.threshold:
+                verdict = "improved"
+            else:
+                verdict = ""
+            print(f"{name:<30} {metric:<16} {before:>12} -> {after:>12} {change:+8.1%}  {verdict}")
+    
+    only = set(old["results"]) ^ set(new["results"])
+    if only:
+        print(f"not in both runs: {', '.join(sorted(only))}")
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    run_parser = commands.add_parser("run", help="run scenarios and write a JSON result file")
+    run_parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated")
+    run_parser.add_argument("--rows", type=int, default=20000, help="jobs ingested before the query scenarios")
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--repeat", type=int, default=20, help="samples per query latency")
+    run_parser.add_argument("--pages", type=int, default=40, help="fake board listing pages")
+    run_parser.add_argument("--per-page", type=int, default=25)
+    run_parser.add_argument("--latency", type=float, default=0.02, help="fake board seconds per response")
+    run_parser.add_argument("--host-rate", type=float, default=0.0,
+                            help="requests/second per host while scraping; 0 disables the rate limiter")
+    run_parser.add_argument("--database-url", default=None, help="defaults to a temporary SQLite file")
+    run_parser.add_argument("--output", default=None, help="defaults to benchmarks/results/<time>-<commit>.json")
+    run_parser.set_defaults(func=run)
+    
+    compare_parser = commands.add_parser("compare", help="diff two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="relative change to flag")
+    compare_parser.add_argument("--fail-on-regression", action="store_true", help="exit 1 on any regression")
+    compare_parser.set_defaults(func=compare)
+    
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,32 @@
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from app.main import app
-from app.db.database import Base, get_db
+from app.core.api_cache import get_api_cache
+from app.utils.rate_limiter import get_rate_limiter
+from app.db.database import (
+    Base, async_database_url, get_async_db, get_async_sessionmaker, get_db, get_session_factory
+)
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# TestClient may run each request on a fresh event loop, so don't pool aiosqlite connections
+async_engine = create_async_engine(async_database_url(SQLALCHEMY_DATABASE_URL), poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+
+@pytest.fixture(autouse=True)
+def fresh_rate_limiter():
+    # Don't let one test's throttled hosts pace the next
+    get_rate_limiter.cache_clear()
+    yield
+
 
 @pytest.fixture(scope="function")
 def db():
@@ -30,6 +47,16 @@ def client(db):
         finally:
             db.close()
     
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as async_db:
+            yield async_db
+    
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_sessionmaker] = lambda: TestingAsyncSessionLocal
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
+    # Each test starts from a fresh database, so drop responses cached by earlier ones
+    if get_api_cache():
+        get_api_cache().clear()
     yield TestClient(app)
     app.dependency_overrides.clear()
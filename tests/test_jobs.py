@@ -1,5 +1,15 @@
-from app.schemas.job import JobCreate
+import io
+import json
+import pytest
+import threading
+from sqlalchemy import inspect, text
+from app.core.api_cache import ApiCache, get_api_cache
+from app.db.migrate_search import migrate
+from app.models.job import Job
+from app.models.job_stats import JobStatsSummary
+from app.schemas.job import JobCreate, JobResponse
 from app.services.job_service import JobService
+from app.services.technology_service import TechnologyService
 from datetime import datetime
 
 
@@ -59,3 +69,356 @@ def test_get_stats(client, db):
     stats = response.json()
     assert stats["total_jobs"] == 3
     assert stats["companies_count"] == 3
+
+
+def test_bulk_create_jobs_upserts(db):
+    jobs = [
+        JobCreate(
+            title=f"Job {i}",
+            company=f"Company {i}",
+            url=f"https://example.com/job/{i}",
+            source="TestSource"
+        )
+        for i in range(3)
+    ]
+    
+    counts = JobService.bulk_create_jobs(db, jobs, chunk_size=2)
+    assert counts["inserted"] == 3
+    assert counts["updated"] == 0
+    
+    jobs[0] = jobs[0].model_copy(update={"salary_min": 40000})
+    counts = JobService.bulk_create_jobs(db, jobs)
+    assert counts["inserted"] == 0
+    assert counts["updated"] == 1
+    assert counts["unchanged"] == 2
+    
+    job = JobService.get_job_by_url(db, "https://example.com/job/0")
+    assert job.salary_min == 40000
+
+
+def test_get_jobs_cursor_pagination(client, db):
+    for i in range(3):
+        JobService.create_job(db, JobCreate(
+            title=f"Job {i}",
+            company="PagedCo",
+            url=f"https://example.com/paged/{i}",
+            source="TestSource"
+        ))
+    
+    response = client.get("/api/v1/jobs/?limit=2")
+    first_page = [job["id"] for job in response.json()]
+    cursor = response.headers["X-Next-Cursor"]
+    
+    response = client.get(f"/api/v1/jobs/?limit=2&cursor={cursor}")
+    second_page = [job["id"] for job in response.json()]
+    assert "X-Next-Cursor" not in response.headers
+    
+    assert len(first_page) == 2
+    assert len(second_page) == 1
+    assert set(first_page).isdisjoint(second_page)
+    
+    assert client.get("/api/v1/jobs/?cursor=not-a-cursor").status_code == 400
+
+
+def test_get_jobs_full_text_search(client, db):
+    JobService.bulk_create_jobs(db, [
+        JobCreate(title="Python Developer", company="SnakeCo", url="https://example.com/s/1",
+                  source="TestSource", technologies="Python, Django"),
+        JobCreate(title="Go Developer", company="GopherCo", url="https://example.com/s/2",
+                  source="TestSource", technologies="Go"),
+        JobCreate(title="Data Engineer", company="DataCo", url="https://example.com/s/3",
+                  source="TestSource", description="Pipelines in Python and Spark"),
+    ])
+    # Updates must reach the search index too
+    JobService.bulk_create_jobs(db, [
+        JobCreate(title="Go Developer", company="GopherCo", url="https://example.com/s/2",
+                  source="TestSource", technologies="Go, Python"),
+    ])
+    
+    response = client.get("/api/v1/jobs/?q=python")
+    assert response.status_code == 200
+    assert {job["company"] for job in response.json()} == {"SnakeCo", "GopherCo", "DataCo"}
+    
+    response = client.get('/api/v1/jobs/?q=python "django')
+    assert [job["company"] for job in response.json()] == ["SnakeCo"]
+
+
+def test_stats_served_from_summary_refreshed_at_ingest(client, db):
+    jobs = [
+        JobCreate(title=f"Job {i}", company=f"Company {i}",
+                  url=f"https://example.com/stats/{i}", source="TestSource")
+        for i in range(2)
+    ]
+    JobService.bulk_create_jobs(db, jobs)
+    
+    stats = client.get("/api/v1/jobs/stats").json()
+    assert stats["total_jobs"] == 2
+    assert stats["refreshed_at"] is not None
+    
+    # Writes outside ingest are picked up at the next refresh, not per request
+    JobService.create_job(db, JobCreate(title="Extra", company="Extra",
+                                        url="https://example.com/stats/extra", source="TestSource"))
+    assert client.get("/api/v1/jobs/stats").json()["total_jobs"] == 2
+    
+    JobService.bulk_create_jobs(db, [JobCreate(title="New", company="New",
+                                               url="https://example.com/stats/new", source="TestSource")])
+    assert client.get("/api/v1/jobs/stats").json()["total_jobs"] == 4
+
+
+def test_stale_stats_served_while_refreshed_in_background(client, db):
+    JobService.bulk_create_jobs(db, [JobCreate(title="Job", company="Co",
+                                               url="https://example.com/stale/1", source="TestSource")])
+    JobService.create_job(db, JobCreate(title="Extra", company="Co",
+                                        url="https://example.com/stale/2", source="TestSource"))
+    db.query(JobStatsSummary).update({"refreshed_at": datetime(2000, 1, 1)})
+    db.commit()
+    
+    # The stale summary is answered at once; the refresh runs after the response
+    assert client.get("/api/v1/jobs/stats").json()["total_jobs"] == 1
+    assert client.get("/api/v1/jobs/stats").json()["total_jobs"] == 2
+    
+    # Refreshing when the row already exists updates it in place
+    JobService.refresh_stats(db)
+    assert db.query(JobStatsSummary).count() == 1
+
+
+def test_technologies_normalized_for_filter_and_stats(client, db):
+    JobService.bulk_create_jobs(db, [
+        JobCreate(title="Backend", company="A", url="https://example.com/t/1",
+                  source="TestSource", technologies="Python, FastAPI"),
+        JobCreate(title="Web", company="B", url="https://example.com/t/2",
+                  source="TestSource", technologies="python, Django"),
+    ])
+    
+    stats = client.get("/api/v1/jobs/stats").json()
+    assert stats["top_technologies"][0] == {"technology": "Python", "count": 2}
+    
+    response = client.get("/api/v1/jobs/?technology=django")
+    assert [job["company"] for job in response.json()] == ["B"]
+    
+    # Re-scraped jobs get their links replaced
+    JobService.bulk_create_jobs(db, [
+        JobCreate(title="Web", company="B", url="https://example.com/t/2",
+                  source="TestSource", technologies="Go"),
+    ])
+    assert client.get("/api/v1/jobs/?technology=django").json() == []
+    assert len(client.get("/api/v1/jobs/?technology=python").json()) == 1
+
+
+def test_backfill_technologies(db):
+    db.add(Job(title="Legacy", company="Old", url="https://example.com/legacy",
+               source="TestSource", technologies="Rust, Go"))
+    db.commit()
+    
+    assert TechnologyService.backfill(db, batch_size=1) == 1
+    
+    assert len(JobService.get_jobs(db, technology="rust")) == 1
+
+
+def test_migrate_search_indexes_existing_database(db):
+    engine = db.get_bind()
+    # A database from before the search indexes: no FTS table, triggers or keyset index
+    with engine.begin() as connection:
+        for trigger in ("jobs_fts_ai", "jobs_fts_ad", "jobs_fts_au"):
+            connection.execute(text(f"DROP TRIGGER {trigger}"))
+        connection.execute(text("DROP TABLE jobs_fts"))
+        connection.execute(text("DROP INDEX ix_jobs_scraped_at_id"))
+        # ...or one with the old update trigger, fired by every column
+        connection.execute(text("CREATE TRIGGER jobs_fts_au AFTER UPDATE ON jobs BEGIN SELECT 1; END"))
+    db.add(Job(title="Legacy Python Developer", company="Old", url="https://example.com/legacy",
+               source="TestSource"))
+    db.commit()
+    
+    migrate(engine)
+    migrate(engine)  # Idempotent
+    
+    assert "ix_jobs_scraped_at_id" in {index["name"] for index in inspect(engine).get_indexes("jobs")}
+    assert [job.company for job in JobService.get_jobs(db, q="python")] == ["Old"]
+    trigger_sql = db.execute(text("SELECT sql FROM sqlite_master WHERE name = 'jobs_fts_au'")).scalar()
+    assert "AFTER UPDATE OF title" in trigger_sql
+    
+    # Edits to searched columns still reach the index
+    db.query(Job).update({Job.title: "Legacy Rust Developer"})
+    db.commit()
+    assert [job.company for job in JobService.get_jobs(db, q="rust")] == ["Old"]
+    assert JobService.get_jobs(db, q="python") == []
+
+
+def test_job_list_cached_until_ingest(client, db):
+    JobService.bulk_create_jobs(db, [
+        JobCreate(title="Cached", company="CacheCo", url="https://example.com/c/1", source="TestSource")
+    ])
+    cache = get_api_cache()
+    
+    assert len(client.get("/api/v1/jobs/?company=CacheCo").json()) == 1
+    assert len(client.get("/api/v1/jobs/?company=CacheCo").json()) == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    
+    JobService.bulk_create_jobs(db, [
+        JobCreate(title="Fresh", company="CacheCo", url="https://example.com/c/2", source="TestSource")
+    ])
+    assert len(client.get("/api/v1/jobs/?company=CacheCo").json()) == 2
+    assert client.get("/health").json()["api_cache"]["hit_ratio"] == round(1 / 3, 4)
+
+
+@pytest.mark.asyncio
+async def test_api_cache_keeps_redis_calls_off_the_event_loop():
+    # Nothing listens on port 1: every redis call fails over to the in-process LRU
+    cache = ApiCache(redis_url="redis://127.0.0.1:1/0")
+    threads = []
+    connect = cache._client
+    cache._client = lambda: threads.append(threading.current_thread()) or connect()
+    
+    key, cached = await cache.lookup("jobs", {"q": "python"})
+    assert cached is None
+    await cache.store(key, b"[]")
+    assert (await cache.lookup("jobs", {"q": "python"}))[1].body == b"[]"
+    assert threads and threading.current_thread() not in threads
+
+
+def test_export_streams_filtered_rows(client, db):
+    JobService.bulk_create_jobs(db, [
+        JobCreate(title=f"Export {i}", company="ExportCo" if i % 2 else "OtherCo",
+                  url=f"https://example.com/e/{i}", source="TestSource", salary_min=1000.0 * i)
+        for i in range(4)
+    ])
+    
+    response = client.get("/api/v1/jobs/export?company=ExportCo")
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["title"] for row in rows] == ["Export 1", "Export 3"]
+    assert rows[0]["salary_min"] == 1000.0
+    
+    response = client.get("/api/v1/jobs/export?format=csv")
+    lines = response.text.splitlines()
+    assert lines[0].startswith("title,company")
+    assert len(lines) == 5
+    
+    pq = pytest.importorskip("pyarrow.parquet")
+    response = client.get("/api/v1/jobs/export?format=parquet&company=ExportCo")
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.column("title").to_pylist() == ["Export 1", "Export 3"]
+
+
+def test_get_jobs_field_projection(client, db):
+    JobService.create_job(db, JobCreate(
+        title="Projected", company="ProjCo", description="A long description",
+        url="https://example.com/p/1", source="TestSource"
+    ))
+    
+    full = client.get("/api/v1/jobs/").json()[0]
+    assert full["description"] == "A long description"
+    assert set(full) == set(JobResponse.model_fields)
+    
+    response = client.get("/api/v1/jobs/?fields=id,title")
+    assert response.json() == [{"title": "Projected", "id": full["id"]}]
+    
+    assert client.get("/api/v1/jobs/?fields=id,salary").status_code == 400
+
+
+def test_near_duplicates_linked_across_sources(client, db):
+    description = (
+        "We are hiring a backend engineer to build data pipelines in Python "
+        "and PostgreSQL, with FastAPI services deployed on Kubernetes."
+    )
+    jobs = [
+        JobCreate(title="Backend Engineer", company="DupCo", location="Madrid",
+                  description=description, url="https://board-a.test/1", source="BoardA"),
+        JobCreate(title="Unrelated Designer", company="OtherCo", location="Paris",
+                  description="Design beautiful interfaces for our mobile apps.",
+                  url="https://board-a.test/2", source="BoardA"),
+    ]
+    JobService.bulk_create_jobs(db, jobs)
+    # Same posting on another board, with different punctuation and a trailing note
+    JobService.bulk_create_jobs(db, [
+        JobCreate(title="Backend engineer", company="DupCo", location="Madrid",
+                  description=description.replace(",", "") + " Apply now.",
+                  url="https://board-b.test/99", source="BoardB"),
+    ])
+    
+    original = JobService.get_job_by_url(db, "https://board-a.test/1")
+    copy = JobService.get_job_by_url(db, "https://board-b.test/99")
+    assert copy.canonical_job_id == original.id
+    assert original.canonical_job_id is None
+    assert JobService.get_job_by_url(db, "https://board-a.test/2").canonical_job_id is None
+    
+    urls = {job["url"] for job in client.get("/api/v1/jobs/?dedupe=true").json()}
+    assert urls == {"https://board-a.test/1", "https://board-a.test/2"}
+    
+    stats = client.get("/api/v1/jobs/stats").json()
+    assert stats["total_jobs"] == 3
+    assert stats["unique_jobs"] == 2
+
+
+def test_duplicates_relinked_when_canonical_is_deactivated(db):
+    description = "Build data pipelines in Python and PostgreSQL with FastAPI services on Kubernetes."
+    JobService.bulk_create_jobs(db, [
+        JobCreate(title="Data Engineer", company="DupCo", description=description,
+                  url="https://board-a.test/1", source="BoardA"),
+    ])
+    JobService.bulk_create_jobs(db, [
+        JobCreate(title="Data engineer", company="DupCo", description=description + " Apply now.",
+                  url=f"https://board-{board}.test/1", source=f"Board{board.upper()}")
+        for board in ("b", "c")
+    ])
+    original = JobService.get_job_by_url(db, "https://board-a.test/1")
+    copy_b = JobService.get_job_by_url(db, "https://board-b.test/1")
+    copy_c = JobService.get_job_by_url(db, "https://board-c.test/1")
+    assert copy_b.canonical_job_id == copy_c.canonical_job_id == original.id
+    
+    # Board A took the listing down; the copies on B and C are still up
+    assert JobService.deactivate_unseen(db, "BoardA", datetime(2100, 1, 1)) == 1
+    db.expire_all()
+    
+    assert [job.url for job in JobService.get_jobs(db, dedupe=True)] == ["https://board-b.test/1"]
+    assert copy_b.canonical_job_id is None
+    assert copy_c.canonical_job_id == copy_b.id
+    assert original.canonical_job_id == copy_b.id
+    
+    # A new copy links to the active canonical job, not the deactivated one
+    JobService.bulk_create_jobs(db, [
+        JobCreate(title="Data Engineer", company="DupCo", description=description,
+                  url="https://board-d.test/1", source="BoardD"),
+    ])
+    assert JobService.get_job_by_url(db, "https://board-d.test/1").canonical_job_id == copy_b.id
+
+
+def test_metrics_endpoint(client, db):
+    JobService.bulk_create_jobs(db, [
+        JobCreate(title="Job", company="Co", url="https://example.com/job/m1", source="TestSource")
+    ])
+    client.get("/api/v1/jobs/")
+    client.get("/api/v1/jobs/999999")
+    
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_request_seconds_count{method="GET",route="/api/v1/jobs/",status="200"}' in body
+    # Routes are labelled by template, not by the requested path
+    assert 'route="/api/v1/jobs/{job_id}",status="404"' in body
+    assert 'db_query_seconds_count{method="get_job_rows"}' in body
+    assert 'ingest_rows_total{outcome="inserted"}' in body
+    assert 'cache_hits_total{cache="api"}' in body
+
+
+def test_importing_app_has_no_side_effects(tmp_path):
+    import os
+    import subprocess
+    import sys
+    
+    database = tmp_path / "import.db"
+    probe = (
+        "import sys, app.main; "
+        "print(sorted(m for m in ('pandas', 'numpy') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe],
+        env={**os.environ, "DATABASE_URL": f"sqlite:///{database}", "ENABLE_SCHEDULER": "true"},
+        capture_output=True, text=True, check=True
+    )
+    
+    # Heavy modules load on first use; the schema and scheduler wait for the lifespan handler
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+    assert not database.exists()
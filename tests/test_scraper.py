@@ -1,4 +1,31 @@
-from app.scrapers.example_scraper import ExampleJobScraper
+import httpx
+import pytest
+import redis
+import threading
+import time
+from datetime import datetime
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from app.models.scrape_run import ScrapeRun
+from app.schemas.job import JobCreate
+from app.scrapers import example_scraper
+from app.scrapers.example_scraper import ExampleJobScraper, parse_listing_page
+from app.services import scraper_service
+from app.services.job_service import JobService
+from app.services.scrape_run_service import ScrapeRunService
+from app.services.scraper_service import ScraperService
+from app.utils import parse_pool, rate_limiter
+from app.utils.async_fetch import AsyncFetcher, close_fetch_loop, fetch_pages
+from app.utils.headers import USER_AGENTS, HeaderPool
+from app.utils.normalize import normalize_jobs, normalize_records
+from app.utils.parse_pool import ParsePool
+from app.utils.rate_limiter import RateLimiter, RedisRateLimiter
+from app.utils.response_cache import CachedResponse, FileStore, RedisStore, ResponseCache
+from app.utils.scraper_helpers import NOT_MODIFIED, extract_salary
+from tests.conftest import TestingSessionLocal
+
+FIXTURES = Path(__file__).parent / "fixtures"
 
 
 def test_example_scraper():
@@ -17,3 +44,647 @@ def test_scraper_api_trigger(client):
     data = response.json()
     assert "message" in data
     assert data["status"] == "running"
+    assert data["coalesced"] is False
+    
+    # The background run finished with its own session before the client returned
+    status = client.get("/api/v1/scraper/status").json()
+    assert status["status"] == "available"
+    assert status["last_run"]["id"] == data["run_id"]
+    assert status["last_run"]["status"] == "succeeded"
+    assert status["last_run"]["scrapers_done"] == status["scrapers_configured"]
+
+
+def test_scraper_trigger_joins_in_flight_run(client, db):
+    run, created = ScrapeRunService.start_or_join(db, trigger="scheduler")
+    assert created
+    
+    data = client.post("/api/v1/scraper/run").json()
+    assert data["coalesced"] is True
+    assert data["run_id"] == run.id
+    current_run = client.get("/api/v1/scraper/status").json()["current_run"]
+    assert (current_run["id"], current_run["scope"]) == (run.id, "all")
+
+
+def test_scrape_run_coalescing_enforced_by_database(db, monkeypatch):
+    first, _ = ScrapeRunService.start_or_join(db, trigger="api")
+    # Another process checks for an active run before this one is committed
+    get_active_run = ScrapeRunService.get_active_run
+    checks = []
+    
+    def racing_check(db, scope=None):
+        checks.append(scope)
+        return None if len(checks) == 1 else get_active_run(db, scope)
+    
+    monkeypatch.setattr(ScrapeRunService, "get_active_run", staticmethod(racing_check))
+    run, created = ScrapeRunService.start_or_join(db, trigger="scheduler")
+    assert (run.id, created) == (first.id, False)
+    
+    # A run without a recent heartbeat is abandoned and no longer holds the scope
+    first.heartbeat_at = datetime(2000, 1, 1)
+    db.commit()
+    monkeypatch.setattr(ScrapeRunService, "get_active_run", staticmethod(get_active_run))
+    run, created = ScrapeRunService.start_or_join(db, trigger="scheduler")
+    assert created and run.id != first.id
+    db.refresh(first)
+    assert first.status == "failed"
+
+
+def test_long_run_with_heartbeats_is_not_abandoned(db, monkeypatch):
+    run, _ = ScrapeRunService.start_or_join(db, trigger="api")
+    run_id = run.id
+    run.created_at = datetime(2000, 1, 1)
+    db.commit()
+    assert ScrapeRunService.start_or_join(db, trigger="scheduler") == (run, False)
+    
+    def abandoned_meanwhile(self, db, sources=None, on_progress=None):
+        # Another process gave up on the run while it was scraping
+        db.query(ScrapeRun).filter(ScrapeRun.id == run_id).update({"status": "failed", "error": "abandoned"})
+        db.commit()
+        return {"total_scraped": 0, "total_created": 0, "total_updated": 0,
+                "duration_seconds": 1.0, "details": []}
+    
+    monkeypatch.setattr(ScraperService, "run_all_scrapers", abandoned_meanwhile)
+    ScrapeRunService.execute(run_id, TestingSessionLocal)
+    
+    db.refresh(run)
+    assert (run.status, run.error) == ("failed", "abandoned")
+
+
+@pytest.mark.asyncio
+async def test_async_fetcher_retries_and_keeps_order():
+    attempts = {}
+    
+    def handler(request):
+        page = request.url.params["page"]
+        attempts[page] = attempts.get(page, 0) + 1
+        # Page 2 fails once before succeeding
+        if page == "2" and attempts[page] == 1:
+            return httpx.Response(503)
+        if page == "3":
+            return httpx.Response(404)
+        return httpx.Response(200, content=f"page {page}".encode())
+    
+    urls = [f"https://jobs.test/jobs?page={page}" for page in range(1, 4)]
+    async with AsyncFetcher(retries=3, backoff_base=0, transport=httpx.MockTransport(handler)) as fetcher:
+        pages = await fetcher.fetch_many(urls)
+    
+    assert pages == [b"page 1", b"page 2", None]
+    assert attempts == {"1": 1, "2": 2, "3": 1}
+
+
+@pytest.mark.asyncio
+async def test_async_fetcher_revalidates_cached_pages(tmp_path):
+    requests_seen = []
+    
+    def handler(request):
+        requests_seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=b"listing", headers={"ETag": '"v1"'})
+    
+    cache = ResponseCache(max_entries=10, store=FileStore(tmp_path))
+    url = "https://jobs.test/jobs?page=1"
+    async with AsyncFetcher(cache=cache, transport=httpx.MockTransport(handler)) as fetcher:
+        assert await fetcher.fetch(url) == b"listing"
+        assert await fetcher.fetch(url) == b"listing"
+        assert await fetcher.fetch(url, skip_unchanged=True) is NOT_MODIFIED
+    
+    assert requests_seen == [None, '"v1"', '"v1"']
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+    # A fresh cache picks the validators back up from disk
+    assert ResponseCache(store=FileStore(tmp_path)).get(url).etag == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_async_fetcher_keeps_one_header_profile_per_host():
+    agents = {}
+    
+    def handler(request):
+        agents.setdefault(request.url.host, set()).add(request.headers["User-Agent"])
+        return httpx.Response(200, content=b"ok")
+    
+    urls = [f"https://{host}/jobs?page={page}" for host in ("a.test", "b.test") for page in range(1, 6)]
+    async with AsyncFetcher(cache=None, header_pool=HeaderPool(rotate=True),
+                            transport=httpx.MockTransport(handler)) as fetcher:
+        await fetcher.fetch_many(urls)
+    
+    assert all(len(seen) == 1 and seen <= set(USER_AGENTS) for seen in agents.values())
+    assert HeaderPool(rotate=False).for_host("a.test")["User-Agent"] == USER_AGENTS[0]
+
+
+def test_response_cache_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    for url in ("a", "b"):
+        cache.put(url, {"ETag": url}, url.encode())
+    cache.get("a")
+    cache.put("c", {"ETag": "c"}, b"c")
+    
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+@pytest.mark.asyncio
+async def test_response_cache_store_io_runs_off_the_event_loop(tmp_path):
+    threads = []
+    
+    class RecordingStore(FileStore):
+        def get(self, url):
+            threads.append(threading.current_thread())
+            return super().get(url)
+        
+        def put(self, url, response):
+            threads.append(threading.current_thread())
+            super().put(url, response)
+    
+    cache = ResponseCache(store=RecordingStore(tmp_path))
+    await cache.put_async("https://a.test/1", {"ETag": '"v1"'}, b"page")
+    
+    assert await ResponseCache(store=RecordingStore(tmp_path)).get_async("https://a.test/1") == (
+        CachedResponse('"v1"', None, b"page")
+    )
+    assert len(threads) == 2
+    assert threading.current_thread() not in threads
+
+
+def test_redis_store_expires_entries():
+    commands = []
+    
+    class RecordingPipeline:
+        def __enter__(self):
+            return self
+        
+        def __exit__(self, *exc_info):
+            pass
+        
+        def hset(self, key, mapping):
+            commands.append(("hset", key))
+        
+        def expire(self, key, ttl):
+            commands.append(("expire", key, ttl))
+        
+        def execute(self):
+            commands.append(("execute",))
+    
+    store = RedisStore("redis://127.0.0.1:1/0", prefix="test:", ttl=60)
+    store.client.pipeline = lambda transaction=True: RecordingPipeline()
+    store.put("https://a.test/1", CachedResponse('"v1"', None, b"page"))
+    
+    key = commands[0][1]
+    assert commands == [("hset", key), ("expire", key, 60), ("execute",)]
+    assert store.client.connection_pool.connection_kwargs["socket_timeout"] == 0.2
+
+
+def test_incremental_scrape_stops_at_known_page(monkeypatch):
+    fetched = []
+    
+    def fake_fetch_pages(urls):
+        fetched.extend(urls)
+        pages = []
+        for url in urls:
+            page = url.rsplit("=", 1)[1]
+            cards = "".join(
+                f'<div class="job-card"><h2 class="title"><a href="/job/{page}-{i}">Job</a></h2>'
+                f'<span class="company">Co</span></div>'
+                for i in range(2)
+            )
+            pages.append(f"<html><body>{cards}</body></html>".encode())
+        return pages
+    
+    batches = []
+    
+    class RecordingPool(ParsePool):
+        def parse_each(self, parser, pages):
+            batches.append(len(pages))
+            return super().parse_each(parser, pages)
+    
+    monkeypatch.setattr(example_scraper, "fetch_pages", fake_fetch_pages)
+    monkeypatch.setattr(example_scraper, "get_parse_pool", lambda: RecordingPool(workers=1))
+    scraper = ExampleJobScraper(base_url="https://jobs.test")
+    known_urls = {"https://jobs.test/job/2-0", "https://jobs.test/job/2-1"}
+    
+    jobs = scraper.scrape_jobs(max_pages=50, known_urls=known_urls)
+    
+    assert [job.url for job in jobs] == [
+        "https://jobs.test/job/1-0", "https://jobs.test/job/1-1",
+        "https://jobs.test/job/2-0", "https://jobs.test/job/2-1",
+    ]
+    assert len(fetched) < 50
+    # The fetched window goes to the parse pool as one batch, not page by page
+    assert batches == [len(fetched)]
+
+
+def test_invalid_card_is_skipped_and_counted(db, monkeypatch):
+    def fake_fetch_pages(urls):
+        pages = []
+        for url in urls:
+            page = url.rsplit("=", 1)[1]
+            cards = "".join(
+                f'<div class="job-card"><h2 class="title"><a href="/job/{page}-{i}">Job</a></h2>'
+                f'<span class="company">Co</span></div>'
+                for i in range(2)
+            )
+            # The title link holds only an image, so the record has no title
+            cards += (
+                f'<div class="job-card"><h2 class="title"><a href="/job/{page}-logo"><img src="logo.png"></a></h2>'
+                f'<span class="company">Co</span></div>'
+            )
+            pages.append(f"<html><body>{cards}</body></html>".encode())
+        return pages
+    
+    monkeypatch.setattr(example_scraper, "fetch_pages", fake_fetch_pages)
+    scraper = ExampleJobScraper(base_url="https://jobs.test", max_pages=2)
+    
+    by_page = scraper.parse_pages_each(fake_fetch_pages([scraper.listing_url(1), scraper.listing_url(2)]))
+    assert [[job.url for job in jobs] for jobs in by_page] == [
+        ["https://jobs.test/job/1-0", "https://jobs.test/job/1-1"],
+        ["https://jobs.test/job/2-0", "https://jobs.test/job/2-1"],
+    ]
+    
+    service = ScraperService(workers=1)
+    service.scrapers = [scraper]
+    details = service.run_all_scrapers(db)["details"][0]
+    
+    assert "error" not in details
+    assert (details["created"], details["failed"]) == (4, 2)
+
+
+def test_listing_windows_fill_the_parse_pool(monkeypatch):
+    fetched = []
+    batches = []
+    
+    def fake_fetch_pages(urls):
+        fetched.append(len(urls))
+        return [b'<div class="job-card"></div>'] * len(urls)
+    
+    class RecordingPool(ParsePool):
+        def parse_each(self, parser, pages):
+            batches.append(len(pages))
+            return super().parse_each(parser, pages)
+    
+    monkeypatch.setattr(example_scraper.settings, "fetch_per_host_limit", 2)
+    monkeypatch.setattr(example_scraper.settings, "parse_workers", 6)
+    monkeypatch.setattr(example_scraper, "fetch_pages", fake_fetch_pages)
+    monkeypatch.setattr(example_scraper, "get_parse_pool", lambda: RecordingPool(workers=1))
+    
+    ExampleJobScraper(base_url="https://jobs.test").scrape_jobs(max_pages=12)
+    
+    assert fetched == [6, 6]
+    assert batches == [6, 6]
+
+
+class FakeScraper:
+    def __init__(self, source_name, delay=0.0):
+        self.source_name = source_name
+        self.delay = delay
+    
+    def scrape_jobs(self, max_pages=3):
+        time.sleep(self.delay)
+        return [
+            JobCreate(
+                title=f"Job {i}",
+                company="FakeCo",
+                url=f"https://{self.source_name}.test/job/{i}",
+                source=self.source_name
+            )
+            for i in range(2)
+        ]
+
+
+def test_run_all_scrapers_parallel_with_timeout(db):
+    service = ScraperService(workers=3, timeout=0.5)
+    service.scrapers = [FakeScraper("fast-a"), FakeScraper("slow", delay=2), FakeScraper("fast-b")]
+    
+    results = service.run_all_scrapers(db)
+    
+    assert results["scrapers_run"] == 2
+    assert results["total_created"] == 4
+    details = {detail["scraper"]: detail for detail in results["details"]}
+    assert "timed out" in details["slow"]["error"]
+    assert details["fast-a"]["duration_seconds"] >= 0
+    assert details["fast-a"]["jobs_per_second"] is not None
+
+
+def test_full_scrape_updates_changed_and_deactivates_vanished_jobs(db):
+    scraper = FakeScraper("board")
+    service = ScraperService(workers=1)
+    service.scrapers = [scraper]
+    service.run_all_scrapers(db)
+    
+    # Next run: job 0 is gone, job 1 only differs in whitespace and case
+    listings = scraper.scrape_jobs()
+    scraper.scrape_jobs = lambda: [listings[1].model_copy(update={"title": "  JOB 1 "})]
+    details = service.run_all_scrapers(db)["details"][0]
+    
+    assert details["updated"] == 0
+    assert details["unchanged"] == 1
+    assert details["deactivated"] == 1
+    assert JobService.get_job_by_url(db, "https://board.test/job/0").is_active is False
+    
+    # A listing that comes back is reactivated
+    scraper.scrape_jobs = lambda: listings
+    details = service.run_all_scrapers(db)["details"][0]
+    assert details["updated"] == 1
+    assert JobService.get_job_by_url(db, "https://board.test/job/0").is_active is True
+
+
+class StreamingFakeScraper(FakeScraper):
+    def __init__(self, source_name, pages, events):
+        super().__init__(source_name)
+        self.pages = pages
+        self.events = events
+    
+    def iter_jobs(self):
+        for page in range(self.pages):
+            self.events.append(f"page {page}")
+            yield [
+                JobCreate(
+                    title=f"Job {page}-{i}",
+                    company="FakeCo",
+                    url=f"https://{self.source_name}.test/job/{page}-{i}",
+                    source=self.source_name
+                )
+                for i in range(3)
+            ]
+
+
+def test_streamed_jobs_are_written_a_chunk_at_a_time(db, monkeypatch):
+    monkeypatch.setattr(scraper_service.settings, "ingest_chunk_size", 4)
+    monkeypatch.setattr(scraper_service.settings, "stream_queue_size", 1)
+    events = []
+    bulk_create_jobs = JobService.bulk_create_jobs
+    
+    def record_write(db, jobs, **kwargs):
+        events.append(f"write {len(jobs)}")
+        return bulk_create_jobs(db, jobs, **kwargs)
+    
+    monkeypatch.setattr(JobService, "bulk_create_jobs", staticmethod(record_write))
+    service = ScraperService(workers=1)
+    service.scrapers = [StreamingFakeScraper("stream", pages=5, events=events)]
+    
+    details = service.run_all_scrapers(db)["details"][0]
+    
+    assert details["scraped"] == 15
+    assert details["created"] == 15
+    writes = [event for event in events if event.startswith("write")]
+    assert writes == ["write 6", "write 6", "write 3"]
+    # The bounded queue keeps the scraper at most two pages ahead of the writer
+    assert events.index("write 6") < events.index("page 4")
+
+
+def test_parse_listing_page_in_process_pool():
+    page = (FIXTURES / "example_listing.html").read_bytes()
+    parser = partial(parse_listing_page, base_url="https://jobs.test", source="TestSource")
+    
+    jobs = normalize_jobs(parser(page))
+    assert len(jobs) == 3
+    assert jobs[0].url == "https://jobs.test/job/0"
+    assert jobs[0].company == "Company 333"
+    assert jobs[0].salary_min == 50000
+    assert jobs[0].salary_currency == "USD"
+    assert jobs[0].technologies == "Go, Docker, TypeScript, React"
+    
+    pool = ParsePool(workers=2)
+    try:
+        assert normalize_jobs(pool.parse(parser, [page, page])) == jobs + jobs
+    finally:
+        pool.shutdown()
+
+
+def test_parse_pool_starts_one_executor_across_threads(monkeypatch):
+    started = []
+    
+    class SlowExecutor:
+        def __init__(self, max_workers, mp_context):
+            started.append(mp_context.get_start_method())
+            time.sleep(0.05)
+        
+        def shutdown(self):
+            pass
+    
+    monkeypatch.setattr(parse_pool, "ProcessPoolExecutor", SlowExecutor)
+    pool = ParsePool(workers=2)
+    threads = [threading.Thread(target=pool._get_executor) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    # One pool of workers, none of them forked from the running app
+    assert len(started) == 1
+    assert started[0] != "fork"
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("$80,000 - $100,000", (80000, 100000)),
+    ("80-100k", (80000, 100000)),
+    ("€45k to 55k", (45000, 55000)),
+    ("60.000 – 80.000 € a year", (60000, 80000)),
+    # A 'k' elsewhere in the text used to multiply both bounds
+    ("Work from Stockholm: 50000 - 60000 SEK", (50000, 60000)),
+    ("Competitive", (None, None)),
+    ("50000 per year", (50000, 50000)),
+    # A number with no currency, k, range or period isn't a salary
+    ("30 days holiday", (None, None)),
+])
+def test_extract_salary(text, expected):
+    assert extract_salary(text) == expected
+
+
+def test_normalize_records_extracts_fields_in_batch():
+    records = normalize_records([
+        dict(title="Senior Python Developer", company="A", url="https://a.test/1", source="A",
+             salary="$80k-100k a year", description="FastAPI and Node.js services"),
+        dict(title="Data Engineer", company="B", url="https://b.test/1", source="B",
+             salary="45,50 - 60 EUR per hour", job_type="Hybrid (2 days)",
+             description="Our mid-sized team wants 3 years of C++ and C#"),
+        dict(title="Intern", company="C", url="https://c.test/1", source="C", location="Remote",
+             technologies="Go, Rust", salary_min=1000, salary_max=1200),
+    ])
+    
+    assert [(r["salary_min"], r["salary_max"], r["salary_currency"], r["salary_period"]) for r in records] == [
+        (80000, 100000, "USD", "year"),
+        (45.5, 60, "EUR", "hour"),
+        (1000, 1200, None, None),
+    ]
+    assert [r["job_type"] for r in records] == [None, "hybrid", "remote"]
+    assert [r["experience_level"] for r in records] == ["senior", "mid", "junior"]
+    assert [r["technologies"] for r in records] == ["Python, FastAPI, Node.js", "C++, C#", "Go, Rust"]
+    assert "salary" not in records[0]
+
+
+def test_normalize_records_needs_whole_keywords_and_salary_markers():
+    records = normalize_records([
+        dict(title="Backend Engineer", company="A", url="https://a.test/1", source="A",
+             description="Join our international team, 6+ years of Python"),
+        dict(title="Platform Engineer", company="B", url="https://b.test/1", source="B",
+             description="Work on internal tooling, senior role", salary="30 days holiday"),
+    ])
+    
+    assert [r["experience_level"] for r in records] == ["senior", "senior"]
+    assert [(r["salary_min"], r["salary_max"], r["salary_currency"]) for r in records] == [
+        (None, None, None),
+        (None, None, None),
+    ]
+
+
+def test_rate_limiter_paces_and_adapts():
+    now = [0.0]
+    limiter = RateLimiter(rate=10, burst=2, min_rate=1, clock=lambda: now[0])
+    
+    # The burst goes out at once, then requests are spaced 1/rate apart
+    assert [limiter.reserve("a.test") for _ in range(3)] == [0, 0, pytest.approx(0.1)]
+    assert limiter.reserve("b.test") == 0
+    
+    limiter.record("a.test", 429, retry_after="5")
+    assert limiter.rate("a.test") == 5
+    assert limiter.reserve("a.test") == pytest.approx(5)
+    
+    limiter.record("a.test", 200)
+    assert limiter.rate("a.test") == 6
+
+
+@pytest.mark.asyncio
+async def test_redis_rate_limiter_stays_off_the_loop_and_backs_off():
+    limiter = RedisRateLimiter("redis://127.0.0.1:1/0", rate=5, burst=5)
+    calls = []
+    
+    def unreachable(**kwargs):
+        calls.append(threading.current_thread())
+        raise redis.ConnectionError("redis is down")
+    
+    limiter._reserve = limiter._feedback = unreachable
+    
+    assert await limiter.reserve_async("a.test") == 0
+    await limiter.record_async("a.test", 200)
+    assert await limiter.reserve_async("a.test") == 0
+    
+    # One failed call, made in the executor; in-process buckets until the retry window passes
+    assert len(calls) == 1
+    assert calls[0] is not threading.current_thread()
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    """Answers the first request with 429 Retry-After: 1, then serves the page"""
+    requests_seen = []
+    
+    def do_GET(self):
+        self.requests_seen.append(time.monotonic())
+        if len(self.requests_seen) == 1:
+            self.send_response(429)
+            self.send_header("Retry-After", "1")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b"listing")
+    
+    def log_message(self, *args):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_async_fetcher_honours_retry_after():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ThrottlingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = f"127.0.0.1:{server.server_port}"
+    limiter = RateLimiter(rate=50, burst=5)
+    try:
+        async with AsyncFetcher(retries=3, cache=ResponseCache(), rate_limiter=limiter) as fetcher:
+            page = await fetcher.fetch(f"http://{host}/jobs?page=1")
+    finally:
+        server.shutdown()
+        server.server_close()
+    
+    first, second = ThrottlingHandler.requests_seen
+    assert page == b"listing"
+    assert second - first >= 0.9
+    # Halved by the 429, then nudged back up by the success
+    assert limiter.rate(host) == 30
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """Serves every path over persistent HTTP/1.1 connections, noting each client port"""
+    protocol_version = "HTTP/1.1"
+    clients = set()
+    
+    def do_GET(self):
+        self.clients.add(self.client_address)
+        self.send_response(200)
+        self.send_header("Content-Length", "4")
+        self.end_headers()
+        self.wfile.write(b"page")
+    
+    def log_message(self, *args):
+        pass
+
+
+def test_fetch_pages_reuses_connections_across_calls(monkeypatch):
+    monkeypatch.setattr(rate_limiter.settings, "rate_limit_enabled", False)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{server.server_port}/jobs?page={page}" for page in (1, 2)]
+    try:
+        pages = [fetch_pages(urls) for _ in range(3)]
+    finally:
+        close_fetch_loop()
+        server.shutdown()
+        server.server_close()
+    
+    assert pages == [[b"page", b"page"]] * 3
+    # Later calls go out over the connections the first one opened
+    assert len(KeepAliveHandler.clients) <= 2
+
+
+class ListingHandler(BaseHTTPRequestHandler):
+    """Serves two job cards per listing page; pages in `failing` answer 500"""
+    failing = set()
+    
+    def do_GET(self):
+        page = int(self.path.rsplit("=", 1)[1])
+        if page in self.failing:
+            self.send_response(500)
+            self.end_headers()
+            return
+        cards = "".join(
+            f'<div class="job-card"><h2 class="title"><a href="/job/{page}-{i}">Job</a></h2>'
+            f'<span class="company">Co</span></div>'
+            for i in range(2)
+        )
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(f"<html><body>{cards}</body></html>".encode())
+    
+    def log_message(self, *args):
+        pass
+
+
+def test_failed_listing_page_skips_deactivation(db, monkeypatch):
+    monkeypatch.setattr(scraper_service.settings, "incremental_scraping", False)
+    monkeypatch.setattr(scraper_service.settings, "max_retries", 1)
+    monkeypatch.setattr(rate_limiter.settings, "rate_limit_enabled", False)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ListingHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    service = ScraperService(workers=1)
+    service.scrapers = [ExampleJobScraper(base_url=base_url, max_pages=3)]
+    close_fetch_loop()
+    try:
+        first = service.run_all_scrapers(db)["details"][0]
+        ListingHandler.failing = {2}
+        second = service.run_all_scrapers(db)["details"][0]
+    finally:
+        ListingHandler.failing = set()
+        close_fetch_loop()
+        server.shutdown()
+        server.server_close()
+    
+    assert first["created"] == 6 and first["failed_pages"] == []
+    assert second["scraped"] == 4
+    assert second["failed_pages"] == [2]
+    # Page 2's jobs weren't seen, but they weren't taken down either
+    assert second["deactivated"] == 0
+    assert JobService.get_job_by_url(db, f"{base_url}/job/2-0").is_active is True
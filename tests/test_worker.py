@@ -0,0 +1,71 @@
+import time
+from app.api.v1 import scraper as scraper_api
+from app.scrapers.example_scraper import ExampleJobScraper
+from app.services.job_service import JobService
+from app.services.scrape_run_service import ScrapeRunService
+from app.services.task_queue import InMemoryTaskQueue, enqueue_scrape_tasks, get_task_queue
+from app.worker import run_worker
+from tests.conftest import TestingSessionLocal
+
+
+def test_worker_runs_each_source_once_per_interval(db):
+    task_queue = InMemoryTaskQueue()
+    # Two API processes scheduling the same interval
+    enqueue_scrape_tasks(["ExampleJobs"], task_queue)
+    enqueue_scrape_tasks(["ExampleJobs"], task_queue)
+    
+    run_worker(task_queue, burst=True, session_factory=TestingSessionLocal)
+    
+    assert task_queue.dequeue(timeout=0) is None
+    assert len(JobService.get_known_urls(db, "ExampleJobs")) == 3
+    assert not task_queue.acquire_lock("scrape:ExampleJobs", ttl=60)
+
+
+def test_failed_task_releases_lock_and_is_recorded(db, monkeypatch):
+    def broken_iter_jobs(self, **kwargs):
+        raise RuntimeError("board unreachable")
+        yield
+    
+    monkeypatch.setattr(ExampleJobScraper, "iter_jobs", broken_iter_jobs)
+    task_queue = InMemoryTaskQueue()
+    enqueue_scrape_tasks(["ExampleJobs"], task_queue)
+    
+    run_worker(task_queue, burst=True, session_factory=TestingSessionLocal)
+    
+    # The scraper's error came back in the run details, not as an exception
+    run = ScrapeRunService.get_last_finished_run(db)
+    assert run.trigger == "worker"
+    assert "board unreachable" in run.details[0]["error"]
+    assert task_queue.acquire_lock("scrape:ExampleJobs", ttl=60)
+
+
+def test_worker_drops_tasks_older_than_an_interval(db):
+    task_queue = InMemoryTaskQueue()
+    task_queue.enqueue({"type": "scrape", "source": "ExampleJobs", "enqueued_at": time.time() - 7 * 24 * 3600})
+    
+    run_worker(task_queue, burst=True, session_factory=TestingSessionLocal)
+    
+    assert JobService.get_known_urls(db, "ExampleJobs") == set()
+    assert ScrapeRunService.get_last_finished_run(db) is None
+
+
+def test_api_trigger_enqueues_in_queue_mode(client, db, monkeypatch):
+    monkeypatch.setattr(scraper_api.settings, "scrape_dispatch", "queue")
+    monkeypatch.setattr(scraper_api.settings, "task_queue_backend", "memory")
+    get_task_queue.cache_clear()
+    try:
+        task_queue = get_task_queue()
+        # The source already ran this interval; a manual trigger still runs it
+        assert task_queue.acquire_lock("scrape:ExampleJobs", ttl=60)
+        
+        data = client.post("/api/v1/scraper/run").json()
+        assert data["status"] == "queued"
+        assert data["sources"] == ["ExampleJobs"]
+        assert ScrapeRunService.get_last_finished_run(db) is None
+        
+        run_worker(task_queue, burst=True, session_factory=TestingSessionLocal)
+    finally:
+        get_task_queue.cache_clear()
+    
+    assert ScrapeRunService.get_last_finished_run(db).scope == "ExampleJobs"
+    assert len(JobService.get_known_urls(db, "ExampleJobs")) == 3